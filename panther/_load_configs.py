@@ -1,8 +1,12 @@
+import hashlib
 import logging
 import sys
+import tempfile
 import types
+from datetime import timedelta
 from importlib import import_module
 from multiprocessing import Manager
+from pathlib import Path
 
 import jinja2
 
@@ -10,14 +14,14 @@ from panther._utils import import_class, check_function_type_endpoint, check_cla
 from panther.background_tasks import background_tasks
 from panther.base_websocket import WebsocketConnections
 from panther.cli.utils import import_error
-from panther.configs import JWTConfig, config
+from panther.configs import JWTConfig, config, default_configs
 from panther.db.connections import redis
 from panther.db.queries.mongodb_queries import BaseMongoDBQuery
 from panther.db.queries.pantherdb_queries import BasePantherDBQuery
 from panther.exceptions import PantherError
 from panther.middlewares.base import WebsocketMiddleware, HTTPMiddleware
 from panther.panel.urls import urls as panel_urls
-from panther.routings import finalize_urls, flatten_urls
+from panther.routings import finalize_urls, flatten_urls, Router
 
 __all__ = (
     'load_configs_module',
@@ -31,15 +35,20 @@ __all__ = (
     'load_throttling',
     'load_user_model',
     'load_log_queries',
+    'load_strict_response',
     'load_middlewares',
     'load_templates_dir',
     'load_auto_reformat',
     'load_background_tasks',
     'load_default_cache_exp',
+    'load_route_cache_size',
+    'load_memory_cache',
+    'load_cache_compression',
     'load_authentication_class',
     'load_urls',
     'load_websocket_connections',
     'check_endpoints_inheritance',
+    'compile_endpoints',
 )
 
 logger = logging.getLogger('panther')
@@ -132,9 +141,37 @@ def load_monitoring(_configs: dict, /) -> None:
 
 
 def load_throttling(_configs: dict, /) -> None:
+    """Should be after `load_redis()`"""
+    from panther import throttling as panther_throttling
+
     if throttling := _configs.get('THROTTLING'):
         config.THROTTLING = throttling
 
+    max_keys = _configs.get('THROTTLING_MAX_KEYS', default_configs['THROTTLING_MAX_KEYS'])
+    # With `0` every key would be evicted on insert, so the throttling would silently stop
+    if max_keys is not None and (not isinstance(max_keys, int) or isinstance(max_keys, bool) or max_keys < 1):
+        raise _exception_handler(field='THROTTLING_MAX_KEYS', error='should be a positive `int` or `None`.')
+    config.THROTTLING_MAX_KEYS = max_keys
+
+    if shared_memory := bool(_configs.get('THROTTLING_SHARED_MEMORY')):
+        if sys.platform.startswith('win'):
+            raise _exception_handler(field='THROTTLING_SHARED_MEMORY', error='is not supported on Windows.')
+        if redis.is_connected:
+            logger.warning('"THROTTLING_SHARED_MEMORY" won\'t work while "REDIS" is connected')
+        # The workers of this project open the same file
+        digest = hashlib.blake2b(str(config.BASE_DIR).encode(), digest_size=8).hexdigest()
+        directory = Path('/dev/shm') if Path('/dev/shm').is_dir() else Path(tempfile.gettempdir())
+        panther_throttling.throttling_storage = panther_throttling.SharedThrottlingStorage(
+            path=directory / f'panther-{digest}.throttling',
+            capacity=max_keys or default_configs['THROTTLING_MAX_KEYS'],
+        )
+    else:
+        if not isinstance(panther_throttling.throttling_storage, panther_throttling.ThrottlingStorage):
+            panther_throttling.throttling_storage = panther_throttling.ThrottlingStorage()
+        panther_throttling.throttling_storage.max_keys = max_keys
+        panther_throttling.throttling_storage.clear()
+    config.THROTTLING_SHARED_MEMORY = shared_memory
+
 
 def load_user_model(_configs: dict, /) -> None:
     config.USER_MODEL = import_class(_configs.get('USER_MODEL', 'panther.db.models.BaseUser'))
@@ -146,10 +183,15 @@ def load_log_queries(_configs: dict, /) -> None:
         config.LOG_QUERIES = True
 
 
+def load_strict_response(_configs: dict, /) -> None:
+    if _configs.get('STRICT_RESPONSE'):
+        config.STRICT_RESPONSE = True
+
+
 def load_middlewares(_configs: dict, /) -> None:
-    from panther.middlewares import BaseMiddleware
+    from panther.middlewares import ASGIMiddleware, BaseMiddleware
 
-    middlewares = {'http': [], 'ws': []}
+    middlewares = {'http': [], 'ws': [], 'asgi': []}
 
     # Collect Middlewares
     for middleware in _configs.get('MIDDLEWARES') or []:
@@ -175,17 +217,26 @@ def load_middlewares(_configs: dict, /) -> None:
             except (AttributeError, ModuleNotFoundError):
                 raise _exception_handler(field='MIDDLEWARES', error=f'{path_or_type} is not a valid middleware path')
 
+        if issubclass(middleware_class, ASGIMiddleware):
+            # It wraps the app, so it is going to be instantiated in `Panther.load_configs()`
+            middlewares['asgi'].append((middleware_class, data))
+            continue
+
         if issubclass(middleware_class, BaseMiddleware) is False:
             raise _exception_handler(field='MIDDLEWARES', error='is not a sub class of BaseMiddleware')
 
+        # Each middleware is instantiated only once and is shared between the requests
+        middleware_instance = middleware_class(**data)
+
         if middleware_class.__bases__[0] in (BaseMiddleware, HTTPMiddleware):
-            middlewares['http'].append((middleware_class, data))
+            middlewares['http'].append(middleware_instance)
 
         if middleware_class.__bases__[0] in (BaseMiddleware, WebsocketMiddleware):
-            middlewares['ws'].append((middleware_class, data))
+            middlewares['ws'].append(middleware_instance)
 
     config.HTTP_MIDDLEWARES = middlewares['http']
     config.WS_MIDDLEWARES = middlewares['ws']
+    config.ASGI_MIDDLEWARES = middlewares['asgi']
 
 
 def load_auto_reformat(_configs: dict, /) -> None:
@@ -204,6 +255,45 @@ def load_default_cache_exp(_configs: dict, /) -> None:
         config.DEFAULT_CACHE_EXP = default_cache_exp
 
 
+def load_memory_cache(_configs: dict, /) -> None:
+    """Should be after `load_redis()`"""
+    from panther.caching import caches, local_caches
+
+    for field in ('MEMORY_CACHE_MAX_ENTRIES', 'MEMORY_CACHE_MAX_SIZE'):
+        value = _configs.get(field, default_configs[field])
+        if value is not None and (not isinstance(value, int) or value < 0):
+            raise _exception_handler(field=field, error='should be a positive `int` or `None`.')
+        config[field] = value
+
+    local_cache_exp = _configs.get('LOCAL_CACHE_EXP')
+    if local_cache_exp is not None and not isinstance(local_cache_exp, timedelta | int):
+        raise _exception_handler(field='LOCAL_CACHE_EXP', error='should be instance of `timedelta`, `int` or `None`.')
+    if local_cache_exp and not redis.is_connected:
+        logger.warning('"LOCAL_CACHE_EXP" won\'t work while "REDIS" is not connected')
+    config.LOCAL_CACHE_EXP = local_cache_exp
+
+    for cache in (caches, local_caches):
+        cache.max_entries = config.MEMORY_CACHE_MAX_ENTRIES
+        cache.max_size = config.MEMORY_CACHE_MAX_SIZE
+        cache.clear()
+        cache.reset_stats()
+
+
+def load_cache_compression(_configs: dict, /) -> None:
+    min_size = _configs.get('CACHE_COMPRESSION_MIN_SIZE')
+    if min_size is not None and (not isinstance(min_size, int) or min_size < 0):
+        raise _exception_handler(field='CACHE_COMPRESSION_MIN_SIZE', error='should be a positive `int` or `None`.')
+    config.CACHE_COMPRESSION_MIN_SIZE = min_size
+
+
+def load_route_cache_size(_configs: dict, /) -> None:
+    """Should be before `load_urls()`"""
+    if route_cache_size := _configs.get('ROUTE_CACHE_SIZE'):
+        if not isinstance(route_cache_size, int) or route_cache_size < 0:
+            raise _exception_handler(field='ROUTE_CACHE_SIZE', error='should be a positive `int`.')
+        config.ROUTE_CACHE_SIZE = route_cache_size
+
+
 def load_authentication_class(_configs: dict, /) -> None:
     """Should be after `load_secret_key()`"""
     if authentication := _configs.get('AUTHENTICATION'):
@@ -262,6 +352,7 @@ def load_urls(_configs: dict, /, urls: dict | None) -> None:
     config.FLAT_URLS = flatten_urls(urls)
     config.URLS = finalize_urls(config.FLAT_URLS)
     config.URLS['_panel'] = finalize_urls(flatten_urls(panel_urls))
+    config.ROUTER = Router(config.URLS, cache_size=config.ROUTE_CACHE_SIZE)
 
 
 def load_websocket_connections():
@@ -287,5 +378,27 @@ def check_endpoints_inheritance():
             check_class_type_endpoint(endpoint=endpoint)
 
 
+def compile_endpoints():
+    """Should be after `check_endpoints_inheritance()`"""
+    from panther.app import GenericAPI, cache_tags_variables
+
+    for url, endpoint in config.FLAT_URLS.items():
+        if isinstance(endpoint, types.FunctionType):
+            variables = getattr(endpoint, 'cache_tags_variables', frozenset())
+        elif issubclass(endpoint, GenericAPI):
+            endpoint.compile_handlers()
+            variables = cache_tags_variables(tuple(
+                tag for tag in endpoint.cache_tags or [] if endpoint.cache and isinstance(tag, str)
+            ))
+        else:
+            continue
+
+        # The `cache_tags` are formatted with the path variables of the request
+        path_variables = {part.strip('< >') for part in url.split('/') if part.startswith('<')}
+        if missing := variables - path_variables:
+            msg = f"Invalid 'cache_tags' of '{url}': it doesn't have these path variables: {', '.join(sorted(missing))}"
+            raise PantherError(msg)
+
+
 def _exception_handler(field: str, error: str | Exception) -> PantherError:
     return PantherError(f"Invalid '{field}': {error}")
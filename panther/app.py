@@ -1,17 +1,23 @@
 import functools
 import logging
+import string
+from collections.abc import Callable
 from datetime import timedelta
+from time import perf_counter
 from typing import Literal
 
 from orjson import JSONDecodeError
 from pydantic import ValidationError, BaseModel
 
+from panther import caching
 from panther._utils import is_function_async
+from panther.base_request import parameters_binder
 from panther.caching import (
     get_response_from_cache,
     set_response_in_cache,
-    get_throttling_from_cache,
-    increment_throttling_in_cache
+    single_flight,
+    revalidate_in_background,
+    throttle,
 )
 from panther.configs import config
 from panther.exceptions import (
@@ -20,7 +26,8 @@ from panther.exceptions import (
     JSONDecodeAPIError,
     MethodNotAllowedAPIError,
     ThrottlingAPIError,
-    BadRequestAPIError
+    BadRequestAPIError,
+    PantherError,
 )
 from panther.request import Request
 from panther.response import Response
@@ -43,6 +50,9 @@ class API:
         throttling: Throttling | None = None,
         cache: bool = False,
         cache_exp_time: timedelta | int | None = None,
+        cache_stale_time: timedelta | int | None = None,
+        cache_tags: list[type | str] | None = None,
+        cache_key: Callable[[Request], str] | None = None,
         methods: list[Literal['GET', 'POST', 'PUT', 'PATCH', 'DELETE']] | None = None,
     ):
         self.input_model = input_model
@@ -52,94 +62,167 @@ class API:
         self.throttling = throttling
         self.cache = cache
         self.cache_exp_time = cache_exp_time # or config.DEFAULT_CACHE_EXP
+        self.cache_stale_time = cache_stale_time
+        # `Model` classes or templates over the path variables, e.g. [Book, 'Book:{book_id}']
+        self.cache_tags = cache_tags or []
+        # `caching.api_cache_key` (per user) or `caching.shared_cache_key` (same for all the users) or your own
+        self.cache_key = cache_key or caching.api_cache_key
         self.methods = methods
-        self.request: Request | None = None
 
     def __call__(self, func):
+        pipeline = self.compile_pipeline()
+        bind_parameters = parameters_binder(func)
+        is_async = is_function_async(func)
+        use_cache = self.cache
+
+        if self.cache_exp_time and self.cache is False:
+            logger.warning('"cache_exp_time" won\'t work while "cache" is False')
+        if self.cache_stale_time and self.cache is False:
+            logger.warning('"cache_stale_time" won\'t work while "cache" is False')
+        if self.cache_tags and self.cache is False:
+            logger.warning('"cache_tags" won\'t work while "cache" is False')
+        cache_tags = self.compile_cache_tags()
+        cache_key = self.cache_key
+        stats = caching.cache_stats[f'{func.__module__}.{func.__qualname__}'] if use_cache else None
+
         @functools.wraps(func)
         async def wrapper(request: Request) -> Response:
-            self.request = request
-
             # 0. Preflight
-            if self.request.method == 'OPTIONS':
+            if request.method == 'OPTIONS':
                 return self.options()
 
-            # 1. Check Method
-            if self.methods and self.request.method not in self.methods:
-                raise MethodNotAllowedAPIError
-
-            # 2. Authentication
-            await self.handle_authentication()
-
-            # 3. Permissions
-            await self.handle_permission()
+            # 1. Check Method, Authentication, Permissions, Throttling & Validate Input
+            for stage in pipeline:
+                await stage(request)
 
-            # 4. Throttling
-            await self.handle_throttling()
+            response = await get_response(request)
 
-            # 5. Validate Input
-            if self.request.method in ['POST', 'PUT', 'PATCH']:
-                self.handle_input_validation()
-
-            # 6. Get Cached Response
-            if self.cache and self.request.method == 'GET':
-                if cached := await get_response_from_cache(request=self.request, cache_exp_time=self.cache_exp_time):
-                    return Response(data=cached.data, headers=cached.headers, status_code=cached.status_code)
-
-            # 7. Put PathVariables and Request(If User Wants It) In kwargs
-            kwargs = self.request.clean_parameters(func)
+            # 7. Let the client know how many requests it has left
+            if request.throttling_status is not None:
+                response.add_headers(request.throttling_status.headers)
+            return response
 
-            # 8. Call Endpoint
-            if is_function_async(func):
+        async def get_response(request: Request) -> Response:
+            # 2. Get Cached Response
+            if use_cache and request.method == 'GET':
+                key = cache_key(request)
+                if cached := await get_response_from_cache(
+                    request=request, cache_exp_time=self.cache_exp_time, key=key,
+                ):
+                    if cached.is_stale:
+                        stats.stale_hits += 1
+                        request.cache_status = 'STALE'
+                        # Serve the stale response and refresh it in the background
+                        revalidate_in_background(
+                            request=request, func=functools.partial(call_endpoint, request, key), key=key,
+                        )
+                    else:
+                        stats.hits += 1
+                        request.cache_status = 'HIT'
+                    return cached.to_response(request)
+
+                stats.misses += 1
+                request.cache_status = 'MISS'
+                # Concurrent identical requests wait for the first one, instead of calling the endpoint too
+                return await single_flight(
+                    request=request,
+                    func=functools.partial(call_endpoint, request, key),
+                    key=key,
+                )
+
+            return await call_endpoint(request)
+
+        async def call_endpoint(request: Request, key: str | None = None) -> Response:
+            start_time = perf_counter()
+
+            # 3. Put PathVariables and Request(If User Wants It) In kwargs
+            kwargs = bind_parameters(request)
+
+            # 4. Call Endpoint
+            if is_async:
                 response = await func(**kwargs)
             else:
                 response = func(**kwargs)
 
-            # 9. Clean Response
+            # 5. Clean Response
             if not isinstance(response, Response):
                 response = Response(data=response)
+            await response.fetch_cursor()
             if self.output_model and response.data:
                 response.data = await response.apply_output_model(output_model=self.output_model)
             if response.pagination:
                 response.data = await response.pagination.template(response.data)
 
-            # 10. Set New Response To Cache
-            if self.cache and self.request.method == 'GET':
-                await set_response_in_cache(request=self.request, response=response, cache_exp_time=self.cache_exp_time)
-
-            # 11. Warning CacheExpTime
-            if self.cache_exp_time and self.cache is False:
-                logger.warning('"cache_exp_time" won\'t work while "cache" is False')
+            # 6. Set New Response To Cache
+            if use_cache and request.method == 'GET':
+                await set_response_in_cache(
+                    request=request,
+                    response=response,
+                    cache_exp_time=self.cache_exp_time,
+                    cache_stale_time=self.cache_stale_time,
+                    cache_tags=[tag.format_map(request.path_variables or {}) for tag in cache_tags],
+                    key=key,
+                    stats=stats,
+                )
+                stats.observe_fill(perf_counter() - start_time)
 
             return response
 
+        # Checked against the path variables of its url in `compile_endpoints()`
+        wrapper.cache_tags_variables = cache_tags_variables(cache_tags)
         return wrapper
 
-    async def handle_authentication(self) -> None:
+    def compile_cache_tags(self) -> tuple[str, ...]:
+        if not (self.cache and self.cache_tags):
+            return ()
+        caching.cache_tags_used = True
+        cache_tags = tuple(tag.__name__ if isinstance(tag, type) else tag for tag in self.cache_tags)
+        # Validate the templates here, so a mistyped one fails on startup, not on every request
+        cache_tags_variables(cache_tags)
+        return cache_tags
+
+    def compile_pipeline(self) -> tuple[Callable, ...]:
+        """Only keep the stages which are enabled for this endpoint"""
+        pipeline = []
+        if self.methods:
+            pipeline.append(self.handle_method)
         if self.auth:
-            if not config.AUTHENTICATION:
-                logger.critical('"AUTHENTICATION" has not been set in configs')
-                raise APIError
-            self.request.user = await config.AUTHENTICATION.authentication(self.request)
+            pipeline.append(self.handle_authentication)
+        if self.permissions:
+            pipeline.append(self.handle_permission)
+        # `config.THROTTLING` has not been loaded yet, so we check it in `handle_throttling()`
+        pipeline.append(self.handle_throttling)
+        if self.input_model:
+            pipeline.append(self.handle_input_validation)
+        return tuple(pipeline)
 
-    async def handle_throttling(self) -> None:
-        if throttling := self.throttling or config.THROTTLING:
-            if await get_throttling_from_cache(self.request, duration=throttling.duration) + 1 > throttling.rate:
-                raise ThrottlingAPIError
+    async def handle_method(self, request: Request) -> None:
+        if request.method not in self.methods:
+            raise MethodNotAllowedAPIError
 
-            await increment_throttling_in_cache(self.request, duration=throttling.duration)
+    async def handle_authentication(self, request: Request) -> None:
+        if not config.AUTHENTICATION:
+            logger.critical('"AUTHENTICATION" has not been set in configs')
+            raise APIError
+        request.user = await config.AUTHENTICATION.authentication(request)
+
+    async def handle_throttling(self, request: Request) -> None:
+        if throttling := self.throttling or config.THROTTLING:
+            request.throttling_status = await throttle(request, throttling=throttling)
+            if not request.throttling_status.allowed:
+                raise ThrottlingAPIError(headers=request.throttling_status.headers)
 
-    async def handle_permission(self) -> None:
+    async def handle_permission(self, request: Request) -> None:
         for perm in self.permissions:
             if type(perm.authorization).__name__ != 'method':
                 logger.error(f'{perm.__name__}.authorization should be "classmethod"')
                 raise AuthorizationAPIError
-            if await perm.authorization(self.request) is False:
+            if await perm.authorization(request) is False:
                 raise AuthorizationAPIError
 
-    def handle_input_validation(self):
-        if self.input_model:
-            self.request.validated_data = self.validate_input(model=self.input_model, request=self.request)
+    async def handle_input_validation(self, request: Request) -> None:
+        if request.method in ['POST', 'PUT', 'PATCH']:
+            request.validated_data = self.validate_input(model=self.input_model, request=request)
 
     @classmethod
     def options(cls):
@@ -165,6 +248,23 @@ class API:
             raise JSONDecodeAPIError
 
 
+def cache_tags_variables(cache_tags: tuple[str, ...]) -> frozenset[str]:
+    """Names of the path variables used in the `cache_tags` templates, e.g. `{'book_id'}` for `'Book:{book_id}'`"""
+    variables = set()
+    for tag in cache_tags:
+        try:
+            field_names = [name for _, name, _, _ in string.Formatter().parse(tag) if name is not None]
+        except ValueError as e:
+            msg = f'Invalid cache tag "{tag}": {e}'
+            raise PantherError(msg) from None
+        for field_name in field_names:
+            if not field_name.isidentifier():
+                msg = f'Invalid cache tag "{tag}": its placeholders should be the path variables, e.g. "{{book_id}}"'
+                raise PantherError(msg)
+            variables.add(field_name)
+    return frozenset(variables)
+
+
 class GenericAPI:
     input_model: type[ModelSerializer] | type[BaseModel] | None = None
     output_model: type[ModelSerializer] | type[BaseModel] | None = None
@@ -173,6 +273,9 @@ class GenericAPI:
     throttling: Throttling | None = None
     cache: bool = False
     cache_exp_time: timedelta | int | None = None
+    cache_stale_time: timedelta | int | None = None
+    cache_tags: list[type | str] | None = None
+    cache_key: Callable[[Request], str] | None = None
 
     async def get(self, *args, **kwargs):
         raise MethodNotAllowedAPIError
@@ -195,29 +298,70 @@ class GenericAPI:
     async def get_output_model(self, request: Request) -> type[ModelSerializer] | type[BaseModel] | None:
         return None
 
-    async def call_method(self, request: Request):
-        match request.method:
-            case 'GET':
-                func = self.get
-            case 'POST':
-                func = self.post
-            case 'PUT':
-                func = self.put
-            case 'PATCH':
-                func = self.patch
-            case 'DELETE':
-                func = self.delete
-            case 'OPTIONS':
-                func = API.options
-            case _:
-                raise MethodNotAllowedAPIError
-
-        return await API(
-            input_model=self.input_model or await self.get_input_model(request=request),
-            output_model=self.output_model or await self.get_output_model(request=request),
+    @classmethod
+    def compile_handlers(cls) -> dict[str, Callable]:
+        """
+        Wrap the methods of a single instance with `API()` only once,
+            so we don't create a new `API` (and a new instance of the class) on every request.
+            * The instance is shared between the requests, so keep the state of each request on the `request`
+        """
+        instance = cls()
+        methods = {
+            'GET': instance.get,
+            'POST': instance.post,
+            'PUT': instance.put,
+            'PATCH': instance.patch,
+            'DELETE': instance.delete,
+            'OPTIONS': API.options,
+        }
+        dynamic_input_model = cls.input_model is None and cls._is_overridden('get_input_model')
+        dynamic_output_model = cls.output_model is None and cls._is_overridden('get_output_model')
+
+        if dynamic_input_model or dynamic_output_model:
+            # `get_input_model()` or `get_output_model()` depends on the request
+            handlers = {
+                method: functools.partial(instance._call_dynamic_method, func=func)
+                for method, func in methods.items()
+            }
+        else:
+            api = instance._create_api(input_model=cls.input_model, output_model=cls.output_model)
+            handlers = {method: api(func) for method, func in methods.items()}
+
+        cls._handlers = handlers
+        return handlers
+
+    @classmethod
+    def _is_overridden(cls, method_name: str) -> bool:
+        return getattr(cls, method_name) is not getattr(GenericAPI, method_name)
+
+    def _create_api(self, input_model, output_model) -> API:
+        return API(
+            input_model=input_model,
+            output_model=output_model,
             auth=self.auth,
             permissions=self.permissions,
             throttling=self.throttling,
             cache=self.cache,
             cache_exp_time=self.cache_exp_time,
-        )(func)(request=request)
+            cache_stale_time=self.cache_stale_time,
+            cache_tags=self.cache_tags,
+            # Get it from the class, so it is not bound to the instance
+            cache_key=type(self).cache_key,
+        )
+
+    async def _call_dynamic_method(self, request: Request, func: Callable):
+        api = self._create_api(
+            input_model=self.input_model or await self.get_input_model(request=request),
+            output_model=self.output_model or await self.get_output_model(request=request),
+        )
+        return await api(func)(request=request)
+
+    @classmethod
+    async def call_method(cls, request: Request):
+        if (handlers := cls.__dict__.get('_handlers')) is None:
+            # It has not been compiled in `compile_endpoints()` (e.g. `config.URLS` has been changed directly)
+            handlers = cls.compile_handlers()
+
+        if handler := handlers.get(request.method):
+            return await handler(request=request)
+        raise MethodNotAllowedAPIError
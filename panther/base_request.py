@@ -109,22 +109,47 @@ class BaseRequest:
         }
 
     def clean_parameters(self, func: Callable) -> dict:
-        kwargs = self.path_variables.copy()
-
-        for variable_name, variable_type in func.__annotations__.items():
-            # Put Request/ Websocket In kwargs (If User Wants It)
-            if issubclass(variable_type, BaseRequest):
-                kwargs[variable_name] = self
-
-            elif variable_name in kwargs:
-                # Cast To Boolean
-                if variable_type is bool:
-                    kwargs[variable_name] = kwargs[variable_name].lower() not in ['false', '0']
-
-                # Cast To Int
-                elif variable_type is int:
-                    try:
-                        kwargs[variable_name] = int(kwargs[variable_name])
-                    except ValueError:
-                        raise InvalidPathVariableAPIError(value=kwargs[variable_name], variable_type=variable_type)
+        return parameters_binder(func)(self)
+
+
+def parameters_binder(func: Callable) -> Callable[[BaseRequest], dict]:
+    """
+    Inspect the annotations of `func` only once,
+        and return a function which collects the `kwargs` of `func` from each request.
+    """
+    request_names = []
+    converters = []
+    for variable_name, variable_type in func.__annotations__.items():
+        # Put Request/ Websocket In kwargs (If User Wants It)
+        if isinstance(variable_type, type) and issubclass(variable_type, BaseRequest):
+            request_names.append(variable_name)
+
+        # Cast To Boolean
+        elif variable_type is bool:
+            converters.append((variable_name, _to_bool))
+
+        # Cast To Int
+        elif variable_type is int:
+            converters.append((variable_name, _to_int))
+
+    def bind(request: BaseRequest) -> dict:
+        kwargs = request.path_variables.copy()
+        for variable_name in request_names:
+            kwargs[variable_name] = request
+        for variable_name, converter in converters:
+            if variable_name in kwargs:
+                kwargs[variable_name] = converter(kwargs[variable_name])
         return kwargs
+
+    return bind
+
+
+def _to_bool(value: str) -> bool:
+    return value.lower() not in ['false', '0']
+
+
+def _to_int(value: str) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        raise InvalidPathVariableAPIError(value=value, variable_type=int)
@@ -1,80 +1,527 @@
-from collections import namedtuple
-from datetime import timedelta, datetime
+import asyncio
+import bisect
+import functools
+import gzip
+import hashlib
+import math
+import secrets
+import struct
+import time
+import zlib
+from collections import defaultdict, namedtuple, OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import timedelta
 import logging
 from types import NoneType
 
 import orjson as json
+from pydantic import BaseModel
 
 from panther.configs import config
 from panther.db.connections import redis
 from panther.request import Request
-from panther.response import Response
-from panther.throttling import throttling_storage
-from panther.utils import generate_hash_value_from_string, round_datetime
+from panther.response import Response, PreparedResponse
+from panther import throttling as panther_throttling
+from panther.throttling import Throttling, ThrottlingStatus
 
 logger = logging.getLogger('panther')
 
-caches = {}
-CachedResponse = namedtuple('CachedResponse', ['data', 'headers', 'status_code'])
 
+_CachedResponse = namedtuple(
+    'CachedResponse', ['data', 'headers', 'status_code', 'fresh_until', 'encodings'], defaults=[None, None],
+)
 
-def api_cache_key(request: Request, cache_exp_time: timedelta | None = None) -> str:
-    client = request.user and request.user.id or request.client.ip
-    query_params_hash = generate_hash_value_from_string(request.scope['query_string'].decode('utf-8'))
-    key = f'{client}-{request.path}-{query_params_hash}-{request.validated_data}'
 
-    if cache_exp_time:
-        time = round_datetime(datetime.now(), cache_exp_time)
-        return f'{time}-{key}'
+class CachedResponse(_CachedResponse):
+    """
+    `data` is the rendered body & `headers` are the encoded headers (`Response.bytes_headers`) of the response.
+    `fresh_until` is the timestamp which the response becomes stale after it (`None` means it never does)
+    `encodings` are the compressed variants of the `data`, e.g. {'gzip': b'...'}
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_response(cls, response: Response, fresh_until: float | None = None, compress: bool = False):
+        body = response.body
+        headers = response.bytes_headers
+        encodings = None
+        if compress and not any(key.lower() == b'content-encoding' for key, _ in headers):
+            encodings = {name: compressor(body) for name, compressor in COMPRESSORS.items()}
+            headers = [*headers, [b'Vary', b'Accept-Encoding']]
+        return cls(
+            data=body,
+            headers=headers,
+            status_code=response.status_code,
+            fresh_until=fresh_until,
+            encodings=encodings,
+        )
+
+    def to_response(self, request: Request | None = None) -> PreparedResponse:
+        """Send the compressed variant, if the client (`Accept-Encoding` of the `request`) accepts one of them"""
+        if self.encodings and request and (accept_encoding := request.headers.accept_encoding):
+            if encoding := negotiate_encoding(accept_encoding, tuple(self.encodings)):
+                body = self.encodings[encoding]
+                headers = [
+                    [key, str(len(body)).encode()] if key == b'Content-Length' else [key, value]
+                    for key, value in self.headers
+                ]
+                headers.append([b'Content-Encoding', encoding.encode()])
+                return PreparedResponse(body=body, bytes_headers=headers, status_code=self.status_code)
+
+        return PreparedResponse(body=self.data, bytes_headers=self.headers, status_code=self.status_code)
+
+    @property
+    def is_stale(self) -> bool:
+        return self.fresh_until is not None and self.fresh_until <= time.time()
+
+
+COMPRESSORS = {
+    'gzip': lambda body: gzip.compress(body, compresslevel=6),
+    'deflate': lambda body: zlib.compress(body, 6),
+}
+
+
+@functools.lru_cache(maxsize=256)
+def negotiate_encoding(accept_encoding: str, encodings: tuple[str, ...], /) -> str | None:
+    """
+    The best of the `encodings` for the `Accept-Encoding` header, `None` means the identity (uncompressed) body
+        - The encodings which are not listed get the `q` of the `*` (if any), so the refused ones (`q=0`) are skipped
+        - The `identity` is acceptable unless it is refused (`identity;q=0` or `*;q=0`)
+        - The compressed encodings win the ties with the `identity`
+    """
+    qualities = {}
+    for item in accept_encoding.split(','):
+        name, _, params = item.partition(';')
+        q = 1.0
+        if (params := params.strip()).startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                continue
+        qualities[name.strip().lower()] = q
+
+    default = qualities.get('*', 0.0)
+    best, best_q = None, qualities.get('identity', 0.0 if default == 0 and '*' in qualities else 1.0)
+    for encoding in encodings:
+        if (q := qualities.get(encoding, default)) > 0 and (q > best_q or (q == best_q and best is None)):
+            best, best_q = encoding, q
+    return best
+
+
+# Entry of redis:
+#   [version, status_code, fresh_until, headers length, encodings count][headers]
+#   ([name length, body length][name][body] of each encoding)[body]
+CACHE_ENTRY_VERSION = 2
+_cache_entry_prefix = struct.Struct('!BHdIB')
+_cache_entry_encoding = struct.Struct('!BI')
+
+
+def dump_cache_entry(cached: CachedResponse) -> bytes:
+    headers = b'\r\n'.join(b'%s: %s' % (key, value) for key, value in cached.headers)
+    encodings = cached.encodings or {}
+    parts = [
+        _cache_entry_prefix.pack(
+            CACHE_ENTRY_VERSION, cached.status_code, cached.fresh_until or 0, len(headers), len(encodings),
+        ),
+        headers,
+    ]
+    for name, body in encodings.items():
+        parts += (_cache_entry_encoding.pack(len(name), len(body)), name.encode(), body)
+    parts.append(cached.data)
+    return b''.join(parts)
+
+
+def load_cache_entry(entry: bytes) -> CachedResponse | None:
+    """Returns `None` if the `entry` has not been dumped by `dump_cache_entry()` (e.g. it has an older format)"""
+    if len(entry) < _cache_entry_prefix.size or entry[0] != CACHE_ENTRY_VERSION:
+        return None
+
+    _, status_code, fresh_until, headers_length, encodings_count = _cache_entry_prefix.unpack_from(entry)
+    position = _cache_entry_prefix.size + headers_length
+    if headers_length:
+        headers = [header.split(b': ', 1) for header in entry[_cache_entry_prefix.size:position].split(b'\r\n')]
+    else:
+        headers = []
+
+    encodings = None
+    if encodings_count:
+        encodings = {}
+        for _ in range(encodings_count):
+            name_length, body_length = _cache_entry_encoding.unpack_from(entry, position)
+            position += _cache_entry_encoding.size
+            name = entry[position:position + name_length].decode()
+            position += name_length
+            encodings[name] = entry[position:position + body_length]
+            position += body_length
 
-    return key
+    return CachedResponse(
+        data=entry[position:],
+        headers=headers,
+        status_code=status_code,
+        fresh_until=fresh_until or None,
+        encodings=encodings,
+    )
 
 
-def throttling_cache_key(request: Request, duration: timedelta) -> str:
-    client = request.user and request.user.id or request.client.ip
-    time = round_datetime(datetime.now(), duration)
-    return f'{time}-{client}-{request.path}'
+class InMemoryCache:
+    """
+    Bounded in-process cache, used when `redis` is not connected.
+        - Each entry has its own ttl (`None` means it never expires)
+        - The least recently used entries are evicted when `max_entries` or `max_size` (in bytes) is reached
+    """
+    def __init__(self, max_entries: int | None = None, max_size: int | None = None):
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.size = 0
+        self._entries = OrderedDict()  # key -> (value, expires_at, size, owner)
+        self.reset_stats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, count=False) is not None
+
+    def get(self, key: str, *, count: bool = True):
+        if (entry := self._entries.get(key)) is None:
+            if count:
+                self.misses += 1
+            return None
+
+        value, expires_at, _, _ = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            self.delete(key)
+            self.expirations += 1
+            if count:
+                self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        if count:
+            self.hits += 1
+        return value
+
+    def set(
+            self,
+            key: str,
+            value,
+            *,
+            ttl: timedelta | int | None = None,
+            size: int = 0,
+            owner: 'CacheStats | None' = None,
+    ) -> None:
+        """`owner` (if any) keeps the `size` & the `evictions` of its own entries"""
+        if self.max_size is not None and size > self.max_size:
+            # It would evict the whole cache and still wouldn't fit
+            self.delete(key)
+            return
+
+        if isinstance(ttl, timedelta):
+            ttl = ttl.total_seconds()
+        expires_at = None if ttl is None else time.monotonic() + ttl
+
+        self.delete(key)
+        self._entries[key] = (value, expires_at, size, owner)
+        self.size += size
+        if owner is not None:
+            owner.size += size
+        self._evict()
+
+    def delete(self, key: str) -> bool:
+        if (entry := self._entries.pop(key, None)) is None:
+            return False
+        _, _, size, owner = entry
+        self.size -= size
+        if owner is not None:
+            owner.size -= size
+        return True
 
+    def clear(self) -> None:
+        for _, _, size, owner in self._entries.values():
+            if owner is not None:
+                owner.size -= size
+        self._entries.clear()
+        self.size = 0
 
-async def get_response_from_cache(*, request: Request, cache_exp_time: timedelta) -> CachedResponse | None:
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def stats(self) -> dict:
+        return {
+            'entries': len(self._entries),
+            'size': self.size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
+
+    def _evict(self) -> None:
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_size is not None and self.size > self.max_size)
+        ):
+            _, (_, _, size, owner) = self._entries.popitem(last=False)
+            self.size -= size
+            self.evictions += 1
+            if owner is not None:
+                owner.size -= size
+                owner.evictions += 1
+
+
+class CacheStats:
+    """
+    Counters of the cached responses of an endpoint (in this process)
+        - `fills` are the responses which have been computed & cached after a miss,
+            `fill_latency` is the histogram of their durations (seconds)
+        - `size` is the bytes of its responses which are in the memory (`caches`) right now,
+            `filled_size` is the bytes which have been cached (in redis or memory) since the start
+    """
+    FILL_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    __slots__ = ('hits', 'stale_hits', 'misses', 'fills', 'evictions', 'size', 'filled_size', 'fill_latency')
+
+    def __init__(self):
+        self.size = 0
+        self.reset()
+
+    def reset(self) -> None:
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.fills = 0
+        self.evictions = 0
+        self.filled_size = 0
+        # The last bucket is for the fills which took longer than all the `FILL_LATENCY_BUCKETS`
+        self.fill_latency = [0] * (len(self.FILL_LATENCY_BUCKETS) + 1)
+        # `size` is not reset, its entries are still in the memory
+
+    def observe_fill(self, seconds: float, /) -> None:
+        self.fills += 1
+        self.fill_latency[bisect.bisect_left(self.FILL_LATENCY_BUCKETS, seconds)] += 1
+
+    @property
+    def hit_ratio(self) -> float | None:
+        if total := self.hits + self.stale_hits + self.misses:
+            return (self.hits + self.stale_hits) / total
+        return None
+
+    def to_dict(self) -> dict:
+        buckets = [f'<={bucket}' for bucket in self.FILL_LATENCY_BUCKETS] + [f'>{self.FILL_LATENCY_BUCKETS[-1]}']
+        return {
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'hit_ratio': self.hit_ratio,
+            'fills': self.fills,
+            'fill_latency': dict(zip(buckets, self.fill_latency)),
+            'evictions': self.evictions,
+            'size': self.size,
+            'filled_size': self.filled_size,
+        }
+
+
+caches = InMemoryCache()
+# Per-worker tier in front of redis (if `LOCAL_CACHE_EXP` is set)
+local_caches = InMemoryCache()
+local_cache_fills: dict[str, asyncio.Future] = {}
+CACHE_INVALIDATION_CHANNEL = 'cache_invalidations'
+# `module.endpoint` --> its counters (they are registered in `API()`)
+cache_stats: dict[str, CacheStats] = defaultdict(CacheStats)
+
+
+def get_cache_stats() -> dict:
+    """The counters of the endpoints & the in-memory caches of this process"""
+    return {
+        'endpoints': {name: stats.to_dict() for name, stats in cache_stats.items()},
+        'memory': caches.stats,
+        'local': local_caches.stats,
+    }
+
+
+def cached_response_size(response: CachedResponse) -> int:
+    encodings_size = sum(len(body) for body in (response.encodings or {}).values())
+    return len(response.data) + encodings_size + sum(len(k) + len(v) for k, v in response.headers)
+
+
+# The responses which are being computed right now (in this process)
+in_flight: dict[str, asyncio.Future] = {}
+SINGLE_FLIGHT_LOCK_TIMEOUT = timedelta(seconds=5)
+SINGLE_FLIGHT_POLL_INTERVAL = 0.01
+
+# Deletes the lock (KEYS[1]) only if it still has our token (ARGV[1])
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def build_cache_key(prefix: str, *parts: bytes) -> str:
+    """Hash the raw `parts` (`blake2b` with a small digest), so the key is short whatever the parts are"""
+    digest = hashlib.blake2b(b'\0'.join(parts), digest_size=16).hexdigest()
+    return f'{prefix}-{digest}'
+
+
+def normalize_query_string(query_string: bytes, /) -> bytes:
+    """`b=2&a=1` --> `a=1&b=2` (the order of the repeated params is kept)"""
+    if b'&' not in query_string:
+        return query_string
+    return b'&'.join(sorted(query_string.split(b'&'), key=lambda param: param.partition(b'=')[0]))
+
+
+def _client_identity(request: Request) -> bytes:
+    return str(request.user and request.user.id or request.client.ip).encode()
+
+
+def _request_identity(request: Request) -> tuple[bytes, ...]:
+    validated_data = request.validated_data
+    if validated_data is not None:
+        validated_data = validated_data.model_dump() if isinstance(validated_data, BaseModel) else validated_data
+    return (
+        request.path.encode(),
+        normalize_query_string(request.scope['query_string']),
+        b'' if validated_data is None else json.dumps(validated_data, default=str),
+    )
+
+
+def api_cache_key(request: Request) -> str:
+    """Default `cache_key` of the `API()`, each user (or ip) has its own cached response"""
+    return build_cache_key('cache', _client_identity(request), *_request_identity(request))
+
+
+def shared_cache_key(request: Request) -> str:
+    """Same cached response for all the users, e.g. `@API(cache=True, cache_key=shared_cache_key)`"""
+    return build_cache_key('cache', b'', *_request_identity(request))
+
+
+def throttling_cache_key(request: Request, duration: timedelta, window: int | None = None) -> str:
+    if window is None:
+        window = int(time.time() // duration.total_seconds())
+    return build_cache_key(f'throttling-{window}', _client_identity(request), request.path.encode())
+
+
+async def get_response_from_cache(
+        *,
+        request: Request,
+        cache_exp_time: timedelta,
+        key: str | None = None,
+) -> CachedResponse | None:
     """
     If redis.is_connected:
         Get Cached Data From Redis
     else:
         Get Cached Data From Memory
     """
+    key = key or api_cache_key(request=request)
     if redis.is_connected:
-        key = api_cache_key(request=request)
-        data = (await redis.get(key) or b'{}').decode()
-        if value := json.loads(data):
-            return CachedResponse(
-                data=value[0].encode(),
-                headers=value[1],
-                status_code=value[2]
-            )
+        if config.LOCAL_CACHE_EXP:
+            return local_caches.get(key) or await _fill_local_cache(key)
+        return await _get_response_from_redis(key)
     else:
-        key = api_cache_key(request=request, cache_exp_time=cache_exp_time)
-        if value := caches.get(key):
-            return CachedResponse(*value)
+        return caches.get(key)
+
 
+async def _get_response_from_redis(key: str, /) -> CachedResponse | None:
+    if entry := await redis.get(key):
+        return load_cache_entry(entry)
 
-async def set_response_in_cache(*, request: Request, response: Response, cache_exp_time: timedelta | int) -> None:
+
+async def _fill_local_cache(key: str, /) -> CachedResponse | None:
+    """Get the response from redis and keep it in `local_caches`, concurrent fills of a key share one `redis.get()`"""
+    if future := local_cache_fills.get(key):
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if not future.cancelled():  # This request itself has been cancelled
+                raise
+            return await _get_response_from_redis(key)
+
+    future = asyncio.get_running_loop().create_future()
+    local_cache_fills[key] = future
+    try:
+        if cached := await _get_response_from_redis(key):
+            local_caches.set(key, cached, ttl=config.LOCAL_CACHE_EXP, size=cached_response_size(cached))
+        future.set_result(cached)
+        return cached
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()  # The waiters (if any) raise it, so don't log it as `never retrieved`
+        raise
+    finally:
+        local_cache_fills.pop(key, None)
+
+
+async def listen_to_cache_invalidations() -> None:
+    """
+    Each worker removes the keys, which have been changed in redis, from its own `local_caches`
+        * It is started (per process) in the application startup, like `WebsocketConnections`
+    """
+    pubsub = redis.create_connection_for_websocket().pubsub()
+    await pubsub.subscribe(CACHE_INVALIDATION_CHANNEL)
+    logger.info(f"Subscribed to '{CACHE_INVALIDATION_CHANNEL}' channel")
+    async for channel_data in pubsub.listen():
+        match channel_data['type']:
+            # Subscribed
+            case 'subscribe':
+                continue
+
+            # Message Received
+            case 'message':
+                local_caches.delete(channel_data['data'].decode())
+
+            case unknown_type:
+                logger.error(f'Unknown Channel Type: {unknown_type}')
+
+
+async def set_response_in_cache(
+        *,
+        request: Request,
+        response: Response,
+        cache_exp_time: timedelta | int,
+        cache_stale_time: timedelta | int | None = None,
+        cache_tags: Iterable[str] = (),
+        key: str | None = None,
+        stats: CacheStats | None = None,
+) -> None:
     """
     If redis.is_connected:
         Cache The Data In Redis
     else:
         Cache The Data In Memory
+
+    If `cache_stale_time` is set, the response is kept for `cache_stale_time` more,
+        but it is marked as stale after the `cache_exp_time`
+    The response is removed whenever one of its `cache_tags` is invalidated (`invalidate_cache_tags()`)
+    The cached bytes are counted in the `stats` of the endpoint (if any)
     """
 
-    if redis.is_connected:
-        key = api_cache_key(request=request)
-        cache_data: tuple[str, str, int] = (response.body.decode(), response.headers, response.status_code)
-        cache_exp_time = cache_exp_time or config.DEFAULT_CACHE_EXP
-        cache_data: bytes = json.dumps(cache_data)
+    cache_exp_time = cache_exp_time or config.DEFAULT_CACHE_EXP
+    if not isinstance(cache_exp_time, timedelta | int | NoneType):
+        msg = '`cache_exp_time` should be instance of `datetime.timedelta`, `int` or `None`'
+        raise TypeError(msg)
 
-        if not isinstance(cache_exp_time, timedelta | int | NoneType):
-            msg = '`cache_exp_time` should be instance of `datetime.timedelta`, `int` or `None`'
-            raise TypeError(msg)
+    fresh_until = None
+    if cache_exp_time is not None and cache_stale_time:
+        cache_exp_time = _to_timedelta(cache_exp_time)
+        fresh_until = time.time() + cache_exp_time.total_seconds()
+        cache_exp_time += _to_timedelta(cache_stale_time)
+
+    key = key or api_cache_key(request=request)
+    compress = config.CACHE_COMPRESSION_MIN_SIZE is not None and len(response.body) >= config.CACHE_COMPRESSION_MIN_SIZE
+    cached = CachedResponse.from_response(response, fresh_until=fresh_until, compress=compress)
+    if redis.is_connected:
+        cache_data: bytes = dump_cache_entry(cached)
+        if stats is not None:
+            stats.filled_size += len(cache_data)
 
         if cache_exp_time is None:
             logger.warning(
@@ -85,44 +532,423 @@ async def set_response_in_cache(*, request: Request, response: Response, cache_e
         else:
             await redis.set(key, cache_data, ex=cache_exp_time)
 
+        if config.LOCAL_CACHE_EXP:
+            # The old response may still be in the `local_caches` of the workers
+            await redis.publish(CACHE_INVALIDATION_CHANNEL, key)
+
     else:
-        key = api_cache_key(request=request, cache_exp_time=cache_exp_time)
-        cache_data: tuple[bytes, str, int] = (response.body, response.headers, response.status_code)
+        size = cached_response_size(cached)
+        if stats is not None:
+            stats.filled_size += size
+        caches.set(key, cached, ttl=cache_exp_time, size=size, owner=stats)
 
-        caches[key] = cache_data
+    for tag in cache_tags:
+        await _tag_key(tag=tag, key=key, cache_exp_time=cache_exp_time)
 
-        if cache_exp_time:
-            logger.info('`cache_exp_time` is not very accurate when `redis` is not connected.')
 
+# # # Tags
+# `Book` --> the keys of the responses which are tagged with `Book`
+tagged_keys: dict[str, set[str]] = defaultdict(set)
+# `Book` --> {`Book:1`, `Book:2`, ...}
+child_tags: dict[str, set[str]] = defaultdict(set)
+# It is set in `API()`, so the writes don't look for the tags when no endpoint has them
+cache_tags_used: bool = False
+# The in-memory tags are pruned when there are more of them than this
+_tags_prune_at: int = 64
 
-async def get_throttling_from_cache(request: Request, duration: timedelta) -> int:
-    """
-    If redis.is_connected:
-        Get Cached Data From Redis
+# Adds the ARGV[i + 1] to the KEYS[i] sets & only ever extends their TTL,
+#   so a tag lives as long as its longest-lived key (ARGV[1] = 0 means forever)
+TAG_SCRIPT = """
+local seconds = tonumber(ARGV[1])
+for i, key in ipairs(KEYS) do
+    local ttl = redis.call('TTL', key)
+    redis.call('SADD', key, ARGV[i + 1])
+    if seconds == 0 then
+        redis.call('PERSIST', key)
+    elseif ttl == -2 or (ttl >= 0 and ttl < seconds) then
+        redis.call('EXPIRE', key, seconds)
+    end
+end
+"""
+
+
+def _tag_redis_key(tag: str, /) -> str:
+    return f'cache-tag-{tag}'
+
+
+def _child_tags_redis_key(tag: str, /) -> str:
+    return f'cache-tag-children-{tag}'
+
+
+async def _tag_key(*, tag: str, key: str, cache_exp_time: timedelta | int | None) -> None:
+    parent = tag.split(':', 1)[0] if ':' in tag else None
+
+    if redis.is_connected:
+        # The tag (& the children set of its parent) is useless after its keys have been expired
+        seconds = 0 if cache_exp_time is None else math.ceil(_to_timedelta(cache_exp_time).total_seconds())
+        if parent:
+            await redis.eval(TAG_SCRIPT, 2, _tag_redis_key(tag), _child_tags_redis_key(parent), seconds, key, tag)
+        else:
+            await redis.eval(TAG_SCRIPT, 1, _tag_redis_key(tag), seconds, key)
     else:
-        Get Cached Data From Memory
+        keys = tagged_keys[tag]
+        keys.add(key)
+        if len(keys) > max(64, 2 * len(caches)):
+            # Forget the keys which have been evicted or expired
+            keys.intersection_update({k for k in keys if k in caches})
+        if parent:
+            child_tags[parent].add(tag)
+        if len(tagged_keys) > _tags_prune_at:
+            _prune_tags()
+
+
+def _prune_tags() -> None:
+    """Forget the in-memory tags (e.g. `Book:1`) which all of their keys have been evicted or expired"""
+    global _tags_prune_at
+
+    for tag in [tag for tag, keys in tagged_keys.items() if not any(key in caches for key in keys)]:
+        del tagged_keys[tag]
+    for parent in list(child_tags):
+        child_tags[parent].intersection_update(tagged_keys)
+        if not child_tags[parent]:
+            del child_tags[parent]
+    # Amortized, so it is not done on every new tag
+    _tags_prune_at = max(64, 2 * len(tagged_keys))
+
+
+async def invalidate_cache_tags(*tags: str, with_children: bool = False) -> None:
+    """
+    Remove the cached responses which are tagged with any of the `tags`
+        `with_children` removes the `Book:*` tags of the `Book` too.
+
+    Example:
+    -------
+        >>> await invalidate_cache_tags('Book', 'Book:1')
     """
-    key = throttling_cache_key(request=request, duration=duration)
+    tags = set(tags)
 
     if redis.is_connected:
-        data = (await redis.get(key) or b'0').decode()
-        return json.loads(data)
+        if with_children:
+            for tag in list(tags):
+                tags.update(member.decode() for member in await redis.smembers(_child_tags_redis_key(tag)))
+                await redis.delete(_child_tags_redis_key(tag))
+        for tag in tags:
+            keys = [key.decode() for key in await redis.smembers(_tag_redis_key(tag))]
+            await redis.delete(_tag_redis_key(tag), *keys)
+            if config.LOCAL_CACHE_EXP:
+                for key in keys:
+                    await redis.publish(CACHE_INVALIDATION_CHANNEL, key)
+    else:
+        if with_children:
+            for tag in list(tags):
+                tags.update(child_tags.pop(tag, ()))
+        for tag in tags:
+            for key in tagged_keys.pop(tag, ()):
+                caches.delete(key)
+
 
+async def invalidate_model_cache(model_or_instance, *, with_children: bool = True) -> None:
+    """
+    Called after the writes of `Query`
+        `Book.update_many()` --> `Book` & `Book:*`
+        `book.update()` --> `Book` & `Book:1`
+    """
+    if isinstance(model_or_instance, type):
+        await invalidate_cache_tags(model_or_instance.__name__, with_children=with_children)
     else:
-        return throttling_storage[key]
+        model_name = type(model_or_instance).__name__
+        await invalidate_cache_tags(model_name, f'{model_name}:{model_or_instance.id}')
+
+
+def _to_timedelta(value: timedelta | int, /) -> timedelta:
+    return value if isinstance(value, timedelta) else timedelta(seconds=value)
+
+
+async def single_flight(
+        *,
+        request: Request,
+        func: Callable[[], Awaitable[Response]],
+        key: str | None = None,
+) -> Response:
+    """
+    Only the first request of a missed cache key calls the `func()` (which should set the response in the cache),
+        the concurrent identical requests wait for its response.
+    If redis.is_connected:
+        Other workers wait too, while the first one holds a short lock on the key
+    """
+    key = key or api_cache_key(request=request)
+
+    if future := in_flight.get(key):
+        try:
+            cached = await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if not future.cancelled():  # This request itself has been cancelled
+                raise
+            return await func()
+        return cached.to_response(request)
+
+    future = asyncio.get_running_loop().create_future()
+    in_flight[key] = future
+    lock_key = f'single-flight-{key}'
+    # Only the owner of the lock releases it, it may have been expired & taken by another worker meanwhile
+    lock_token = secrets.token_hex(16)
+    has_lock = False
+    try:
+        if redis.is_connected:
+            has_lock = await redis.set(lock_key, lock_token, nx=True, px=SINGLE_FLIGHT_LOCK_TIMEOUT)
+            if not has_lock and (cached := await _wait_for_other_worker(request=request, key=key, lock_key=lock_key)):
+                future.set_result(cached)
+                return cached.to_response(request)
 
+        response = await func()
+        future.set_result(CachedResponse.from_response(response))
+        return response
 
-async def increment_throttling_in_cache(request: Request, duration: timedelta) -> None:
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()  # The waiters (if any) raise it, so don't log it as `never retrieved`
+        raise
+    finally:
+        in_flight.pop(key, None)
+        if has_lock:
+            await redis.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, lock_token)
+
+
+# The keys which are being revalidated in the background right now (in this process)
+revalidating: dict[str, asyncio.Task] = {}
+
+
+def revalidate_in_background(
+        *,
+        request: Request,
+        func: Callable[[], Awaitable[Response]],
+        key: str | None = None,
+) -> None:
+    """Call the `func()` (which should set the new response in the cache) once per key, without waiting for it."""
+    key = key or api_cache_key(request=request)
+    if key in revalidating or key in in_flight:
+        return
+
+    def done(task: asyncio.Task) -> None:
+        revalidating.pop(key, None)
+        if not task.cancelled() and (exception := task.exception()):
+            logger.error(f'Could not revalidate the stale cache of `{request.path}`: {exception!r}')
+
+    revalidating[key] = asyncio.create_task(single_flight(request=request, func=func, key=key))
+    revalidating[key].add_done_callback(done)
+
+
+async def _wait_for_other_worker(*, request: Request, key: str, lock_key: str) -> CachedResponse | None:
+    """Wait until the lock is released (or expired), then return the cached response, if it is there."""
+    while await redis.exists(lock_key):
+        await asyncio.sleep(SINGLE_FLIGHT_POLL_INTERVAL)
+    return await get_response_from_cache(request=request, cache_exp_time=None, key=key)
+
+
+async def increment_throttling_in_cache(request: Request, duration: timedelta) -> int:
     """
+    Increment the counter of the current window and return the new value
     If redis.is_connected:
-        Increment The Data In Redis
+        `INCR` & `EXPIRE` in one atomic round trip, so the concurrent requests can't pass the `rate`
+        and the passed windows don't stay in redis
     else:
         Increment The Data In Memory
     """
-    key = throttling_cache_key(request=request, duration=duration)
+    seconds = duration.total_seconds()
+    window = int(time.time() // seconds)
+    key = throttling_cache_key(request=request, duration=duration, window=window)
 
     if redis.is_connected:
-        await redis.incrby(key, amount=1)
+        async with redis.pipeline(transaction=True) as pipeline:
+            count, _ = await pipeline.incr(key).expire(key, duration).execute()
+        return count
 
     else:
-        throttling_storage[key] += 1
+        return panther_throttling.throttling_storage.incr(key, expires_at=(window + 1) * seconds)
+
+
+async def throttle(request: Request, throttling: Throttling) -> ThrottlingStatus:
+    """Count the `request` with the `algorithm` of the `throttling`"""
+    match throttling.algorithm:
+        case 'sliding_window':
+            return await _sliding_window_throttling(request=request, throttling=throttling)
+        case 'gcra':
+            return await _gcra_throttling(request=request, throttling=throttling)
+        case _:
+            if throttling.flush_interval and redis.is_connected:
+                return _batched_throttling(request=request, throttling=throttling)
+            count = await increment_throttling_in_cache(request, duration=throttling.duration)
+            return _fixed_window_status(throttling=throttling, count=count)
+
+
+def _fixed_window_status(*, throttling: Throttling, count: int) -> ThrottlingStatus:
+    if count <= throttling.rate:
+        return ThrottlingStatus(allowed=True, limit=throttling.rate, remaining=throttling.rate - count)
+
+    seconds = throttling.duration.total_seconds()
+    return ThrottlingStatus(
+        allowed=False, limit=throttling.rate, remaining=0, retry_after=seconds - time.time() % seconds,
+    )
+
+
+class BatchedThrottlingCounters:
+    """
+    Fixed window counters of a `Throttling(flush_interval=...)` in this process.
+        - Each request is counted locally, the counts are sent to redis (`INCRBY`) every `flush_interval`
+            in the background, and the totals of all the workers are read back at the same time
+        - Each worker may pass the `rate` by the requests it gets in one `flush_interval`
+    """
+    def __init__(self, throttling: Throttling):
+        self.duration = throttling.duration
+        self.flush_interval = throttling.flush_interval.total_seconds()
+        self.next_flush = time.time() + self.flush_interval
+        self.pending: dict[str, list] = {}  # key -> [count, expires_at], which have not been sent yet
+        self.sending: dict[str, int] = {}  # key -> count, which are being sent right now
+        self.totals: dict[str, tuple[int, float]] = {}  # key -> (count of all the workers, expires_at)
+        self.task: asyncio.Task | None = None
+
+    def incr(self, key: str, *, expires_at: float) -> int:
+        if (pending := self.pending.get(key)) is None:
+            pending = self.pending[key] = [0, expires_at]
+        pending[0] += 1
+
+        if self.task is None and time.time() >= self.next_flush:
+            self.task = asyncio.create_task(self.flush())
+            self.task.add_done_callback(self._flushed)
+
+        total, _ = self.totals.get(key, (0, None))
+        return total + self.sending.get(key, 0) + pending[0]
+
+    async def flush(self) -> None:
+        pending, self.pending = self.pending, {}
+        self.sending = {key: count for key, (count, _) in pending.items()}
+        try:
+            async with redis.pipeline(transaction=False) as pipeline:
+                for key, count in self.sending.items():
+                    pipeline.incrby(key, count).expire(key, self.duration)
+                results = await pipeline.execute()
+        except Exception:
+            # Send them with the next flush
+            for key, (count, expires_at) in pending.items():
+                self.pending.setdefault(key, [0, expires_at])[0] += count
+            raise
+        finally:
+            self.sending = {}
+
+        now = time.time()
+        self.totals = {key: total for key, total in self.totals.items() if total[1] > now}
+        for (key, (_, expires_at)), total in zip(pending.items(), results[::2]):
+            self.totals[key] = (total, expires_at)
+
+    def _flushed(self, task: asyncio.Task) -> None:
+        self.task = None
+        self.next_flush = time.time() + self.flush_interval
+        if not task.cancelled() and (exception := task.exception()):
+            logger.error(f'Could not send the throttling counters to redis: {exception!r}')
+
+
+# `Throttling` --> its counters (`flush_interval` is set per `Throttling`)
+batched_throttling_counters: dict[Throttling, BatchedThrottlingCounters] = {}
+
+
+def _batched_throttling(*, request: Request, throttling: Throttling) -> ThrottlingStatus:
+    if (counters := batched_throttling_counters.get(throttling)) is None:
+        counters = batched_throttling_counters[throttling] = BatchedThrottlingCounters(throttling)
+
+    seconds = throttling.duration.total_seconds()
+    window = int(time.time() // seconds)
+    key = throttling_cache_key(request=request, duration=throttling.duration, window=window)
+    count = counters.incr(key, expires_at=(window + 1) * seconds)
+    return _fixed_window_status(throttling=throttling, count=count)
+
+
+async def _sliding_window_throttling(*, request: Request, throttling: Throttling) -> ThrottlingStatus:
+    """
+    count of the current window + count of the previous window * (the part of it which is in the last `duration`)
+        * The rejected requests are not counted, so the clients which are retrying won't be blocked forever
+    """
+    seconds = throttling.duration.total_seconds()
+    now = time.time() / seconds
+    window = int(now)
+    elapsed = now - window  # Passed part of the current window (0 <= elapsed < 1)
+    key = throttling_cache_key(request=request, duration=throttling.duration, window=window)
+    previous_key = throttling_cache_key(request=request, duration=throttling.duration, window=window - 1)
+
+    if redis.is_connected:
+        async with redis.pipeline(transaction=True) as pipeline:
+            count, _, previous = await (
+                pipeline.incr(key).expire(key, throttling.duration * 2).get(previous_key).execute()
+            )
+        previous = int(previous or 0)
+    else:
+        # It is the previous window of the next window too
+        count = panther_throttling.throttling_storage.incr(key, expires_at=(window + 2) * seconds)
+        previous = panther_throttling.throttling_storage.get(previous_key)
+
+    estimated = previous * (1 - elapsed) + count
+    if estimated <= throttling.rate:
+        return ThrottlingStatus(allowed=True, limit=throttling.rate, remaining=int(throttling.rate - estimated))
+
+    # Undo the count of this request
+    if redis.is_connected:
+        await redis.decr(key)
+    else:
+        panther_throttling.throttling_storage.incr(key, -1, expires_at=(window + 2) * seconds)
+    count -= 1
+
+    if count < throttling.rate and previous:
+        # Wait till enough of the previous window slides out
+        retry_after = 1 - (throttling.rate - count - 1) / previous - elapsed
+    else:
+        # Wait till the next window, then for enough of this window to slide out
+        retry_after = 1 - elapsed + 1 - (throttling.rate - 1) / count
+    return ThrottlingStatus(
+        allowed=False, limit=throttling.rate, remaining=0, retry_after=max(retry_after, 0) * seconds,
+    )
+
+
+# Returns [allowed, theoretical arrival time]
+GCRA_SCRIPT = """
+local now = tonumber(ARGV[1])
+local interval = tonumber(ARGV[2])
+local duration = tonumber(ARGV[3])
+local tat = math.max(tonumber(redis.call('GET', KEYS[1]) or now), now)
+local new_tat = tat + interval
+if new_tat - now > duration then
+    return {0, tostring(tat)}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return {1, tostring(new_tat)}
+"""
+
+
+async def _gcra_throttling(*, request: Request, throttling: Throttling) -> ThrottlingStatus:
+    """
+    Each request moves the theoretical arrival time (`tat`) of the client `duration / rate` forward,
+        the request is rejected if the `tat` gets more than `duration` ahead of now.
+    """
+    seconds = throttling.duration.total_seconds()
+    interval = seconds / throttling.rate
+    key = build_cache_key('throttling-gcra', _client_identity(request), request.path.encode())
+    now = time.time()
+
+    if redis.is_connected:
+        allowed, tat = await redis.eval(GCRA_SCRIPT, 1, key, now, interval, seconds)
+        allowed, tat = bool(allowed), float(tat)
+    else:
+        storage = panther_throttling.throttling_storage
+        with storage.lock():  # Other workers may share the `storage`
+            tat = max(storage.get(key, now), now)
+            if allowed := tat + interval - now <= seconds:
+                tat += interval
+                # The client is as new as a new one after the `tat`
+                storage.set(key, tat, expires_at=tat)
+
+    if allowed:
+        return ThrottlingStatus(allowed=True, limit=throttling.rate, remaining=int((seconds - (tat - now)) // interval))
+    return ThrottlingStatus(
+        allowed=False, limit=throttling.rate, remaining=0, retry_after=tat + interval - seconds - now,
+    )
@@ -3,7 +3,7 @@ import logging
 import os
 import platform
 import signal
-from collections import deque
+from collections import Counter, defaultdict, deque
 from pathlib import Path
 
 from rich import box
@@ -25,6 +25,8 @@ logger = logging.getLogger('panther')
 class Monitoring:
     def __init__(self):
         self.rows = deque()
+        # path --> {'HIT': 10, 'STALE': 1, 'MISS': 2}
+        self.cache_counts = defaultdict(Counter)
         self.monitoring_log_file = Path(config.BASE_DIR / 'logs' / 'monitoring.log')
 
     def monitor(self) -> None:
@@ -51,10 +53,7 @@ class Monitoring:
 
             for _ in watching:
                 for line in f.readlines():
-                    # line = date_time | method | path | ip:port | response_time(seconds) | status
-                    columns = line.split('|')
-                    columns[4] = self._clean_response_time(float(columns[4]))
-                    self.rows.append(columns)
+                    self.rows.append(self.parse_line(line))
                     live.update(self.generate_table())
 
     def initialize(self) -> str:
@@ -75,8 +74,19 @@ class Monitoring:
         if platform.system() != 'Windows':
             signal.signal(signal.SIGWINCH, self.update_rows)
 
+    def parse_line(self, line: str) -> list[str]:
+        # line = date_time | method | path | ip:port | response_time(seconds) | status | cache
+        columns = line.rstrip('\n').split('|')
+        columns[4] = self._clean_response_time(float(columns[4]))
+        if len(columns) == 6:
+            # It has been logged before the `cache` column
+            columns.append(' - ')
+        if (cache_status := columns[6].strip()) != '-':
+            self.cache_counts[columns[2].strip()][cache_status] += 1
+        return columns
+
     def generate_table(self) -> Panel:
-        # 2023-03-24 01:42:52 | GET | /user/317/ | 127.0.0.1:48856 |  0.0366 ms | 200
+        # 2023-03-24 01:42:52 | GET | /user/317/ | 127.0.0.1:48856 |  0.0366 ms | 200 | HIT
 
         table = Table(box=box.MINIMAL_DOUBLE_HEAD)
         table.add_column('Datetime', justify='center', style='magenta', no_wrap=True)
@@ -85,18 +95,42 @@ class Monitoring:
         table.add_column('Client', justify='center', style='cyan')
         table.add_column('Response Time', justify='center', style='blue')
         table.add_column('Status', justify='center', style='blue', no_wrap=True)
+        table.add_column('Cache', justify='center', style='green', no_wrap=True)
 
         for row in self.rows:
             table.add_row(*row)
 
+        tables = [table]
+        if self.cache_counts:
+            tables.append(self.generate_cache_table())
+
         return Panel(
-            Align.center(Group(table)),
+            Align.center(Group(*tables)),
             box=box.ROUNDED,
             padding=(0, 2),
             title='Monitoring',
             border_style='bright_blue',
         )
 
+    def generate_cache_table(self) -> Table:
+        table = Table(box=box.MINIMAL_DOUBLE_HEAD, title='Cache')
+        table.add_column('Path', justify='center', style='cyan', no_wrap=True)
+        table.add_column('Hits', justify='center', style='green')
+        table.add_column('Stale Hits', justify='center', style='yellow')
+        table.add_column('Misses', justify='center', style='red')
+        table.add_column('Hit Ratio', justify='center', style='blue')
+
+        for path, counts in self.cache_counts.items():
+            hits = counts['HIT'] + counts['STALE']
+            table.add_row(
+                path,
+                str(counts['HIT']),
+                str(counts['STALE']),
+                str(counts['MISS']),
+                f'{hits / (hits + counts["MISS"]):.0%}',
+            )
+        return table
+
     def update_rows(self, *args, **kwargs):
         # Top = -4, Bottom = -2 --> -6
         # Print of each line needs two line, so --> x // 2
@@ -50,11 +50,19 @@ class Config:
     BASE_DIR: Path
     MONITORING: bool
     LOG_QUERIES: bool
+    STRICT_RESPONSE: bool
     DEFAULT_CACHE_EXP: timedelta | None
+    MEMORY_CACHE_MAX_ENTRIES: int | None
+    MEMORY_CACHE_MAX_SIZE: int | None
+    LOCAL_CACHE_EXP: timedelta | int | None
+    CACHE_COMPRESSION_MIN_SIZE: int | None
     THROTTLING: Throttling | None
+    THROTTLING_MAX_KEYS: int | None
+    THROTTLING_SHARED_MEMORY: bool
     SECRET_KEY: bytes | None
-    HTTP_MIDDLEWARES: list[tuple]
-    WS_MIDDLEWARES: list[tuple]
+    HTTP_MIDDLEWARES: list
+    WS_MIDDLEWARES: list
+    ASGI_MIDDLEWARES: list[tuple]
     USER_MODEL: ModelMetaclass | None
     AUTHENTICATION: ModelMetaclass | None
     WS_AUTHENTICATION: ModelMetaclass | None
@@ -62,6 +70,8 @@ class Config:
     MODELS: list[dict]
     FLAT_URLS: dict
     URLS: dict
+    ROUTER: typing.Any | None
+    ROUTE_CACHE_SIZE: int | None
     WEBSOCKET_CONNECTIONS: typing.Callable | None
     BACKGROUND_TASKS: bool
     HAS_WS: bool
@@ -78,6 +88,9 @@ class Config:
         super().__setattr__(key, value)
         if key == 'QUERY_ENGINE' and value:
             QueryObservable.update()
+        elif key == 'URLS':
+            # The `ROUTER` is compiled from the `URLS`, so it should be compiled again
+            super().__setattr__('ROUTER', None)
 
     def __setitem__(self, key, value):
         setattr(self, key.upper(), value)
@@ -95,11 +108,19 @@ default_configs = {
     'BASE_DIR': Path(),
     'MONITORING': False,
     'LOG_QUERIES': False,
+    'STRICT_RESPONSE': False,
     'DEFAULT_CACHE_EXP': None,
+    'MEMORY_CACHE_MAX_ENTRIES': 10_000,
+    'MEMORY_CACHE_MAX_SIZE': 64 * 1024 * 1024,
+    'LOCAL_CACHE_EXP': None,
+    'CACHE_COMPRESSION_MIN_SIZE': None,
     'THROTTLING': None,
+    'THROTTLING_MAX_KEYS': 100_000,
+    'THROTTLING_SHARED_MEMORY': False,
     'SECRET_KEY': None,
     'HTTP_MIDDLEWARES': [],
     'WS_MIDDLEWARES': [],
+    'ASGI_MIDDLEWARES': [],
     'USER_MODEL': None,
     'AUTHENTICATION': None,
     'WS_AUTHENTICATION': None,
@@ -107,6 +128,8 @@ default_configs = {
     'MODELS': [],
     'FLAT_URLS': {},
     'URLS': {},
+    'ROUTER': None,
+    'ROUTE_CACHE_SIZE': None,
     'WEBSOCKET_CONNECTIONS': None,
     'BACKGROUND_TASKS': False,
     'HAS_WS': False,
@@ -2,42 +2,73 @@ from __future__ import annotations
 
 from sys import version_info
 
-try:
-    from pymongo.cursor import Cursor as _Cursor
-except ImportError:
-    # This '_Cursor' is not going to be used,
-    #   If user really wants to use it,
-    #   we are going to force him to install it in `panther.db.connections.MongoDBConnection.init`
-    _Cursor = type('_Cursor', (), {})
-
 if version_info >= (3, 11):
     from typing import Self
 else:
     from typing import TypeVar
 
-    Self = TypeVar('Self', bound='BaseMongoDBQuery')
+    Self = TypeVar('Self', bound='Cursor')
+
+
+class Cursor:
+    """
+    Async cursor of `find()` (MongoDB), it is on top of the `motor` cursor,
+        so fetching the documents doesn't block the event loop.
+    It returns an instance of the model in each iteration.
+
+    Example:
+    -------
+        >>> async for user in await User.find(age=18):
+        >>>     ...
+        or
+        >>> users = await (await User.find(age=18)).sort('_id', -1).skip(10).limit(10).to_list(None)
+        or
+        >>> users = await (await User.find(age=18, fields=['name'])).to_list(None)
+    """
+
+    def __init__(self, cls, collection, filter: dict, fields: tuple[str, ...] | None = None):
+        self.cls = cls
+        self.filter = filter
+        self.fields = fields
+        self._collection = collection
+        # The chained `sort()`, `skip()` & `limit()`, so `only()` can apply them on the new cursor
+        self._chain = []
+        # `motor.motor_asyncio.AsyncIOMotorCursor`
+        self._cursor = collection.find(filter, cls._projection(fields))
+
+    def sort(self, *args, **kwargs) -> Self:
+        self._cursor.sort(*args, **kwargs)
+        self._chain.append(('sort', args, kwargs))
+        return self
 
+    def skip(self, skip: int) -> Self:
+        self._cursor.skip(skip)
+        self._chain.append(('skip', (skip,), {}))
+        return self
 
-class Cursor(_Cursor):
-    models = {}
+    def limit(self, limit: int) -> Self:
+        self._cursor.limit(limit)
+        self._chain.append(('limit', (limit,), {}))
+        return self
 
-    def __init__(self, collection, *args, cls=None, **kwargs):
-        # cls.__name__ and collection.name are equal.
-        if cls:
-            self.models[collection.name] = cls
-            self.cls = cls
-            self.filter = kwargs['filter']
-        else:
-            self.cls = self.models[collection.name]
-        super().__init__(collection, *args, **kwargs)
+    def only(self, fields: tuple[str, ...] | None) -> Self:
+        """Change the projection (before fetching), the chained `sort()`, `skip()` & `limit()` are kept"""
+        self.fields = self.cls._clean_fields(fields)
+        self._cursor = self._collection.find(self.filter, self.cls._projection(self.fields))
+        for method, args, kwargs in self._chain:
+            getattr(self._cursor, method)(*args, **kwargs)
+        return self
 
-    def next(self) -> Self:
-        return self.cls._create_model_instance(document=super().next())
+    def __aiter__(self) -> Self:
+        return self
 
-    __next__ = next
+    async def __anext__(self):
+        # It raises `StopAsyncIteration` at the end
+        return self.cls._create_model_instance(document=await self._cursor.next(), fields=self.fields)
 
-    def __getitem__(self, index: int | slice) -> Cursor[Self] | Self:
-        result = super().__getitem__(index)
-        if isinstance(result, dict):
-            return self.cls._create_model_instance(document=result)
-        return result
+    async def to_list(self, length: int | None = None) -> list:
+        """Fetch `length` (`None` means all) of the remaining documents"""
+        return [
+            self.cls._create_model_instance(document=document, fields=self.fields)
+            for document in await self._cursor.to_list(length)
+        ]
@@ -1,8 +1,8 @@
 import operator
 from abc import abstractmethod
+from collections.abc import Iterable, Iterator
 from functools import reduce
 from sys import version_info
-from typing import Iterator
 
 from pydantic_core._pydantic_core import ValidationError
 
@@ -46,10 +46,48 @@ class BaseQuery:
                 raise DatabaseError(error)
 
     @classmethod
-    def _create_model_instance(cls, document: dict):
+    def _clean_fields(cls, fields: Iterable[str] | None) -> tuple[str, ...] | None:
+        """
+        Validate the projection `fields`,
+            `id` is always included, so `update()` & `delete()` still work on the partial instances.
+        """
+        if fields is None:
+            return None
+        if isinstance(fields, str):
+            fields = (fields,)
+        if invalid_fields := [field for field in fields if field not in cls.model_fields]:
+            msg = f'{cls.__name__}() does not have these fields: {", ".join(invalid_fields)}'
+            raise DatabaseError(msg)
+        return 'id', *(field for field in dict.fromkeys(fields) if field != 'id')
+
+    @classmethod
+    def _document_key(cls, field_name: str) -> str:
+        """Key of the field in the stored document (id -> _id)"""
+        alias = cls.model_fields[field_name].validation_alias
+        return alias if isinstance(alias, str) else field_name
+
+    @classmethod
+    def _projection(cls, fields: tuple[str, ...] | None) -> dict | None:
+        """Only fetch the `fields` from the database (MongoDB projection) (`None` means the whole document)"""
+        if fields is None:
+            return None
+        return {cls._document_key(field_name): 1 for field_name in fields}
+
+    @classmethod
+    def _create_model_instance(cls, document: dict, fields: tuple[str, ...] | None = None):
         """Prevent getting errors from document insertion"""
         try:
-            return cls(**document)
+            if fields is None:
+                return cls(**document)
+
+            # Only the projected `fields` have been fetched, so we only validate & set them,
+            #   the other fields are left unset (not their defaults), so `save()` doesn't overwrite them.
+            instance = cls.model_construct()
+            instance.__dict__.clear()
+            for field_name in fields:
+                if (key := cls._document_key(field_name)) in document:
+                    cls.__pydantic_validator__.validate_assignment(instance, field_name, document[key])
+            return instance
         except ValidationError as validation_error:
             if error := cls._clean_error_message(validation_error=validation_error):
                 raise DatabaseError(error)
@@ -36,26 +36,39 @@ class BaseMongoDBQuery(BaseQuery):
 
     # # # # # Find # # # # #
     @classmethod
-    async def find_one(cls, _filter: dict | None = None, /, **kwargs) -> Self | None:
-        if document := await db.session[cls.__name__].find_one(cls._merge(_filter, kwargs)):
-            return cls._create_model_instance(document=document)
+    async def find_one(
+            cls,
+            _filter: dict | None = None,
+            /,
+            fields: Iterable[str] | None = None,
+            **kwargs,
+    ) -> Self | None:
+        fields = cls._clean_fields(fields)
+        projection = cls._projection(fields)
+        if document := await db.session[cls.__name__].find_one(cls._merge(_filter, kwargs), projection):
+            return cls._create_model_instance(document=document, fields=fields)
         return None
 
     @classmethod
-    async def find(cls, _filter: dict | None = None, /, **kwargs) -> Cursor:
-        return Cursor(cls=cls, collection=db.session[cls.__name__].delegate, filter=cls._merge(_filter, kwargs))
+    async def find(cls, _filter: dict | None = None, /, fields: Iterable[str] | None = None, **kwargs) -> Cursor:
+        return Cursor(
+            cls=cls,
+            collection=db.session[cls.__name__],
+            filter=cls._merge(_filter, kwargs),
+            fields=cls._clean_fields(fields),
+        )
 
     @classmethod
-    async def first(cls, _filter: dict | None = None, /, **kwargs) -> Self | None:
-        cursor = await cls.find(_filter, **kwargs)
-        for result in cursor.sort('_id', 1).limit(-1):
+    async def first(cls, _filter: dict | None = None, /, fields: Iterable[str] | None = None, **kwargs) -> Self | None:
+        cursor = await cls.find(_filter, fields=fields, **kwargs)
+        for result in await cursor.sort('_id', 1).limit(1).to_list(1):
             return result
         return None
 
     @classmethod
-    async def last(cls, _filter: dict | None = None, /, **kwargs) -> Self | None:
-        cursor = await cls.find(_filter, **kwargs)
-        for result in cursor.sort('_id', -1).limit(-1):
+    async def last(cls, _filter: dict | None = None, /, fields: Iterable[str] | None = None, **kwargs) -> Self | None:
+        cursor = await cls.find(_filter, fields=fields, **kwargs)
+        for result in await cursor.sort('_id', -1).limit(1).to_list(1):
             return result
         return None
 
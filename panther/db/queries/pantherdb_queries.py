@@ -1,3 +1,4 @@
+from functools import partial
 from sys import version_info
 from typing import Iterable
 
@@ -23,28 +24,40 @@ class BasePantherDBQuery(BaseQuery):
 
     # # # # # Find # # # # #
     @classmethod
-    async def find_one(cls, _filter: dict | None = None, /, **kwargs) -> Self | None:
+    async def find_one(
+            cls,
+            _filter: dict | None = None,
+            /,
+            fields: Iterable[str] | None = None,
+            **kwargs,
+    ) -> Self | None:
+        fields = cls._clean_fields(fields)
         if document := db.session.collection(cls.__name__).find_one(**cls._merge(_filter, kwargs)):
-            return cls._create_model_instance(document=document)
+            return cls._create_model_instance(document=document, fields=fields)
         return None
 
     @classmethod
-    async def find(cls, _filter: dict | None = None, /, **kwargs) -> Cursor:
+    async def find(cls, _filter: dict | None = None, /, fields: Iterable[str] | None = None, **kwargs) -> Cursor:
+        # `PantherDB` reads the whole documents anyway, the projection only saves the validation of the other fields
+        fields = cls._clean_fields(fields)
         cursor = db.session.collection(cls.__name__).find(**cls._merge(_filter, kwargs))
-        cursor.response_type = cls._create_model_instance
+        cursor.response_type = partial(cls._create_model_instance, fields=fields)
         cursor.cls = cls
+        cursor.fields = fields
         return cursor
 
     @classmethod
-    async def first(cls, _filter: dict | None = None, /, **kwargs) -> Self | None:
+    async def first(cls, _filter: dict | None = None, /, fields: Iterable[str] | None = None, **kwargs) -> Self | None:
+        fields = cls._clean_fields(fields)
         if document := db.session.collection(cls.__name__).first(**cls._merge(_filter, kwargs)):
-            return cls._create_model_instance(document=document)
+            return cls._create_model_instance(document=document, fields=fields)
         return None
 
     @classmethod
-    async def last(cls, _filter: dict | None = None, /, **kwargs) -> Self | None:
+    async def last(cls, _filter: dict | None = None, /, fields: Iterable[str] | None = None, **kwargs) -> Self | None:
+        fields = cls._clean_fields(fields)
         if document := db.session.collection(cls.__name__).last(**cls._merge(_filter, kwargs)):
-            return cls._create_model_instance(document=document)
+            return cls._create_model_instance(document=document, fields=fields)
         return None
 
     @classmethod
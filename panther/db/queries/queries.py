@@ -7,7 +7,7 @@ from pydantic import BaseModel
 from panther.configs import QueryObservable
 from panther.db.cursor import Cursor
 from panther.db.queries.base_queries import BaseQuery
-from panther.db.utils import log_query, check_connection
+from panther.db.utils import log_query, check_connection, invalidate_cache
 from panther.exceptions import NotFoundAPIError
 
 __all__ = ('Query',)
@@ -41,7 +41,13 @@ class Query(BaseQuery):
     @classmethod
     @check_connection
     @log_query
-    async def find_one(cls, _filter: dict | None = None, /, **kwargs) -> Self | None:
+    async def find_one(
+            cls,
+            _filter: dict | None = None,
+            /,
+            fields: Iterable[str] | None = None,
+            **kwargs,
+    ) -> Self | None:
         """
         Get a single document from the database.
 
@@ -54,13 +60,21 @@ class Query(BaseQuery):
             >>> await User.find_one({'id': 1, 'name': 'Ali'})
             or
             >>> await User.find_one({'id': 1}, name='Ali')
+            or (only fetch the `name` & `id`)
+            >>> await User.find_one({'id': 1}, fields=['name'])
         """
-        return await super().find_one(_filter, **kwargs)
+        return await super().find_one(_filter, fields=fields, **kwargs)
 
     @classmethod
     @check_connection
     @log_query
-    async def find(cls, _filter: dict | None = None, /, **kwargs) -> PantherDBCursor | Cursor:
+    async def find(
+            cls,
+            _filter: dict | None = None,
+            /,
+            fields: Iterable[str] | None = None,
+            **kwargs,
+    ) -> PantherDBCursor | Cursor:
         """
         Get documents from the database.
 
@@ -73,13 +87,15 @@ class Query(BaseQuery):
             >>> await User.find({'age': 18, 'name': 'Ali'})
             or
             >>> await User.find({'age': 18}, name='Ali')
+            or (only fetch the `name` & `id`)
+            >>> await User.find({'age': 18}, fields=['name'])
         """
-        return await super().find(_filter, **kwargs)
+        return await super().find(_filter, fields=fields, **kwargs)
 
     @classmethod
     @check_connection
     @log_query
-    async def first(cls, _filter: dict | None = None, /, **kwargs) -> Self | None:
+    async def first(cls, _filter: dict | None = None, /, fields: Iterable[str] | None = None, **kwargs) -> Self | None:
         """
         Get the first document from the database.
 
@@ -92,13 +108,15 @@ class Query(BaseQuery):
             >>> await User.first({'age': 18, 'name': 'Ali'})
             or
             >>> await User.first({'age': 18}, name='Ali')
+            or (only fetch the `name` & `id`)
+            >>> await User.first({'age': 18}, fields=['name'])
         """
-        return await super().first(_filter, **kwargs)
+        return await super().first(_filter, fields=fields, **kwargs)
 
     @classmethod
     @check_connection
     @log_query
-    async def last(cls, _filter: dict | None = None, /, **kwargs) -> Self | None:
+    async def last(cls, _filter: dict | None = None, /, fields: Iterable[str] | None = None, **kwargs) -> Self | None:
         """
         Get the last document from the database.
 
@@ -111,8 +129,10 @@ class Query(BaseQuery):
             >>> await User.last({'age': 18, 'name': 'Ali'})
             or
             >>> await User.last({'age': 18}, name='Ali')
+            or (only fetch the `name` & `id`)
+            >>> await User.last({'age': 18}, fields=['name'])
         """
-        return await super().last(_filter, **kwargs)
+        return await super().last(_filter, fields=fields, **kwargs)
 
     @classmethod
     @check_connection
@@ -162,6 +182,7 @@ class Query(BaseQuery):
     @classmethod
     @check_connection
     @log_query
+    @invalidate_cache(with_children=False)
     async def insert_one(cls, _document: dict | None = None, /, **kwargs) -> Self:
         """
         Insert a single document.
@@ -181,6 +202,7 @@ class Query(BaseQuery):
     @classmethod
     @check_connection
     @log_query
+    @invalidate_cache(with_children=False)
     async def insert_many(cls, documents: Iterable[dict]) -> list[Self]:
         """
         Insert an iterable of documents.
@@ -201,6 +223,7 @@ class Query(BaseQuery):
     # # # # # Delete # # # # #
     @check_connection
     @log_query
+    @invalidate_cache
     async def delete(self) -> None:
         """
         Delete the document.
@@ -218,6 +241,7 @@ class Query(BaseQuery):
     @classmethod
     @check_connection
     @log_query
+    @invalidate_cache
     async def delete_one(cls, _filter: dict | None = None, /, **kwargs) -> bool:
         """
         Delete a single document matching the filter.
@@ -237,6 +261,7 @@ class Query(BaseQuery):
     @classmethod
     @check_connection
     @log_query
+    @invalidate_cache
     async def delete_many(cls, _filter: dict | None = None, /, **kwargs) -> int:
         """
         Delete one or more documents matching the filter.
@@ -256,6 +281,7 @@ class Query(BaseQuery):
     # # # # # Update # # # # #
     @check_connection
     @log_query
+    @invalidate_cache
     async def update(self, _update: dict | None = None, /, **kwargs) -> None:
         """
         Update the document.
@@ -277,6 +303,7 @@ class Query(BaseQuery):
     @classmethod
     @check_connection
     @log_query
+    @invalidate_cache
     async def update_one(cls, _filter: dict, _update: dict | None = None, /, **kwargs) -> bool:
         """
         Update a single document matching the filter.
@@ -296,6 +323,7 @@ class Query(BaseQuery):
     @classmethod
     @check_connection
     @log_query
+    @invalidate_cache
     async def update_many(cls, _filter: dict, _update: dict | None = None, /, **kwargs) -> int:
         """
         Update one or more documents that match the filter.
@@ -402,12 +430,15 @@ class Query(BaseQuery):
             # Insert
             >>> user = User(name='Ali')
             >>> await user.save()
+
+        The instances of `find(fields=...)` only save their fetched (or changed) fields.
         """
         document = {
             field: getattr(self, field).model_dump()
             if issubclass(type(getattr(self, field)), BaseModel)
             else getattr(self, field)
-            for field in self.model_fields.keys() if field != 'request'
+            # The fields which have not been fetched (`fields=`) are not in the `__dict__`
+            for field in self.model_fields.keys() if field != 'request' and field in self.__dict__
         }
 
         if self.id:
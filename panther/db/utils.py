@@ -1,3 +1,4 @@
+import functools
 import logging
 from time import perf_counter
 
@@ -26,6 +27,23 @@ def log_query(func):
     return log
 
 
+def invalidate_cache(func=None, /, *, with_children: bool = True):
+    """Invalidate the cached responses which are tagged with the model (or the document) after the write"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            from panther import caching
+
+            response = await func(*args, **kwargs)
+            if caching.cache_tags_used:
+                await caching.invalidate_model_cache(args[0], with_children=with_children)
+            return response
+
+        return wrapper
+
+    return decorator(func) if func else decorator
+
+
 def check_connection(func):
     async def wrapper(*args, **kwargs):
         if config.QUERY_ENGINE is None:
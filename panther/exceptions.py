@@ -12,14 +12,17 @@ class DatabaseError(Exception):
 class APIError(Exception):
     detail: str | dict | list = 'Internal Server Error'
     status_code: int = status.HTTP_500_INTERNAL_SERVER_ERROR
+    headers: dict | None = None
 
     def __init__(
             self,
             detail: str | dict | list = None,
-            status_code: int = None
+            status_code: int = None,
+            headers: dict | None = None,
     ):
         self.detail = detail or self.detail
         self.status_code = status_code or self.status_code
+        self.headers = headers or self.headers
 
 
 class BadRequestAPIError(APIError):
@@ -1,7 +1,10 @@
 import contextlib
+import functools
 import logging
+from inspect import isawaitable
 
 from pantherdb import Cursor as PantherDBCursor
+from pydantic import BaseModel
 
 from panther import status
 from panther.app import GenericAPI
@@ -9,9 +12,9 @@ from panther.configs import config
 from panther.db import Model
 from panther.db.cursor import Cursor
 from panther.exceptions import APIError
-from panther.pagination import Pagination
+from panther.pagination import KeysetPagination, Pagination
 from panther.request import Request
-from panther.response import Response
+from panther.response import Response, has_prepare_list_response, has_prepare_response
 from panther.serializer import ModelSerializer
 
 with contextlib.suppress(ImportError):
@@ -21,7 +24,33 @@ with contextlib.suppress(ImportError):
 logger = logging.getLogger('panther')
 
 
-class ObjectRequired:
+@functools.cache
+def output_fields(output_model: type[BaseModel] | None, model: type[Model]) -> tuple[str, ...] | None:
+    """
+    Fields of the `model` which are used in the `output_model`, so we don't fetch the rest of them.
+    `None` (fetch the whole document) if the `prepare_response()` may need the other fields of the instance.
+    """
+    if output_model is None or has_prepare_response(output_model) or has_prepare_list_response(output_model):
+        return None
+    return tuple(field_name for field_name in output_model.model_fields if field_name in model.model_fields) or None
+
+
+class OutputFields:
+    output_model: type[BaseModel] | None
+
+    def output_fields(self, model: type[Model]) -> tuple[str, ...] | None:
+        """
+        Projection of the `output_model`, pass it to the queries of `object()` if it only reads the output fields
+
+        Example:
+        -------
+            >>> async def object(self, request: Request, **kwargs):
+            >>>     return await Book.find_one(id=kwargs['id'], fields=self.output_fields(Book))
+        """
+        return output_fields(self.output_model, model)
+
+
+class ObjectRequired(OutputFields):
     def _check_object(self, instance):
         if instance and issubclass(type(instance), Model) is False:
             logger.critical(f'`{self.__class__.__name__}.object()` should return instance of a Model --> `find_one()`')
@@ -35,7 +64,7 @@ class ObjectRequired:
         raise APIError(status_code=status.HTTP_501_NOT_IMPLEMENTED)
 
 
-class CursorRequired:
+class CursorRequired(OutputFields):
     def _check_cursor(self, cursor):
         if isinstance(cursor, (Cursor, PantherDBCursor)) is False:
             logger.critical(f'`{self.__class__.__name__}.cursor()` should return a Cursor --> `find()`')
@@ -62,31 +91,52 @@ class ListAPI(GenericAPI, CursorRequired):
     sort_fields: list[str]
     search_fields: list[str]
     filter_fields: list[str]
-    pagination: type[Pagination]
+    pagination: type[Pagination | KeysetPagination]
 
     async def get(self, request: Request, **kwargs):
         cursor, pagination = await self.prepare_cursor(request=request, **kwargs)
         return Response(data=cursor, pagination=pagination, status_code=status.HTTP_200_OK)
 
-    async def prepare_cursor(self, request: Request, **kwargs) -> tuple[Cursor | PantherDBCursor, Pagination | None]:
+    async def prepare_cursor(
+            self,
+            request: Request,
+            **kwargs,
+    ) -> tuple[Cursor | PantherDBCursor | list, Pagination | KeysetPagination | None]:
         cursor = await self.cursor(request=request, **kwargs)
         self._check_cursor(cursor)
 
         query = {}
         query |= self.process_filters(query_params=request.query_params, cursor=cursor)
         query |= self.process_search(query_params=request.query_params)
+        # Only fetch the fields of the `output_model` (unless the `cursor()` has its own projection)
+        fields = cursor.fields or self.output_fields(cursor.cls)
 
         if query:
-            cursor = await cursor.cls.find(cursor.filter | query)
+            cursor = await cursor.cls.find(cursor.filter | query, fields=fields)
+        elif fields != cursor.fields:
+            # Keep the `sort()`, `skip()` & `limit()` of the `cursor()`
+            cursor = self.apply_fields(cursor=cursor, fields=fields)
 
         if sort := self.process_sort(query_params=request.query_params):
             cursor = cursor.sort(sort)
 
         if pagination := self.process_pagination(query_params=request.query_params, cursor=cursor):
             cursor = pagination.paginate()
+            if isawaitable(cursor):
+                # `KeysetPagination` fetches the page itself
+                cursor = await cursor
 
         return cursor, pagination
 
+    @classmethod
+    def apply_fields(cls, cursor: Cursor | PantherDBCursor, fields: tuple[str, ...]) -> Cursor | PantherDBCursor:
+        if isinstance(cursor, Cursor):
+            return cursor.only(fields)
+        # `PantherDB` has fetched the whole documents, so only the validation is limited to the `fields`
+        cursor.fields = cursor.cls._clean_fields(fields)
+        cursor.response_type = functools.partial(cursor.cls._create_model_instance, fields=cursor.fields)
+        return cursor
+
     def process_filters(self, query_params: dict, cursor: Cursor | PantherDBCursor) -> dict:
         _filter = {}
         if hasattr(self, 'filter_fields'):
@@ -120,7 +170,11 @@ class ListAPI(GenericAPI, CursorRequired):
                 if field == param.removeprefix('-')
             ]
 
-    def process_pagination(self, query_params: dict, cursor: Cursor | PantherDBCursor) -> Pagination | None:
+    def process_pagination(
+            self,
+            query_params: dict,
+            cursor: Cursor | PantherDBCursor,
+    ) -> Pagination | KeysetPagination | None:
         if hasattr(self, 'pagination'):
             return self.pagination(query_params=query_params, cursor=cursor)
 
@@ -1,3 +1,4 @@
+import asyncio
 import contextlib
 import logging
 import sys
@@ -12,14 +13,17 @@ import panther.logging
 from panther import status
 from panther._load_configs import *
 from panther._utils import traceback_message, reformat_code
+from panther.caching import listen_to_cache_invalidations
 from panther.cli.utils import print_info
 from panther.configs import config
+from panther.db.connections import redis
 from panther.events import Event
 from panther.exceptions import APIError, PantherError
+from panther.middlewares.base import compile_middlewares
 from panther.monitoring import Monitoring
 from panther.request import Request
 from panther.response import Response
-from panther.routings import find_endpoint
+from panther.routings import resolve_endpoint
 
 dictConfig(panther.logging.LOGGING)
 logger = logging.getLogger('panther')
@@ -29,6 +33,8 @@ class Panther:
     def __init__(self, name: str, configs: str | None = None, urls: dict | None = None):
         self._configs_module_name = configs
         self._urls = urls
+        # Keep a reference to it, the event loop only keeps a weak one
+        self._cache_invalidations_task: asyncio.Task | None = None
 
         config.BASE_DIR = Path(name).resolve().parent
 
@@ -57,28 +63,60 @@ class Panther:
         load_throttling(self._configs_module)
         load_user_model(self._configs_module)
         load_log_queries(self._configs_module)
+        load_strict_response(self._configs_module)
         load_templates_dir(self._configs_module)
         load_middlewares(self._configs_module)
         load_auto_reformat(self._configs_module)
         load_background_tasks(self._configs_module)
         load_default_cache_exp(self._configs_module)
+        load_memory_cache(self._configs_module)
+        load_cache_compression(self._configs_module)
+        load_route_cache_size(self._configs_module)
         load_authentication_class(self._configs_module)
         load_urls(self._configs_module, urls=self._urls)
         load_websocket_connections()
 
         check_endpoints_inheritance()
+        compile_endpoints()
+
+        self.load_middlewares_chain()
+
+    def load_middlewares_chain(self) -> None:
+        """Should be after `load_middlewares()`"""
+        self._http_middlewares_before, self._http_middlewares_after = compile_middlewares(config.HTTP_MIDDLEWARES)
+        self._ws_middlewares_before, self._ws_middlewares_after = compile_middlewares(config.WS_MIDDLEWARES)
+
+        # The first `ASGIMiddleware` is the outermost one
+        app = self.handle
+        for middleware, data in reversed(config.ASGI_MIDDLEWARES):
+            app = middleware(app, **data)
+        self._app = app
 
     async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        await self._app(scope, receive, send)
+
+    async def handle(self, scope: dict, receive: Callable, send: Callable) -> None:
         if scope['type'] == 'lifespan':
-            message = await receive()
-            if message["type"] == 'lifespan.startup':
-                if config.HAS_WS:
-                    await config.WEBSOCKET_CONNECTIONS.start()
-                await Event.run_startups()
-            elif message["type"] == 'lifespan.shutdown':
-                # It's not happening :\, so handle the shutdowns in __del__ ...
-                pass
-            return
+            while True:
+                message = await receive()
+                if message["type"] == 'lifespan.startup':
+                    if config.HAS_WS:
+                        await config.WEBSOCKET_CONNECTIONS.start()
+                    if config.LOCAL_CACHE_EXP and redis.is_connected:
+                        # Each process should listen for itself (same as `WEBSOCKET_CONNECTIONS`)
+                        self._cache_invalidations_task = asyncio.create_task(listen_to_cache_invalidations())
+                        self._cache_invalidations_task.add_done_callback(self._log_task_exception)
+                    await Event.run_startups()
+                    await send({'type': 'lifespan.startup.complete'})
+                elif message["type"] == 'lifespan.shutdown':
+                    if self._cache_invalidations_task is not None:
+                        self._cache_invalidations_task.cancel()
+                        with contextlib.suppress(asyncio.CancelledError):
+                            await self._cache_invalidations_task
+                        self._cache_invalidations_task = None
+                    # The shutdowns are handled in __del__
+                    await send({'type': 'lifespan.shutdown.complete'})
+                    return
 
         func = self.handle_http if scope['type'] == 'http' else self.handle_ws
         await func(scope=scope, receive=receive, send=send)
@@ -95,7 +133,7 @@ class Panther:
         temp_connection._monitoring = monitoring
 
         # Find Endpoint
-        endpoint, found_path = find_endpoint(path=temp_connection.path)
+        endpoint, found_path, path_variables = resolve_endpoint(path=temp_connection.path)
         if endpoint is None:
             logger.debug(f'Path `{temp_connection.path}` not found')
             return await temp_connection.close()
@@ -111,28 +149,25 @@ class Panther:
         connection._monitoring = monitoring
 
         # Collect Path Variables
-        connection.collect_path_variables(found_path=found_path)
-
-        middlewares = [middleware(**data) for middleware, data in config.WS_MIDDLEWARES]
+        connection.path_variables = path_variables
 
         # Call Middlewares .before()
-        await self._run_ws_middlewares_before_listen(connection=connection, middlewares=middlewares)
+        await self._run_ws_middlewares_before_listen(connection=connection, befores=self._ws_middlewares_before)
 
         # Listen The Connection
         await config.WEBSOCKET_CONNECTIONS.listen(connection=connection)
 
         # Call Middlewares .after()
-        middlewares.reverse()
-        await self._run_ws_middlewares_after_listen(connection=connection, middlewares=middlewares)
+        await self._run_ws_middlewares_after_listen(connection=connection, afters=self._ws_middlewares_after)
 
     @classmethod
-    async def _run_ws_middlewares_before_listen(cls, *, connection, middlewares):
+    async def _run_ws_middlewares_before_listen(cls, *, connection, befores):
         try:
-            for middleware in middlewares:
-                new_connection = await middleware.before(request=connection)
+            for before in befores:
+                new_connection = await before(request=connection)
                 if new_connection is None:
-                    logger.critical(
-                        f'Make sure to return the `request` at the end of `{middleware.__class__.__name__}.before()`')
+                    middleware = before.__self__.__class__.__name__
+                    logger.critical(f'Make sure to return the `request` at the end of `{middleware}.before()`')
                     await connection.close()
                 connection = new_connection
         except APIError as e:
@@ -140,13 +175,13 @@ class Panther:
             await connection.close()
 
     @classmethod
-    async def _run_ws_middlewares_after_listen(cls, *, connection, middlewares):
-        for middleware in middlewares:
+    async def _run_ws_middlewares_after_listen(cls, *, connection, afters):
+        for after in afters:
             with contextlib.suppress(APIError):
-                connection = await middleware.after(response=connection)
+                connection = await after(response=connection)
                 if connection is None:
-                    logger.critical(
-                        f'Make sure to return the `response` at the end of `{middleware.__class__.__name__}.after()`')
+                    middleware = after.__self__.__class__.__name__
+                    logger.critical(f'Make sure to return the `response` at the end of `{middleware}.after()`')
                     break
 
     async def handle_http(self, scope: dict, receive: Callable, send: Callable) -> None:
@@ -161,26 +196,25 @@ class Panther:
         await request.read_body()
 
         # Find Endpoint
-        endpoint, found_path = find_endpoint(path=request.path)
+        endpoint, found_path, path_variables = resolve_endpoint(path=request.path)
         if endpoint is None:
             return await self._raise(send, monitoring=monitoring, status_code=status.HTTP_404_NOT_FOUND)
 
         # Collect Path Variables
-        request.collect_path_variables(found_path=found_path)
+        request.path_variables = path_variables
 
-        middlewares = [middleware(**data) for middleware, data in config.HTTP_MIDDLEWARES]
         try:  # They Both(middleware.before() & _endpoint()) Have The Same Exception (APIError)
             # Call Middlewares .before()
-            for middleware in middlewares:
-                request = await middleware.before(request=request)
+            for before in self._http_middlewares_before:
+                request = await before(request=request)
                 if request is None:
-                    logger.critical(
-                        f'Make sure to return the `request` at the end of `{middleware.__class__.__name__}.before()`')
+                    middleware = before.__self__.__class__.__name__
+                    logger.critical(f'Make sure to return the `request` at the end of `{middleware}.before()`')
                     return await self._raise(send, monitoring=monitoring)
 
             # Prepare the method
             if not isinstance(endpoint, types.FunctionType):
-                endpoint = endpoint().call_method
+                endpoint = endpoint.call_method
 
             # Call Endpoint
             response = await endpoint(request=request)
@@ -195,27 +229,37 @@ class Panther:
             return await self._raise(send, monitoring=monitoring)
 
         # Call Middlewares .after()
-        middlewares.reverse()
-        for middleware in middlewares:
+        for after in self._http_middlewares_after:
             try:
-                response = await middleware.after(response=response)
+                response = await after(response=response)
                 if response is None:
-                    logger.critical(
-                        f'Make sure to return the `response` at the end of `{middleware.__class__.__name__}.after()`')
+                    middleware = after.__self__.__class__.__name__
+                    logger.critical(f'Make sure to return the `response` at the end of `{middleware}.after()`')
                     return await self._raise(send, monitoring=monitoring)
             except APIError as e:  # noqa: PERF203
                 response = self._handle_exceptions(e)
 
-        await response.send(send, receive, monitoring=monitoring)
+        try:
+            await response.send(send, receive, monitoring=monitoring)
+        except json.JSONEncodeError as e:
+            # The nested values of the `data` are validated while serializing (if `STRICT_RESPONSE` is `False`)
+            logger.error(traceback_message(exception=e))
+            return await self._raise(send, monitoring=monitoring)
 
     def __del__(self):
         Event.run_shutdowns()
 
+    @classmethod
+    def _log_task_exception(cls, task: asyncio.Task) -> None:
+        if not task.cancelled() and (exception := task.exception()):
+            logger.error(traceback_message(exception=exception))
+
     @classmethod
     def _handle_exceptions(cls, e: APIError, /) -> Response:
         return Response(
             data=e.detail if isinstance(e.detail, dict) else {'detail': e.detail},
             status_code=e.status_code,
+            headers=e.headers,
         )
 
     @classmethod
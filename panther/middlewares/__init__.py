@@ -1 +1 @@
-from panther.middlewares.base import BaseMiddleware  # noqa: F401
+from panther.middlewares.base import ASGIMiddleware, BaseMiddleware  # noqa: F401
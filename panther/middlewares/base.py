@@ -1,3 +1,5 @@
+from collections.abc import Callable
+
 from panther.request import Request
 from panther.response import Response
 from panther.websocket import GenericWebsocket
@@ -28,3 +30,37 @@ class WebsocketMiddleware(BaseMiddleware):
 
     async def after(self, response: GenericWebsocket):
         return response
+
+
+class ASGIMiddleware:
+    """
+    Wraps the whole app (used in http, ws & lifespan),
+        so it works on the raw `scope`, `receive` & `send` and doesn't need any `Request` or `Response`.
+    """
+    def __init__(self, app: Callable, **kwargs):
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        await self.app(scope, receive, send)
+
+
+_DEFAULT_METHODS = {
+    'before': (BaseMiddleware.before, HTTPMiddleware.before, WebsocketMiddleware.before),
+    'after': (BaseMiddleware.after, HTTPMiddleware.after, WebsocketMiddleware.after),
+}
+
+
+def compile_middlewares(middlewares: list[BaseMiddleware]) -> tuple[tuple[Callable, ...], tuple[Callable, ...]]:
+    """
+    Return the `before()`s (in order) and the `after()`s (in reverse order) of the middlewares,
+        the ones which have not been overridden are skipped.
+    """
+    before_chain = tuple(
+        middleware.before for middleware in middlewares
+        if type(middleware).before not in _DEFAULT_METHODS['before']
+    )
+    after_chain = tuple(
+        middleware.after for middleware in reversed(middlewares)
+        if type(middleware).after not in _DEFAULT_METHODS['after']
+    )
+    return before_chain, after_chain
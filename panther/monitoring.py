@@ -11,7 +11,7 @@ logger = logging.getLogger('monitoring')
 class Monitoring:
     """
     Create Log Message Like Below:
-    date_time | method | path | ip:port | response_time(seconds) | status
+    date_time | method | path | ip:port | response_time(seconds) | status | cache
     """
     def __init__(self, is_ws: bool = False):
         self.is_ws = is_ws
@@ -25,10 +25,13 @@ class Monitoring:
             else:
                 method = request.scope['method']
 
+            self.request = request
             self.log = f'{method} | {request.path} | {ip}:{port}'
             self.start_time = perf_counter()
 
     async def after(self, status: int | Literal['Accepted', 'Rejected', 'Closed'], /):
         if config.MONITORING:
             response_time = perf_counter() - self.start_time  # Seconds
-            logger.info(f'{self.log} | {response_time} | {status}')
+            # `HIT`, `STALE`, `MISS` or `-` (not cached)
+            cache_status = getattr(self.request, 'cache_status', None) or '-'
+            logger.info(f'{self.log} | {response_time} | {status} | {cache_status}')
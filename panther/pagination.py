@@ -1,4 +1,12 @@
+import base64
+import binascii
+import functools
+
+import orjson as json
+from pydantic import TypeAdapter, ValidationError
+
 from panther.db.cursor import Cursor
+from panther.exceptions import BadRequestAPIError
 from pantherdb import Cursor as PantherDBCursor
 
 
@@ -49,3 +57,121 @@ class Pagination:
             'previous': self.build_previous_params() if self.skip else None,
             'results': response
         }
+
+
+@functools.cache
+def field_adapter(model, field_name: str) -> TypeAdapter:
+    """Used to convert the values of the `next` token back to the type of the field (e.g. `str` -> `ObjectId`)"""
+    return TypeAdapter(model.model_fields[field_name].annotation)
+
+
+class KeysetPagination:
+    """
+    Paginate with a range query on the `ORDERING` field (& `id` as the tie-breaker) instead of `skip()`,
+        so the cost of a page doesn't grow with the number of the previous pages.
+    * The `sort_fields` of the `ListAPI` are not applied, the results are always sorted by the `ORDERING`
+
+    Request URL:
+        example.com/users?limit=10
+        example.com/users?limit=10&after=WyI2NWUz...
+    Response Data:
+        {
+            'next': '?limit=10&after=WyI2NWUz...',
+            results: [...]
+        }
+    """
+    DEFAULT_LIMIT = 20
+    # The greater `limit`s are capped to it
+    MAX_LIMIT = 100
+    # Field name of the model, prefix it with `-` for descending order, e.g. '-date_created'
+    ORDERING = 'id'
+    # Counting the documents is as slow as the `skip()`, so it is not included unless you want it
+    COUNT = False
+
+    def __init__(self, query_params: dict, cursor: Cursor | PantherDBCursor):
+        self.limit = self.get_limit(query_params=query_params)
+        self.after = query_params.get('after')
+        self.cursor = cursor
+        self.field = self.ORDERING.removeprefix('-')
+        self.order = -1 if self.ORDERING.startswith('-') else 1
+        self.next_token = None
+
+    def get_limit(self, query_params: dict) -> int:
+        try:
+            limit = int(query_params.get('limit', self.DEFAULT_LIMIT))
+        except (TypeError, ValueError):
+            limit = 0
+        if limit < 1:
+            raise BadRequestAPIError(detail='`limit` should be a positive integer')
+        return min(limit, self.MAX_LIMIT)
+
+    def encode_token(self, instance) -> str:
+        # `default=str` is for the `ObjectId`
+        token = json.dumps([getattr(instance, self.field), instance.id], default=str)
+        return base64.urlsafe_b64encode(token).decode().rstrip('=')
+
+    def decode_token(self, token: str) -> tuple:
+        try:
+            value, _id = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+            return (
+                field_adapter(self.cursor.cls, self.field).validate_python(value),
+                field_adapter(self.cursor.cls, 'id').validate_python(_id),
+            )
+        except (binascii.Error, json.JSONDecodeError, ValidationError, TypeError, ValueError):
+            raise BadRequestAPIError(detail='Invalid `after`') from None
+
+    def build_next_params(self):
+        return f'?limit={self.limit}&after={self.next_token}'
+
+    def range_query(self, value, _id) -> dict:
+        """Documents after the (`value`, `_id`) in the `ORDERING` (MongoDB)"""
+        operator = '$gt' if self.order == 1 else '$lt'
+        if self.field == 'id':
+            return {'_id': {operator: _id}}
+        key = self.cursor.cls._document_key(self.field)
+        return {'$or': [{key: {operator: value}}, {key: value, '_id': {operator: _id}}]}
+
+    def is_after(self, document: dict, value, _id) -> bool:
+        """Same as the `range_query()` for the documents of `PantherDB` (it doesn't support the range queries)"""
+        cls = self.cursor.cls
+        key = (
+            field_adapter(cls, self.field).validate_python(document[cls._document_key(self.field)]),
+            field_adapter(cls, 'id').validate_python(document['_id']),
+        )
+        return key > (value, _id) if self.order == 1 else key < (value, _id)
+
+    async def paginate(self) -> list:
+        """Fetch one more document than the `limit`, so we know if there is a next page without counting"""
+        cls = self.cursor.cls
+        _filter = self.cursor.filter
+        # The `ORDERING` field is required for the `next` token
+        fields = self.cursor.fields and (*self.cursor.fields, self.field)
+        after = self.after and self.decode_token(self.after)
+        key = cls._document_key(self.field)
+        sort = [(key, self.order)] if self.field == 'id' else [(key, self.order), ('_id', self.order)]
+
+        if isinstance(self.cursor, PantherDBCursor):
+            cursor = await cls.find(_filter, fields=fields)
+            if after:
+                cursor.documents = [d for d in cursor.documents if self.is_after(d, *after)]
+            instances = list(cursor.sort(sort).limit(self.limit + 1))
+        else:
+            if after:
+                # Wrapped in `$and`, so it doesn't conflict with the `$or` of the `search_fields`
+                _filter = {'$and': [_filter, self.range_query(*after)]}
+            cursor = await cls.find(_filter, fields=fields)
+            instances = await cursor.sort(sort).limit(self.limit + 1).to_list(None)
+
+        if instances and len(instances) > self.limit:
+            instances = instances[:self.limit]
+            self.next_token = self.encode_token(instances[-1])
+        return instances
+
+    async def template(self, response: list):
+        data = {
+            'next': self.build_next_params() if self.next_token else None,
+            'results': response,
+        }
+        if self.COUNT:
+            return {'count': await self.cursor.cls.count(self.cursor.filter)} | data
+        return data
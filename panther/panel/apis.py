@@ -2,6 +2,7 @@ import contextlib
 
 from panther import status
 from panther.app import API
+from panther.caching import get_cache_stats
 from panther.configs import config
 from panther.db.connections import db
 from panther.db.connections import redis
@@ -81,3 +82,9 @@ async def healthcheck_api():
         checks.append(await redis.ping())
 
     return Response(all(checks))
+
+
+@API()
+async def cache_stats_api():
+    """The cache counters of this process (each worker has its own)"""
+    return get_cache_stats()
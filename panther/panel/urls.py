@@ -1,8 +1,9 @@
-from panther.panel.apis import documents_api, models_api, single_document_api, healthcheck_api
+from panther.panel.apis import documents_api, models_api, single_document_api, healthcheck_api, cache_stats_api
 
 urls = {
     '': models_api,
     '<index>/': documents_api,
     '<index>/<document_id>/': single_document_api,
     'health': healthcheck_api,
+    'cache-stats': cache_stats_api,
 }
@@ -13,6 +13,8 @@ class Request(BaseRequest):
     def __init__(self, scope: dict, receive: Callable, send: Callable):
         self._data = ...
         self.validated_data = None  # It's been set in API.validate_input()
+        self.cache_status = None  # It's been set in API() --> 'HIT', 'STALE' or 'MISS'
+        self.throttling_status = None  # It's been set in API.handle_throttling()
         super().__init__(scope=scope, receive=receive, send=send)
 
     @property
@@ -1,4 +1,5 @@
 import asyncio
+import functools
 from sys import version_info
 from types import NoneType
 from typing import Generator, AsyncGenerator, Any, Type
@@ -12,7 +13,7 @@ else:
 
 
 import orjson as json
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 from panther import status
 from panther.configs import config
@@ -20,13 +21,86 @@ from panther._utils import to_async_generator
 from panther.db.cursor import Cursor
 from pantherdb import Cursor as PantherDBCursor
 from panther.monitoring import Monitoring
-from panther.pagination import Pagination
+from panther.pagination import KeysetPagination, Pagination
 
 ResponseDataTypes = list | tuple | set | Cursor | PantherDBCursor | dict | int | float | str | bool | bytes | NoneType | Type[BaseModel]
-IterableDataTypes = list | tuple | set | Cursor | PantherDBCursor
+IterableDataTypes = list | tuple | set | PantherDBCursor
 StreamingDataTypes = Generator | AsyncGenerator
 
 
+@functools.cache
+def output_model_adapter(output_model: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[output_model])
+
+
+@functools.cache
+def output_model_aliases(output_model: type[BaseModel]) -> tuple[tuple[str, str], ...]:
+    """Fields of the `output_model` which have `validation_alias` (id -> _id)"""
+    return tuple(
+        (field_name, field.validation_alias)
+        for field_name, field in output_model.model_fields.items()
+        if field.validation_alias
+    )
+
+
+@functools.cache
+def has_prepare_response(output_model: type[BaseModel]) -> bool:
+    """`ModelSerializer.prepare_response()` does nothing, so we only call it if it has been overridden"""
+    return _is_overridden(output_model, method_name='prepare_response')
+
+
+@functools.cache
+def has_prepare_list_response(output_model: type[BaseModel]) -> bool:
+    return _is_overridden(output_model, method_name='prepare_list_response')
+
+
+def _is_overridden(output_model: type[BaseModel], method_name: str) -> bool:
+    from panther.serializer import MetaModelSerializer
+
+    if (method := getattr(output_model, method_name, None)) is None:
+        return False
+    default = getattr(MetaModelSerializer.model_serializer, method_name)
+    return getattr(method, '__func__', method) is not getattr(default, '__func__', default)
+
+
+def has_cursor(data: Any) -> bool:
+    """Is there a (MongoDB) `Cursor` in the nested values of the `data`"""
+    if isinstance(data, Cursor):
+        return True
+    if isinstance(data, dict):
+        return any(has_cursor(value) for value in data.values())
+    if isinstance(data, list | tuple):
+        return any(has_cursor(value) for value in data)
+    return False
+
+
+async def fetch_nested_cursors(data: Any) -> Any:
+    """Replace the nested (MongoDB) `Cursor`s of the `data` with their documents"""
+    if isinstance(data, Cursor):
+        return await data.to_list(None)
+    if isinstance(data, dict):
+        return {key: await fetch_nested_cursors(value) for key, value in data.items()}
+    if isinstance(data, list | tuple):
+        return [await fetch_nested_cursors(value) for value in data]
+    return data
+
+
+def json_default(obj: Any):
+    """Used by `orjson` for the values it can't serialize by itself"""
+    if issubclass(type(obj), BaseModel):
+        return obj.model_dump()
+
+    elif isinstance(obj, Cursor):
+        msg = 'The nested `Cursor` should be fetched first --> `await cursor.to_list(None)`'
+        raise TypeError(msg)
+
+    elif isinstance(obj, IterableDataTypes):
+        return list(obj)
+
+    msg = f'Invalid Response Type: {type(obj)}'
+    raise TypeError(msg)
+
+
 class Response:
     content_type = 'application/json'
 
@@ -35,31 +109,50 @@ class Response:
         data: ResponseDataTypes = None,
         headers: dict | None = None,
         status_code: int = status.HTTP_200_OK,
-        pagination: Pagination | None = None,
+        pagination: Pagination | KeysetPagination | None = None,
     ):
         """
         :param data: should be an instance of ResponseDataTypes
         :param headers: should be dict of headers
         :param status_code: should be int
-        :param pagination: instance of Pagination or None
+        :param pagination: instance of Pagination, KeysetPagination or None
             The `pagination.template()` method will be used
         """
+        self._body: bytes | None = None
+        self._bytes_headers: list[list[bytes]] | None = None
         self.headers = headers or {}
-        self.pagination: Pagination | None = pagination
-        if isinstance(data, Cursor):
-            data = list(data)
+        self.pagination: Pagination | KeysetPagination | None = pagination
         self.initial_data = data
         self.data = self.prepare_data(data=data)
         self.status_code = self.check_status_code(status_code=status_code)
 
+    @property
+    def data(self):
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        """
+        The `body` is serialized only once and reused until the `data` is set again,
+            so don't change the `data` in-place after reading the `body`, set a new one instead.
+        """
+        self._data = data
+        self._body = None
+        self._bytes_headers = None
+
     @property
     def body(self) -> bytes:
+        if self._body is None:
+            self._body = self.render_body()
+        return self._body
+
+    def render_body(self) -> bytes:
         if isinstance(self.data, bytes):
             return self.data
 
         if self.data is None:
             return b''
-        return json.dumps(self.data)
+        return json.dumps(self.data, default=json_default)
 
     @property
     def headers(self) -> dict:
@@ -69,27 +162,63 @@ class Response:
             'Access-Control-Allow-Origin': '*',
         } | self._headers
 
+    def add_headers(self, headers: dict) -> None:
+        """
+        Add extra `headers` (e.g. the rate-limit headers) to the user-defined ones,
+            the computed ones (e.g. `Content-Length`) are still derived from the `body`.
+        """
+        self.headers = self._headers | headers
+
     @property
     def bytes_headers(self) -> list[list[bytes]]:
-        return [[k.encode(), str(v).encode()] for k, v in (self.headers or {}).items()]
+        if self._bytes_headers is None:
+            self._bytes_headers = [[k.encode(), str(v).encode()] for k, v in (self.headers or {}).items()]
+        return self._bytes_headers
 
     @headers.setter
     def headers(self, headers: dict):
         self._headers = headers
+        self._bytes_headers = None
 
     def prepare_data(self, data: Any):
-        """Make sure the response data is only ResponseDataTypes or Iterable of ResponseDataTypes"""
-        if isinstance(data, (int | float | str | bool | bytes | NoneType)):
+        """
+        Make sure the response data is only ResponseDataTypes or Iterable of ResponseDataTypes
+            Nested values are left for `orjson` (& `json_default()`) unless `STRICT_RESPONSE` is `True`
+        """
+        if isinstance(data, Cursor):
+            # It is fetched asynchronously in `fetch_cursor()`
+            return data
+
+        if config.STRICT_RESPONSE:
+            return self.clean_data(data=data)
+
+        if isinstance(data, (int | float | str | bool | bytes | NoneType | dict | list)):
+            return data
+
+        elif issubclass(type(data), BaseModel):
+            return data.model_dump()
+
+        elif isinstance(data, IterableDataTypes):
+            return list(data)
+
+        else:
+            msg = f'Invalid Response Type: {type(data)}'
+            raise TypeError(msg)
+
+    def clean_data(self, data: Any):
+        """Walk through the whole data and convert the nested values to the ResponseDataTypes"""
+        if isinstance(data, (int | float | str | bool | bytes | NoneType | Cursor)):
+            # The nested `Cursor`s are fetched asynchronously in `fetch_cursor()`
             return data
 
         elif isinstance(data, dict):
-            return {key: self.prepare_data(value) for key, value in data.items()}
+            return {key: self.clean_data(value) for key, value in data.items()}
 
         elif issubclass(type(data), BaseModel):
             return data.model_dump()
 
         elif isinstance(data, IterableDataTypes):
-            return [self.prepare_data(d) for d in data]
+            return [self.clean_data(d) for d in data]
 
         else:
             msg = f'Invalid Response Type: {type(data)}'
@@ -102,35 +231,57 @@ class Response:
             raise TypeError(error)
         return status_code
 
+    async def fetch_cursor(self) -> None:
+        """
+        Fetch the documents of the (MongoDB) `Cursor` without blocking, it is called in `API.__call__`
+            The nested `Cursor`s are only looked for in a `dict`, e.g. `{'books': await Book.find()}`
+        """
+        if isinstance(self.data, Cursor):
+            self.initial_data = await self.data.to_list(None)
+            self.data = self.prepare_data(data=self.initial_data)
+
+        elif isinstance(self.initial_data, dict) and has_cursor(self.initial_data):
+            self.initial_data = await fetch_nested_cursors(self.initial_data)
+            self.data = self.prepare_data(data=self.initial_data)
+
     async def apply_output_model(self, output_model: Type[BaseModel]):
         """This method is called in API.__call__"""
+        # `output_model` needs the nested values as plain dicts
+        self.data = self.clean_data(data=self.data)
+        aliases = output_model_aliases(output_model)
 
         # Dict
         if isinstance(self.data, dict):
             # Apply `validation_alias` (id -> _id)
-            for field_name, field in output_model.model_fields.items():
-                if field.validation_alias and field_name in self.data:
-                    self.data[field.validation_alias] = self.data.pop(field_name)
+            for field_name, alias in aliases:
+                if field_name in self.data:
+                    self.data[alias] = self.data.pop(field_name)
             output = output_model(**self.data)
-            if hasattr(output_model, 'prepare_response'):
+            if has_prepare_response(output_model):
                 return await output.prepare_response(instance=self.initial_data, data=output.model_dump())
             return output.model_dump()
 
         # Iterable
-        results = []
         if isinstance(self.data, IterableDataTypes):
-            for i, d in enumerate(self.data):
-                # Apply `validation_alias` (id -> _id)
-                for field_name, field in output_model.model_fields.items():
-                    if field.validation_alias and field_name in d:
-                        d[field.validation_alias] = d.pop(field_name)
-
-                output = output_model(**d)
-                if hasattr(output_model, 'prepare_response'):
-                    result = await output.prepare_response(instance=self.initial_data[i], data=output.model_dump())
-                else:
-                    result = output.model_dump()
-                results.append(result)
+            if aliases:
+                for d in self.data:
+                    # Apply `validation_alias` (id -> _id)
+                    for field_name, alias in aliases:
+                        if field_name in d:
+                            d[alias] = d.pop(field_name)
+
+            # Validate & dump the whole list at once
+            adapter = output_model_adapter(output_model)
+            outputs = adapter.validate_python(self.data)
+            results = adapter.dump_python(outputs)
+
+            if has_prepare_list_response(output_model):
+                return await output_model.prepare_list_response(instances=self.initial_data, data=results)
+            if has_prepare_response(output_model):
+                return [
+                    await output.prepare_response(instance=self.initial_data[i], data=result)
+                    for i, (output, result) in enumerate(zip(outputs, results))
+                ]
             return results
 
         # Str | Bool | Bytes
@@ -156,6 +307,39 @@ class Response:
     __repr__ = __str__
 
 
+class PreparedResponse(Response):
+    """
+    Its `body` & `bytes_headers` have already been rendered (e.g. a cached response),
+        so they are sent as they are, without being prepared or serialized again.
+    """
+
+    def __init__(self, body: bytes, bytes_headers: list[list[bytes]], status_code: int = status.HTTP_200_OK):
+        self.pagination = None
+        self.initial_data = body
+        self._data = body
+        self._body = body
+        self._headers = None
+        self._raw_headers = bytes_headers
+        self._bytes_headers = bytes_headers
+        self.status_code = status_code
+
+    @property
+    def headers(self) -> dict:
+        # They are only decoded if someone (e.g. a middleware) needs them
+        if self._headers is None:
+            self._headers = {k.decode(): v.decode() for k, v in self._raw_headers}
+        return self._headers | {'Content-Length': len(self.body)}
+
+    def add_headers(self, headers: dict) -> None:
+        # `Content-Length` is always derived from the `body` in `headers`
+        self.headers = self.headers | headers
+
+    @headers.setter
+    def headers(self, headers: dict):
+        self._headers = headers
+        self._bytes_headers = None
+
+
 class StreamingResponse(Response):
     content_type = 'application/octet-stream'
 
@@ -186,6 +370,7 @@ class StreamingResponse(Response):
     @headers.setter
     def headers(self, headers: dict):
         self._headers = headers
+        self._bytes_headers = None
 
     @property
     async def body(self) -> AsyncGenerator:
@@ -195,7 +380,7 @@ class StreamingResponse(Response):
             elif chunk is None:
                 yield b''
             else:
-                yield json.dumps(chunk)
+                yield json.dumps(chunk, default=json_default)
 
     async def send_body(self, send, receive, /):
         asyncio.create_task(self.listen_to_disconnection(receive))
@@ -210,8 +395,7 @@ class StreamingResponse(Response):
 class HTMLResponse(Response):
     content_type = 'text/html; charset=utf-8'
 
-    @property
-    def body(self) -> bytes:
+    def render_body(self) -> bytes:
         if isinstance(self.data, bytes):
             return self.data
         return self.data.encode()
@@ -220,8 +404,7 @@ class HTMLResponse(Response):
 class PlainTextResponse(Response):
     content_type = 'text/plain; charset=utf-8'
 
-    @property
-    def body(self) -> bytes:
+    def render_body(self) -> bytes:
         if isinstance(self.data, bytes):
             return self.data
         return self.data.encode()
@@ -1,5 +1,5 @@
 import re
-from collections import Counter
+from collections import Counter, OrderedDict
 from collections.abc import Callable, Mapping, MutableMapping
 from copy import deepcopy
 from functools import partial, reduce
@@ -123,67 +123,171 @@ def _is_recursive_merge(a, b):
 
 
 ENDPOINT_NOT_FOUND = (None, '')
+_TERMINAL_NOT_FOUND = (None, '', ())
+
+
+class _RouteNode:
+    """
+    A single level of the compiled urls
+        children --> static keys that point to a dict (used while walking the middle of the path)
+        endpoints --> static keys that point to an endpoint (the middle of the path can't pass them)
+        variable_child --> the first path variable that points to a dict
+        terminals --> result of each static key, if the path ends on this level
+        variable_terminal --> result of the path variables, if the path ends on this level
+    """
+    __slots__ = ('children', 'endpoints', 'variable_child', 'terminals', 'variable_terminal')
+
+    def __init__(self):
+        self.children: dict[str, _RouteNode] = {}
+        self.endpoints: frozenset[str] = frozenset()
+        self.variable_child: _RouteNode | None = None
+        self.terminals: dict[str, tuple] = {}
+        self.variable_terminal: tuple = _TERMINAL_NOT_FOUND
+
+
+class RouteCache:
+    """
+    Bounded LRU cache of the resolved paths
+        key --> raw path (e.g. '/user/317/')
+        value --> (endpoint, found_path, path_variables)
+    """
+    __slots__ = ('max_size', 'hits', 'misses', '_routes')
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._routes: OrderedDict[str, tuple[Callable | None, str, dict]] = OrderedDict()
+
+    def __len__(self):
+        return len(self._routes)
+
+    def get(self, path: str) -> tuple[Callable | None, str, dict] | None:
+        try:
+            route = self._routes[path]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._routes.move_to_end(path)
+        self.hits += 1
+        return route
+
+    def set(self, path: str, route: tuple[Callable | None, str, dict]) -> None:
+        self._routes[path] = route
+        if len(self._routes) > self.max_size:
+            # Evict the least recently used path
+            self._routes.popitem(last=False)
+
+
+class Router:
+    """
+    Compiled version of the nested urls (`config.URLS`),
+        It is built once in `load_urls()` and never changes after that,
+        so each lookup only walks the path once and returns the path variables too.
+    """
+    __slots__ = ('root', 'static_routes', 'cache')
+
+    def __init__(self, urls: dict, cache_size: int | None = None):
+        self.static_routes: dict[str, tuple[Callable, str]] = {}
+        self.root = self._compile(urls, path=(), variables=())
+        self.cache: RouteCache | None = RouteCache(max_size=cache_size) if cache_size else None
+
+    def _compile(self, urls: dict, path: tuple, variables: tuple) -> _RouteNode:
+        node = _RouteNode()
+        endpoints = set()
+        variable_scanning = True
+
+        for key, value in urls.items():
+            key_path = (*path, key)
 
+            if key.startswith('<'):
+                key_variables = (*variables, key.strip('< >'))
+                if isinstance(value, dict):
+                    child = self._compile(value, path=key_path, variables=key_variables)
+                    if node.variable_child is None:
+                        node.variable_child = child
+                    if variable_scanning and (endpoint := value.get('')):
+                        node.variable_terminal = self._terminal(endpoint, path=key_path, variables=key_variables)
+                        variable_scanning = False
+
+                elif callable(value) and variable_scanning:
+                    node.variable_terminal = (value, '/'.join(key_path), key_variables)
+                    variable_scanning = False
+
+            elif isinstance(value, dict):
+                node.children[key] = self._compile(value, path=key_path, variables=variables)
+                if endpoint := value.get(''):
+                    node.terminals[key] = self._terminal(endpoint, path=key_path, variables=variables)
+
+            elif callable(value):
+                endpoints.add(key)
+                node.terminals[key] = (value, '/'.join(key_path), variables)
+
+            if (
+                    (terminal := node.terminals.get(key))
+                    and terminal[0] is not None
+                    and not terminal[2]
+                    and (key or not path)
+            ):
+                self.static_routes[terminal[1]] = terminal[:2]
+
+        node.endpoints = frozenset(endpoints)
+        return node
+
+    @classmethod
+    def _terminal(cls, endpoint, path: tuple, variables: tuple) -> tuple:
+        if callable(endpoint):
+            return endpoint, '/'.join(path), variables
+        return _TERMINAL_NOT_FOUND
+
+    def find(self, path: str) -> tuple[Callable | None, str, dict]:
+        if self.cache is None:
+            return self._find(path)
+
+        if (route := self.cache.get(path)) is None:
+            route = self._find(path)
+            self.cache.set(path, route)
+
+        endpoint, found_path, path_variables = route
+        # Each request should have its own `path_variables`
+        return endpoint, found_path, path_variables.copy()
+
+    def _find(self, path: str) -> tuple[Callable | None, str, dict]:
+        # 'user/list/?name=ali' --> 'user/list/' --> 'user/list'
+        path = path.split('?', 1)[0].strip('/')
+
+        if static := self.static_routes.get(path):
+            return *static, {}
+
+        *middle_parts, last_part = path.split('/')
+        node = self.root
+        values = []
+        for part in middle_parts:
+            if child := node.children.get(part):
+                node = child
+            elif part in node.endpoints or node.variable_child is None:
+                return *ENDPOINT_NOT_FOUND, {}
+            else:
+                values.append(part)
+                node = node.variable_child
 
-def find_endpoint(path: str) -> tuple[Callable | None, str]:
-    urls = config.URLS
-
-    # 'user/list/?name=ali' --> 'user/list/' --> 'user/list' --> ['user', 'list']
-    parts = path.split('?')[0].strip('/').split('/')
-    paths_len = len(parts)
-
-    found_path = []
-    for i, part in enumerate(parts):
-        last_path = bool((i + 1) == paths_len)
-        found = urls.get(part)
-
-        if last_path:
-            # `found` is callable
-            if callable(found):
-                found_path.append(part)
-                return found, '/'.join(found_path)
-
-            # `found` is dict
-            if isinstance(found, dict) and (endpoint := found.get('')):
-                if callable(endpoint):
-                    found_path.append(part)
-                    return endpoint, '/'.join(found_path)
-                else:
-                    return ENDPOINT_NOT_FOUND
-
-            # `found` is None
-            for key, value in urls.items():
-                if key.startswith('<'):
-                    if callable(value):
-                        found_path.append(key)
-                        return value, '/'.join(found_path)
-
-                    elif isinstance(value, dict) and (endpoint := value.get('')):
-                        if callable(endpoint):
-                            found_path.append(key)
-                            return endpoint, '/'.join(found_path)
-                        else:
-                            return ENDPOINT_NOT_FOUND
-
-            return ENDPOINT_NOT_FOUND
-
-        # `found` is dict
-        elif isinstance(found, dict):
-            found_path.append(part)
-            urls = found
-            continue
-
-        # `found` is callable
-        elif callable(found):
-            return ENDPOINT_NOT_FOUND
+        if (terminal := node.terminals.get(last_part)) is None:
+            terminal = node.variable_terminal
+            values.append(last_part)
 
-        else:
-            # `found` is None
-            for key, value in urls.items():
-                if key.startswith('<'):
-                    if isinstance(value, dict):
-                        found_path.append(key)
-                        urls = value
-                        break
-            else:
-                return ENDPOINT_NOT_FOUND
+        endpoint, found_path, variables = terminal
+        if endpoint is None:
+            return *ENDPOINT_NOT_FOUND, {}
+        return endpoint, found_path, dict(zip(variables, values))
+
+
+def resolve_endpoint(path: str) -> tuple[Callable | None, str, dict]:
+    """Return the endpoint, its url and the path variables"""
+    if config.ROUTER is None:
+        config.ROUTER = Router(config.URLS, cache_size=config.ROUTE_CACHE_SIZE)
+    return config.ROUTER.find(path)
+
+
+def find_endpoint(path: str) -> tuple[Callable | None, str]:
+    endpoint, found_path, _ = resolve_endpoint(path)
+    return endpoint, found_path
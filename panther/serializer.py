@@ -229,3 +229,11 @@ class ModelSerializer(metaclass=MetaModelSerializer):
 
     async def prepare_response(self, instance: Any, data: dict) -> dict:
         return data
+
+    @classmethod
+    async def prepare_list_response(cls, instances: list, data: list[dict]) -> list:
+        """
+        Called once with the whole list (instead of calling `prepare_response()` for each item)
+            if you override it.
+        """
+        return data
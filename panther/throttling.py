@@ -1,11 +1,258 @@
+import contextlib
+import hashlib
+import heapq
+import math
+import mmap
+import os
+import struct
+import time
 from collections import defaultdict
 from dataclasses import dataclass
 from datetime import timedelta
+from pathlib import Path
+from typing import Literal, NamedTuple
 
-throttling_storage = defaultdict(int)
+with contextlib.suppress(ImportError):
+    # It is not available on Windows
+    import fcntl
+
+
+class ThrottlingStorage:
+    """
+    In-memory counters of the throttling, used when `redis` is not connected.
+        - Each key is dropped after its `expires_at` (timestamp), the expired ones are swept at most once a second
+        - If there are more than `max_keys` keys, the oldest ones are dropped (their clients are counted from 0 again)
+    """
+    def __init__(self, max_keys: int | None = None):
+        self.max_keys = max_keys
+        self.evictions = 0
+        self._entries: dict[str, tuple[int | float, float]] = {}  # key -> (value, expires_at)
+        # The keys of each second which they expire in, and a heap of those seconds
+        self._expirations: dict[int, list[str]] = defaultdict(list)
+        self._seconds: list[int] = []
+        self._next_sweep = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, default: int | float = 0) -> int | float:
+        entry = self._entries.get(key)
+        if entry is None or entry[1] <= time.time():
+            return default
+        return entry[0]
+
+    def set(self, key: str, value: int | float, *, expires_at: float) -> None:
+        now = time.time()
+        if now >= self._next_sweep:
+            self.sweep(now)
+
+        previous = self._entries.get(key)
+        self._entries[key] = (value, expires_at)
+
+        second = int(expires_at)
+        if previous is None or int(previous[1]) != second:
+            if second not in self._expirations:
+                heapq.heappush(self._seconds, second)
+            self._expirations[second].append(key)
+
+        if previous is None and self.max_keys is not None and len(self._entries) > self.max_keys:
+            del self._entries[next(iter(self._entries))]
+            self.evictions += 1
+
+    def incr(self, key: str, amount: int = 1, *, expires_at: float) -> int:
+        value = self.get(key) + amount
+        self.set(key, value, expires_at=expires_at)
+        return value
+
+    def sweep(self, now: float | None = None) -> None:
+        """Drop the keys which have been expired"""
+        if now is None:
+            now = time.time()
+        # The whole second should have been passed
+        while self._seconds and self._seconds[0] + 1 <= now:
+            for key in self._expirations.pop(heapq.heappop(self._seconds)):
+                # It may have been set again with another `expires_at`
+                if (entry := self._entries.get(key)) is not None and entry[1] <= now:
+                    del self._entries[key]
+        self._next_sweep = now + 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._expirations.clear()
+        self._seconds.clear()
+        self.evictions = 0
+
+    def lock(self) -> contextlib.AbstractContextManager:
+        """Nothing else (e.g. another worker) changes it, so the operations are already atomic"""
+        return contextlib.nullcontext()
+
+
+class SharedThrottlingStorage:
+    """
+    Throttling counters which are shared between the workers (processes) of one machine, without `redis`.
+        - It is an open-addressing hash table in a memory-mapped file, so the workers which are forked
+            (or spawned & open the same `path`) see the same counters
+        - Each operation holds an exclusive `flock()` on the file
+        - The expired slots are reused, if none of the `MAX_PROBES` slots of a key is free,
+            its first slot is overwritten (that client is counted from 0 again)
+    """
+    MAGIC = b'PTHR'
+    VERSION = 1
+    MAX_PROBES = 64
+    _header = struct.Struct('!4sBI')  # magic, version, capacity
+    _slot = struct.Struct('!16sdd')  # digest of the key, value, expires_at
+    _empty_key = bytes(16)
+
+    def __init__(self, path: str | Path, capacity: int):
+        self.path = Path(path)
+        self.capacity = capacity
+        self.max_keys = capacity
+        self.evictions = 0
+        self._size = self._header.size + capacity * self._slot.size
+        self._lock_depth = 0
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._pid = os.getpid()
+
+        with self.lock():
+            if os.fstat(self._fd).st_size != self._size:
+                os.ftruncate(self._fd, self._size)
+            self._memory = mmap.mmap(self._fd, self._size)
+            if self._header.unpack_from(self._memory) != (self.MAGIC, self.VERSION, capacity):
+                # A new file, or it has been created with another capacity
+                self._memory[:] = bytes(self._size)
+                self._header.pack_into(self._memory, 0, self.MAGIC, self.VERSION, capacity)
+
+    def __len__(self) -> int:
+        now = time.time()
+        with self.lock():
+            return sum(
+                1 for index in range(self.capacity)
+                if (slot := self._slot.unpack_from(self._memory, self._offset(index)))[0] != self._empty_key
+                and slot[2] > now
+            )
+
+    @contextlib.contextmanager
+    def lock(self):
+        """Re-entrant (in this process), so a few operations can be done atomically, e.g. `get()` & `set()`"""
+        if self._pid != os.getpid():
+            # The locks of a forked process should not be shared with its parent (same open file description)
+            self._fd = os.open(self.path, os.O_RDWR)
+            self._pid = os.getpid()
+
+        if self._lock_depth == 0:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        self._lock_depth += 1
+        try:
+            yield
+        finally:
+            self._lock_depth -= 1
+            if self._lock_depth == 0:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def get(self, key: str, default: int | float = 0) -> int | float:
+        with self.lock():
+            _, value, _ = self._find(self._digest(key), now=time.time())
+        return default if value is None else self._number(value)
+
+    def set(self, key: str, value: int | float, *, expires_at: float) -> None:
+        digest = self._digest(key)
+        with self.lock():
+            index, _, overflowed = self._find(digest, now=time.time())
+            self.evictions += overflowed
+            self._slot.pack_into(self._memory, self._offset(index), digest, value, expires_at)
+
+    def incr(self, key: str, amount: int = 1, *, expires_at: float) -> int:
+        digest = self._digest(key)
+        with self.lock():
+            index, value, overflowed = self._find(digest, now=time.time())
+            self.evictions += overflowed
+            value = (value or 0.0) + amount
+            self._slot.pack_into(self._memory, self._offset(index), digest, value, expires_at)
+        return self._number(value)
+
+    def sweep(self, now: float | None = None) -> None:
+        """The expired slots are reused, so there is nothing to sweep"""
+
+    def clear(self) -> None:
+        with self.lock():
+            self._memory[self._header.size:] = bytes(self._size - self._header.size)
+        self.evictions = 0
+
+    def _find(self, digest: bytes, /, now: float) -> tuple[int, float | None, bool]:
+        """Returns the slot of the key, its value (if it has not been expired) & whether it has overflowed"""
+        home = int.from_bytes(digest[:8], 'big') % self.capacity
+        reusable = None
+        for probe in range(min(self.MAX_PROBES, self.capacity)):
+            index = (home + probe) % self.capacity
+            key, value, expires_at = self._slot.unpack_from(self._memory, self._offset(index))
+            if key == digest:
+                return index, value if expires_at > now else None, False
+            if key == self._empty_key:
+                # The key is not after an empty slot
+                return index if reusable is None else reusable, None, False
+            if reusable is None and expires_at <= now:
+                reusable = index
+
+        if reusable is None:
+            return home, None, True
+        return reusable, None, False
+
+    def _offset(self, index: int, /) -> int:
+        return self._header.size + index * self._slot.size
+
+    @classmethod
+    def _digest(cls, key: str, /) -> bytes:
+        return hashlib.blake2b(key.encode(), digest_size=16).digest().replace(cls._empty_key, b'\1' * 16)
+
+    @classmethod
+    def _number(cls, value: float, /) -> int | float:
+        # The counters are stored as `double`
+        return int(value) if value.is_integer() else value
+
+
+throttling_storage: ThrottlingStorage | SharedThrottlingStorage = ThrottlingStorage()
+
+ALGORITHMS = ('fixed_window', 'sliding_window', 'gcra')
 
 
 @dataclass(repr=False, eq=False)
 class Throttling:
+    """
+    `algorithm`:
+        - fixed_window: `rate` requests in each `duration` (clients may send 2x `rate` around the edge of the windows)
+        - sliding_window: the count of the previous window is weighted by its overlap with the last `duration`
+        - gcra: token bucket (Generic Cell Rate Algorithm), one request in each `duration / rate`,
+            with a burst of `rate` requests
+    `flush_interval` (only for `fixed_window` & `redis`):
+        Each worker counts its requests locally and sends them to redis every `flush_interval`,
+        so redis is not called on every request, but the `rate` may be passed by the requests of one `flush_interval`
+    """
     rate: int
     duration: timedelta
+    algorithm: Literal['fixed_window', 'sliding_window', 'gcra'] = 'fixed_window'
+    flush_interval: timedelta | None = None
+
+    def __post_init__(self):
+        if self.rate <= 0:
+            msg = f'`rate` should be greater than 0, not `{self.rate}`'
+            raise ValueError(msg)
+        if self.algorithm not in ALGORITHMS:
+            msg = f'`algorithm` should be one of {ALGORITHMS}, not `{self.algorithm}`'
+            raise ValueError(msg)
+        if self.flush_interval and self.algorithm != 'fixed_window':
+            msg = '`flush_interval` only works with the `fixed_window` algorithm'
+            raise ValueError(msg)
+
+
+class ThrottlingStatus(NamedTuple):
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float | None = None  # Seconds (only if it is not `allowed`)
+
+    @property
+    def headers(self) -> dict:
+        headers = {'X-RateLimit-Limit': self.limit, 'X-RateLimit-Remaining': self.remaining}
+        if self.retry_after is not None:
+            headers['Retry-After'] = math.ceil(self.retry_after)
+        return headers
@@ -1,11 +1,24 @@
+import gzip
 import time
+import zlib
 import asyncio
 from datetime import timedelta
-from unittest import IsolatedAsyncioTestCase
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import patch
 
 from panther import Panther
-from panther.app import API
-from panther.response import HTMLResponse
+from panther._load_configs import compile_endpoints
+from panther.app import API, GenericAPI
+from panther import caching
+from panther.caching import InMemoryCache, caches
+from panther.configs import config
+from panther.db import Model
+from panther.exceptions import NotFoundAPIError, PantherError
+from panther.request import Request
+from panther.response import HTMLResponse, Response
+from panther.routings import flatten_urls
 from panther.test import APIClient
 from tests._utils import check_two_dicts
 
@@ -33,7 +46,58 @@ async def expired_cache_html_response():
     return HTMLResponse(data=f'<html>{time.time()}</html>')
 
 
+calls_count = {'single-flight': 0, 'single-flight-error': 0, 'stale': 0}
+
+
+@API(cache=True)
+async def single_flight_api():
+    calls_count['single-flight'] += 1
+    await asyncio.sleep(0.05)
+    return {'detail': time.time()}
+
+
+@API(cache=True, cache_key=lambda request: 'key')
+async def other_worker_api():
+    calls_count['single-flight'] += 1
+    return {'detail': time.time()}
+
+
+@API(cache=True)
+async def single_flight_error_api():
+    calls_count['single-flight-error'] += 1
+    await asyncio.sleep(0.05)
+    raise NotFoundAPIError
+
+
+@API(cache=True, cache_exp_time=timedelta(seconds=0.1), cache_stale_time=timedelta(seconds=5))
+async def stale_cache_api():
+    calls_count['stale'] += 1
+    await asyncio.sleep(0.05)
+    return {'detail': time.time()}
+
+
+class StaleCacheAPI(GenericAPI):
+    cache = True
+    cache_exp_time = timedelta(seconds=0.1)
+    cache_stale_time = timedelta(seconds=5)
+
+    async def get(self):
+        await asyncio.sleep(0.05)
+        return {'detail': time.time()}
+
+
+@API(cache=True)
+async def endpoint_stats_api():
+    return {'detail': 'x' * 10}
+
+
 urls = {
+    'endpoint-stats': endpoint_stats_api,
+    'stale': stale_cache_api,
+    'stale-class': StaleCacheAPI,
+    'single-flight': single_flight_api,
+    'other-worker': other_worker_api,
+    'single-flight-error': single_flight_error_api,
     'without-cache': without_cache_api,
     'with-cache': with_cache_api,
     'with-expired-cache': expired_cache_api,
@@ -67,14 +131,9 @@ class TestInMemoryCaching(IsolatedAsyncioTestCase):
 
     async def test_with_cache_5second_exp_time(self):
         # First Request
-        with self.assertLogs(level='INFO') as captured:
-            res1 = await self.client.get('with-expired-cache')
+        res1 = await self.client.get('with-expired-cache')
         assert res1.status_code == 200
 
-        # Check Logs
-        assert len(captured.records) == 1
-        assert captured.records[0].getMessage() == '`cache_exp_time` is not very accurate when `redis` is not connected.'
-
         # Second Request
         res2 = await self.client.get('with-expired-cache')
         assert res2.status_code == 200
@@ -106,3 +165,664 @@ class TestInMemoryCaching(IsolatedAsyncioTestCase):
 
         # Check Content-Type
         assert res1.headers['Content-Type'] == res2.headers['Content-Type']
+
+    async def test_cache_stats(self):
+        caches.reset_stats()
+        await self.client.get('with-cache', query_params={'stats': 1})
+        await self.client.get('with-cache', query_params={'stats': 1})
+        assert caches.hits == 1
+        assert caches.misses == 1
+
+    async def test_endpoint_cache_stats(self):
+        stats = caching.cache_stats['tests.test_caching.endpoint_stats_api']
+        for _ in range(3):
+            res = await self.client.get('endpoint-stats')
+            assert res.status_code == 200
+
+        assert stats.hits == 2
+        assert stats.misses == 1
+        assert stats.fills == 1
+        assert sum(stats.fill_latency) == 1
+        assert stats.size == stats.filled_size > 0
+
+        endpoint_stats = caching.get_cache_stats()['endpoints']['tests.test_caching.endpoint_stats_api']
+        assert endpoint_stats['hit_ratio'] == 2 / 3
+        assert [*endpoint_stats['fill_latency'].keys()][0] == '<=0.005'
+
+        # The cached responses are no longer in the memory
+        caches.clear()
+        assert stats.size == 0
+
+    async def test_single_flight(self):
+        calls_count['single-flight'] = 0
+        responses = await asyncio.gather(*[self.client.get('single-flight') for _ in range(10)])
+
+        assert calls_count['single-flight'] == 1
+        assert {res.status_code for res in responses} == {200}
+        assert len({res.data['detail'] for res in responses}) == 1
+        assert caching.in_flight == {}
+
+    async def test_single_flight_error(self):
+        calls_count['single-flight-error'] = 0
+        responses = await asyncio.gather(*[self.client.get('single-flight-error') for _ in range(5)])
+
+        assert calls_count['single-flight-error'] == 1
+        assert {res.status_code for res in responses} == {404}
+        assert caching.in_flight == {}
+
+    async def test_single_flight_waits_for_other_worker(self):
+        class FakeRedis:
+            is_connected = True
+
+            def __init__(self):
+                # Another worker is computing the response
+                self.storage = {'single-flight-key': b'1'}
+
+            async def set(self, key, value, nx=False, **kwargs):
+                if nx and key.startswith('single-flight') and key in self.storage:
+                    return None
+                self.storage[key] = value
+                return True
+
+            async def get(self, key):
+                return self.storage.get(key)
+
+            async def exists(self, key):
+                return int(key in self.storage)
+
+            async def delete(self, key):
+                self.storage.pop(key, None)
+
+        fake_redis = FakeRedis()
+
+        async def other_worker():
+            # It sets the response in the cache and releases its lock
+            await asyncio.sleep(0.05)
+            response = Response(data={'detail': 'from-other-worker'})
+            fake_redis.storage['key'] = caching.dump_cache_entry(caching.CachedResponse.from_response(response))
+            del fake_redis.storage['single-flight-key']
+
+        calls_count['single-flight'] = 0
+        with patch.object(caching, 'redis', fake_redis):
+            res, _ = await asyncio.gather(self.client.get('other-worker'), other_worker())
+
+        assert calls_count['single-flight'] == 0
+        assert res.status_code == 200
+        assert res.data == {'detail': 'from-other-worker'}
+
+    async def test_single_flight_only_releases_its_own_lock(self):
+        class LockFakeRedis(FakeRedis):
+            async def exists(self, key):
+                return int(key in self.storage)
+
+            async def eval(self, script, numkeys, key, token):
+                assert script == caching.RELEASE_LOCK_SCRIPT
+                if self.storage.get(key) == token:
+                    del self.storage[key]
+                    return 1
+                return 0
+
+        fake_redis = LockFakeRedis()
+        scope = {'path': '/', 'client': ('127.0.0.1', 8000), 'query_string': b''}
+        request = Request(scope=scope, receive=None, send=None)
+
+        async def slow_func():
+            # Our lock expires & another worker takes it
+            fake_redis.storage['single-flight-slow'] = 'other-worker-token'
+            return Response(data='ok')
+
+        async def func():
+            return Response(data='ok')
+
+        with patch.object(caching, 'redis', fake_redis):
+            await caching.single_flight(request=request, func=slow_func, key='slow')
+            assert fake_redis.storage['single-flight-slow'] == 'other-worker-token'
+
+            await caching.single_flight(request=request, func=func, key='fast')
+            assert 'single-flight-fast' not in fake_redis.storage
+
+    async def test_stale_while_revalidate(self):
+        calls_count['stale'] = 0
+        res1 = await self.client.get('stale')
+        await asyncio.sleep(0.15)
+
+        # Stale responses are returned immediately
+        res2, res3 = await asyncio.gather(self.client.get('stale'), self.client.get('stale'))
+        assert res1.data == res2.data == res3.data
+
+        # And the response is refreshed only once in the background
+        await asyncio.sleep(0.1)
+        assert calls_count['stale'] == 2
+        assert caching.revalidating == {}
+        res4 = await self.client.get('stale')
+        assert res4.data != res1.data
+
+    async def test_stale_while_revalidate_generic_api(self):
+        res1 = await self.client.get('stale-class')
+        await asyncio.sleep(0.15)
+
+        res2 = await self.client.get('stale-class')
+        assert res1.data == res2.data
+
+        await asyncio.sleep(0.1)
+        res3 = await self.client.get('stale-class')
+        assert res3.data != res1.data
+
+
+class FakeRedis:
+    is_connected = True
+
+    def __init__(self):
+        self.storage = {}
+        self.published = []
+        self.get_count = 0
+
+    async def get(self, key):
+        self.get_count += 1
+        await asyncio.sleep(0.01)
+        return self.storage.get(key)
+
+    async def set(self, key, value, nx=False, **kwargs):
+        if nx and key in self.storage:
+            return None
+        self.storage[key] = value
+        return True
+
+    async def delete(self, key):
+        self.storage.pop(key, None)
+
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+
+
+class TestLocalCache(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.redis = FakeRedis()
+        scope = {'path': '/', 'client': ('127.0.0.1', 8000), 'query_string': b''}
+        self.request = Request(scope=scope, receive=None, send=None)
+        self.patches = [
+            patch.object(caching, 'redis', self.redis),
+            patch.object(config, 'LOCAL_CACHE_EXP', timedelta(seconds=5)),
+        ]
+        for p in self.patches:
+            p.start()
+        caching.local_caches.clear()
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+        caching.local_caches.clear()
+
+    async def test_local_cache_hit(self):
+        response = Response(data={'detail': 'ok'})
+        await caching.set_response_in_cache(request=self.request, response=response, cache_exp_time=10)
+        key = caching.api_cache_key(request=self.request)
+        assert self.redis.published == [(caching.CACHE_INVALIDATION_CHANNEL, key)]
+
+        for _ in range(3):
+            cached = await caching.get_response_from_cache(request=self.request, cache_exp_time=10)
+            assert cached.data == response.body
+        assert self.redis.get_count == 1
+
+    async def test_local_cache_concurrent_fills(self):
+        response = Response(data={'detail': 'ok'})
+        await caching.set_response_in_cache(request=self.request, response=response, cache_exp_time=10)
+
+        results = await asyncio.gather(*[
+            caching.get_response_from_cache(request=self.request, cache_exp_time=10) for _ in range(10)
+        ])
+        assert {cached.data for cached in results} == {response.body}
+        assert self.redis.get_count == 1
+        assert caching.local_cache_fills == {}
+
+    async def test_local_cache_invalidation(self):
+        key = caching.api_cache_key(request=self.request)
+        await caching.set_response_in_cache(request=self.request, response=Response(data=1), cache_exp_time=10)
+        await caching.get_response_from_cache(request=self.request, cache_exp_time=10)
+        assert key in caching.local_caches
+
+        class FakePubSub:
+            async def subscribe(self, channel):
+                self.channel = channel
+
+            async def listen(self):
+                yield {'type': 'subscribe', 'data': 1}
+                yield {'type': 'message', 'data': key.encode()}
+
+        self.redis.create_connection_for_websocket = lambda: type('Connection', (), {'pubsub': FakePubSub})()
+        await caching.listen_to_cache_invalidations()
+        assert key not in caching.local_caches
+
+    async def test_invalidation_listener_lifespan(self):
+        app = Panther(__name__, configs=__name__, urls={})
+        listening = asyncio.Event()
+
+        async def listen_to_cache_invalidations():
+            listening.set()
+            await asyncio.Event().wait()
+
+        messages = asyncio.Queue()
+        sent = []
+
+        async def send(message):
+            sent.append(message['type'])
+
+        with (
+            patch('panther.main.listen_to_cache_invalidations', listen_to_cache_invalidations),
+            patch('panther.main.redis', SimpleNamespace(is_connected=True)),
+            patch.object(config, 'LOCAL_CACHE_EXP', timedelta(seconds=5)),
+        ):
+            lifespan = asyncio.create_task(app({'type': 'lifespan'}, messages.get, send))
+            await messages.put({'type': 'lifespan.startup'})
+            await listening.wait()
+            task = app._cache_invalidations_task
+            assert not task.done()
+
+            await messages.put({'type': 'lifespan.shutdown'})
+            await lifespan
+
+        assert task.cancelled()
+        assert sent == ['lifespan.startup.complete', 'lifespan.shutdown.complete']
+
+    async def test_cache_entry_format(self):
+        response = Response(data={'detail': 'ok'}, headers={'X-Custom': 'a: b'}, status_code=201)
+        await caching.set_response_in_cache(request=self.request, response=response, cache_exp_time=10)
+        entry = self.redis.storage[caching.api_cache_key(request=self.request)]
+        assert entry.endswith(b'{"detail":"ok"}')
+
+        cached = caching.load_cache_entry(entry)
+        assert cached.data == response.body
+        assert cached.headers == response.bytes_headers
+        assert cached.status_code == 201
+        assert cached.fresh_until is None
+
+        # Older entries are ignored
+        assert caching.load_cache_entry(b'["{}", {}, 200]') is None
+
+    async def test_cached_response_is_not_serialized_again(self):
+        response = Response(data={'detail': 'ok'}, headers={'X-Custom': 'a'})
+        await caching.set_response_in_cache(request=self.request, response=response, cache_exp_time=10)
+        cached = await caching.get_response_from_cache(request=self.request, cache_exp_time=10)
+
+        with patch('panther.response.json.dumps') as dumps:
+            prepared = cached.to_response()
+            assert prepared.body == response.body
+            assert prepared.bytes_headers == response.bytes_headers
+            dumps.assert_not_called()
+
+        # Headers are still available (e.g. for the middlewares)
+        assert prepared.headers == response.headers
+        prepared.headers = prepared.headers | {'X-Other': 'b'}
+        assert [b'X-Other', b'b'] in prepared.bytes_headers
+
+
+class TestCacheCompression(IsolatedAsyncioTestCase):
+    def setUp(self):
+        scope = {'path': '/', 'client': ('127.0.0.1', 8000), 'query_string': b'', 'headers': []}
+        self.request = Request(scope=scope, receive=None, send=None)
+        self.response = Response(data={'detail': 'x' * 100})
+        self.patch = patch.object(config, 'CACHE_COMPRESSION_MIN_SIZE', 10)
+        self.patch.start()
+        caches.clear()
+
+    def tearDown(self):
+        self.patch.stop()
+        caches.clear()
+
+    def _request(self, accept_encoding: str) -> Request:
+        scope = {**self.request.scope, 'headers': [(b'accept-encoding', accept_encoding.encode())]}
+        return Request(scope=scope, receive=None, send=None)
+
+    async def test_compressed_variants(self):
+        await caching.set_response_in_cache(request=self.request, response=self.response, cache_exp_time=10)
+        cached = await caching.get_response_from_cache(request=self.request, cache_exp_time=10)
+        assert set(cached.encodings) == {'gzip', 'deflate'}
+
+        # Identity
+        response = cached.to_response(self.request)
+        assert response.body == self.response.body
+        assert response.headers['Vary'] == 'Accept-Encoding'
+        assert 'Content-Encoding' not in response.headers
+
+        # Gzip
+        response = cached.to_response(self._request('deflate;q=0.5, gzip'))
+        assert gzip.decompress(response.body) == self.response.body
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert [b'Content-Length', str(len(response.body)).encode()] in response.bytes_headers
+
+        # Deflate
+        response = cached.to_response(self._request('gzip;q=0, deflate'))
+        assert zlib.decompress(response.body) == self.response.body
+        assert response.headers['Content-Encoding'] == 'deflate'
+
+        # Not supported
+        response = cached.to_response(self._request('br'))
+        assert response.body == self.response.body
+
+    async def test_small_responses_are_not_compressed(self):
+        await caching.set_response_in_cache(request=self.request, response=Response(data=1), cache_exp_time=10)
+        cached = await caching.get_response_from_cache(request=self.request, cache_exp_time=10)
+        assert cached.encodings is None
+
+    async def test_compressed_cache_entry(self):
+        cached = caching.CachedResponse.from_response(self.response, compress=True)
+        loaded = caching.load_cache_entry(caching.dump_cache_entry(cached))
+        assert loaded == cached
+
+    def test_negotiate_encoding(self):
+        encodings = ('gzip', 'deflate')
+        assert caching.negotiate_encoding('gzip, deflate, br', encodings) == 'gzip'
+        assert caching.negotiate_encoding('deflate;q=0.5, gzip;q=1.0, br;q=0', encodings) == 'gzip'
+        assert caching.negotiate_encoding('br', encodings) is None
+        assert caching.negotiate_encoding('*', encodings) == 'gzip'
+        # The refused encodings are not picked for the `*`
+        assert caching.negotiate_encoding('gzip;q=0, *', encodings) == 'deflate'
+        assert caching.negotiate_encoding('gzip;q=0, deflate;q=0, *', encodings) is None
+        # The `identity` is ranked too
+        assert caching.negotiate_encoding('identity;q=1, gzip;q=0.5', encodings) is None
+        assert caching.negotiate_encoding('identity;q=0.5, gzip', encodings) == 'gzip'
+        assert caching.negotiate_encoding('identity, gzip', encodings) == 'gzip'
+
+    async def test_refused_and_identity_encodings(self):
+        await caching.set_response_in_cache(request=self.request, response=self.response, cache_exp_time=10)
+        cached = await caching.get_response_from_cache(request=self.request, cache_exp_time=10)
+
+        response = cached.to_response(self._request('gzip;q=0, *'))
+        assert response.headers['Content-Encoding'] == 'deflate'
+        assert zlib.decompress(response.body) == self.response.body
+
+        response = cached.to_response(self._request('identity;q=1, gzip;q=0.5'))
+        assert 'Content-Encoding' not in response.headers
+        assert response.body == self.response.body
+
+
+class TestCacheKey(TestCase):
+    def _request(self, query_string: bytes = b'', ip: str = '127.0.0.1', path: str = '/books/') -> Request:
+        scope = {'path': path, 'client': (ip, 8000), 'query_string': query_string}
+        return Request(scope=scope, receive=None, send=None)
+
+    def test_query_params_order(self):
+        key1 = caching.api_cache_key(self._request(b'a=1&b=2'))
+        key2 = caching.api_cache_key(self._request(b'b=2&a=1'))
+        key3 = caching.api_cache_key(self._request(b'a=1&b=3'))
+        assert key1 == key2
+        assert key1 != key3
+
+    def test_repeated_query_params_order_is_kept(self):
+        assert caching.normalize_query_string(b'b=1&a=2&a=1') == b'a=2&a=1&b=1'
+
+    def test_vary_by_user(self):
+        assert caching.api_cache_key(self._request(ip='1.1.1.1')) != caching.api_cache_key(self._request(ip='2.2.2.2'))
+        assert caching.api_cache_key(self._request(path='/a/')) != caching.api_cache_key(self._request(path='/b/'))
+
+    def test_shared(self):
+        key1 = caching.shared_cache_key(self._request(ip='1.1.1.1'))
+        key2 = caching.shared_cache_key(self._request(ip='2.2.2.2'))
+        assert key1 == key2
+        assert key1 != caching.api_cache_key(self._request(ip='1.1.1.1'))
+
+    def test_throttling_key(self):
+        duration = timedelta(minutes=1)
+        key1 = caching.throttling_cache_key(self._request(ip='1.1.1.1'), duration=duration)
+        key2 = caching.throttling_cache_key(self._request(ip='2.2.2.2'), duration=duration)
+        assert key1 != key2
+        assert key1.startswith(f'throttling-{int(time.time() // 60)}-')
+
+
+class TestInMemoryCache(TestCase):
+    def test_ttl(self):
+        cache = InMemoryCache()
+        cache.set('a', 1, ttl=timedelta(seconds=0.05))
+        cache.set('b', 2, ttl=None)
+        assert cache.get('a') == 1
+        time.sleep(0.06)
+        assert cache.get('a') is None
+        assert cache.get('b') == 2
+        assert len(cache) == 1
+        assert cache.stats['expirations'] == 1
+
+    def test_max_entries_evicts_least_recently_used(self):
+        cache = InMemoryCache(max_entries=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        assert 'b' not in cache
+        assert cache.get('a') == 1
+        assert cache.get('c') == 3
+        assert cache.evictions == 1
+
+    def test_max_size(self):
+        cache = InMemoryCache(max_size=10)
+        cache.set('a', 1, size=4)
+        cache.set('b', 2, size=4)
+        cache.set('c', 3, size=4)
+        assert 'a' not in cache
+        assert cache.size == 8
+
+        # Bigger than the whole cache
+        cache.set('d', 4, size=11)
+        assert 'd' not in cache
+        assert len(cache) == 2
+
+    def test_overwrite_key(self):
+        cache = InMemoryCache()
+        cache.set('a', 1, size=4)
+        cache.set('a', 2, size=6)
+        assert cache.get('a') == 2
+        assert cache.size == 6
+        assert cache.stats == {
+            'entries': 1, 'size': 6, 'hits': 1, 'misses': 0, 'evictions': 0, 'expirations': 0,
+        }
+
+    def test_owner_stats(self):
+        cache = InMemoryCache(max_entries=2)
+        first, second = caching.CacheStats(), caching.CacheStats()
+        cache.set('a', 1, size=4, owner=first)
+        cache.set('b', 2, size=4, owner=first)
+        cache.set('c', 3, size=5, owner=second)
+        assert (first.size, first.evictions) == (4, 1)
+        assert (second.size, second.evictions) == (5, 0)
+
+        cache.delete('c')
+        assert second.size == 0
+
+    def test_fill_latency_buckets(self):
+        stats = caching.CacheStats()
+        stats.observe_fill(0.001)
+        stats.observe_fill(0.07)
+        stats.observe_fill(60)
+        assert stats.fills == 3
+        assert stats.fill_latency[0] == 1
+        assert stats.fill_latency[caching.CacheStats.FILL_LATENCY_BUCKETS.index(0.1)] == 1
+        assert stats.fill_latency[-1] == 1
+
+
+class TaggedBook(Model):
+    name: str
+
+
+@API(cache=True, cache_tags=[TaggedBook])
+async def tagged_books_api():
+    return [book.name for book in await TaggedBook.find()]
+
+
+retrieve_calls_count = {'count': 0}
+
+
+@API(cache=True, cache_tags=['TaggedBook:{book_id}'])
+async def tagged_book_api(book_id: str):
+    retrieve_calls_count['count'] += 1
+    return (await TaggedBook.find_one(id=book_id)).name
+
+
+tags_urls = {
+    'books': tagged_books_api,
+    'books/<book_id>': tagged_book_api,
+}
+
+
+class TagsFakeRedis(FakeRedis):
+    """Runs the `TAG_SCRIPT` in python, `ttls` has the TTL of the sets (`None` means forever)"""
+
+    def __init__(self):
+        super().__init__()
+        self.ttls = {}
+
+    async def eval(self, script, numkeys, *args):
+        assert script == caching.TAG_SCRIPT
+        keys, (seconds, *members) = args[:numkeys], args[numkeys:]
+        for key, member in zip(keys, members):
+            exists = key in self.storage
+            self.storage.setdefault(key, set()).add(member.encode())
+            if seconds == 0:
+                self.ttls[key] = None
+            elif not exists or (self.ttls.get(key) is not None and self.ttls[key] < seconds):
+                self.ttls[key] = seconds
+
+    async def smembers(self, key):
+        return self.storage.get(key, set())
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.storage.pop(key, None)
+
+
+class TestCacheTags(IsolatedAsyncioTestCase):
+    DB_PATH = 'test.pdb'
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        global DATABASE
+        DATABASE = {
+            'engine': {
+                'class': 'panther.db.connections.PantherDBConnection',
+                'path': cls.DB_PATH
+            },
+        }
+        app = Panther(__name__, configs=__name__, urls=tags_urls)
+        cls.client = APIClient(app=app)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        global DATABASE
+        DATABASE = None
+
+    def tearDown(self) -> None:
+        Path(self.DB_PATH).unlink(missing_ok=True)
+        caches.clear()
+
+    async def test_insert_invalidates_model_tag(self):
+        await TaggedBook.insert_one(name='a')
+        res = await self.client.get('books')
+        assert res.data == ['a']
+
+        await TaggedBook.insert_one(name='b')
+        res = await self.client.get('books')
+        assert res.data == ['a', 'b']
+
+    async def test_instance_write_invalidates_its_own_tag(self):
+        book1 = await TaggedBook.insert_one(name='a')
+        book2 = await TaggedBook.insert_one(name='b')
+        retrieve_calls_count['count'] = 0
+
+        await self.client.get(f'books/{book1.id}')
+        await self.client.get(f'books/{book2.id}')
+        await book2.update(name='c')
+
+        res1 = await self.client.get(f'books/{book1.id}')
+        res2 = await self.client.get(f'books/{book2.id}')
+        assert res1.data == 'a'
+        assert res2.data == 'c'
+        # Only `book2` has been called again
+        assert retrieve_calls_count['count'] == 3
+
+    async def test_filter_write_invalidates_all_the_tags_of_model(self):
+        book = await TaggedBook.insert_one(name='a')
+        assert (await self.client.get(f'books/{book.id}')).data == 'a'
+        assert (await self.client.get('books')).data == ['a']
+
+        await TaggedBook.update_many({'name': 'a'}, name='b')
+        assert (await self.client.get(f'books/{book.id}')).data == 'b'
+        assert (await self.client.get('books')).data == ['b']
+
+        await TaggedBook.delete_many(name='b')
+        assert (await self.client.get('books')).data == []
+
+    async def test_redis_tags(self):
+        fake_redis = TagsFakeRedis()
+        scope = {'path': '/books/1/', 'client': ('127.0.0.1', 8000), 'query_string': b''}
+        request = Request(scope=scope, receive=None, send=None)
+        with patch.object(caching, 'redis', fake_redis):
+            await caching.set_response_in_cache(
+                request=request, response=Response(data='a'), cache_exp_time=10, cache_tags=['TaggedBook:1'],
+            )
+            key = caching.api_cache_key(request=request)
+            assert key in fake_redis.storage
+
+            await caching.invalidate_cache_tags('TaggedBook', with_children=True)
+            assert fake_redis.storage == {}
+
+    async def test_redis_tags_ttl_is_only_extended(self):
+        fake_redis = TagsFakeRedis()
+        tag_key = caching._tag_redis_key('TaggedBook:1')
+        children_key = caching._child_tags_redis_key('TaggedBook')
+
+        with patch.object(caching, 'redis', fake_redis):
+            for path, cache_exp_time in [('/a/', timedelta(days=1)), ('/b/', 10)]:
+                scope = {'path': path, 'client': ('127.0.0.1', 8000), 'query_string': b''}
+                await caching.set_response_in_cache(
+                    request=Request(scope=scope, receive=None, send=None),
+                    response=Response(data='a'),
+                    cache_exp_time=cache_exp_time,
+                    cache_tags=['TaggedBook:1'],
+                )
+            # The 10 seconds endpoint doesn't shorten the tag of the 1 day endpoint
+            assert fake_redis.ttls[tag_key] == fake_redis.ttls[children_key] == 86400
+
+            await caching._tag_key(tag='TaggedBook:1', key='forever', cache_exp_time=None)
+            assert fake_redis.ttls[tag_key] is None
+
+    async def test_memory_tags_are_pruned(self):
+        caching.tagged_keys.clear()
+        caching.child_tags.clear()
+        for i in range(200):
+            key = f'key-{i}'
+            caches.set(key, 'value', ttl=1)
+            await caching._tag_key(tag=f'TaggedBook:{i}', key=key, cache_exp_time=1)
+            # The key is evicted or expired
+            caches.delete(key)
+
+        assert len(caching.tagged_keys) <= 64
+        assert len(caching.child_tags['TaggedBook']) <= 64
+        assert set(caching.child_tags['TaggedBook']) <= set(caching.tagged_keys)
+
+
+class TestCacheTagsTemplate(TestCase):
+    def setUp(self):
+        config.refresh()
+
+    def test_invalid_cache_tag_template(self):
+        for tag in ['TaggedBook:{}', 'TaggedBook:{0}', 'TaggedBook:{book.id}', 'TaggedBook:{book_id']:
+            with self.assertRaises(PantherError):
+                API(cache=True, cache_tags=[tag])(tagged_book_api.__wrapped__)
+
+    def test_cache_tag_with_missing_path_variable(self):
+        config.FLAT_URLS = flatten_urls({'books/<id>': tagged_book_api})
+        with self.assertRaises(PantherError) as captured:
+            compile_endpoints()
+        assert captured.exception.args[0] == (
+            "Invalid 'cache_tags' of 'books/<id>/': it doesn't have these path variables: book_id"
+        )
+
+        # The class-based endpoints are checked too
+        class TaggedBookAPI(GenericAPI):
+            cache = True
+            cache_tags = ['TaggedBook:{book_id}']
+
+        config.FLAT_URLS = flatten_urls({'books/<book_id>': TaggedBookAPI, 'other/<id>': TaggedBookAPI})
+        with self.assertRaises(PantherError) as captured:
+            compile_endpoints()
+        assert captured.exception.args[0] == (
+            "Invalid 'cache_tags' of 'other/<id>/': it doesn't have these path variables: book_id"
+        )
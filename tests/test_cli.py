@@ -10,6 +10,7 @@ from rich import print as rprint
 
 from panther import Panther
 from panther.cli.create_command import CreateProject
+from panther.cli.monitor_command import Monitoring
 from panther.cli.template import TEMPLATE, SINGLE_FILE_TEMPLATE
 from panther.configs import config
 
@@ -145,3 +146,15 @@ class TestCLI(TestCase):
                     assert Path(file_path).exists()
 
         shutil.rmtree(project_path)
+
+    def test_monitor_cache_column(self):
+        monitoring = Monitoring()
+        rows = [
+            monitoring.parse_line('2024-01-01 10:00:00 | GET | /books | 127.0.0.1:8000 | 0.002 | 200 | MISS\n'),
+            monitoring.parse_line('2024-01-01 10:00:01 | GET | /books | 127.0.0.1:8000 | 0.0001 | 200 | HIT\n'),
+            # Logged before the `cache` column
+            monitoring.parse_line('2024-01-01 10:00:02 | GET | /login | 127.0.0.1:8000 | 0.002 | 200\n'),
+        ]
+        assert [row[6].strip() for row in rows] == ['MISS', 'HIT', '-']
+        assert monitoring.cache_counts == {'/books': {'MISS': 1, 'HIT': 1}}
+        assert monitoring.generate_cache_table().row_count == 1
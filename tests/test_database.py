@@ -1,14 +1,19 @@
+import asyncio
 import random
 from pathlib import Path
 from unittest import IsolatedAsyncioTestCase
 
 import faker
+import orjson
 import pytest
 
 from panther import Panther
+from panther.configs import config
 from panther.db import Model
 from panther.db.connections import db
 from panther.db.cursor import Cursor as MongoCursor
+from panther.exceptions import DatabaseError
+from panther.response import Response
 from pantherdb import Cursor as PantherDBCursor
 
 f = faker.Faker()
@@ -169,14 +174,15 @@ class _BaseDatabaseTestCase:
 
         # Find
         books = await Book.find(name=name)
-        _len = sum(1 for _ in books)
+        documents = await self._to_list(books)
+        _len = len(documents)
 
         if self.__class__.__name__ == 'TestMongoDB':
             assert isinstance(books, MongoCursor)
         else:
             assert isinstance(books, PantherDBCursor)
         assert _len == insert_count
-        for book in books:
+        for book in documents:
             assert isinstance(book, Book)
             assert book.name == name
 
@@ -186,7 +192,8 @@ class _BaseDatabaseTestCase:
 
         # Find
         books = await Book.find(name='NotFound')
-        _len = sum(1 for _ in books)
+        documents = await self._to_list(books)
+        _len = len(documents)
 
         if self.__class__.__name__ == 'TestMongoDB':
             assert isinstance(books, MongoCursor)
@@ -200,15 +207,68 @@ class _BaseDatabaseTestCase:
 
         # Find All
         books = await Book.find()
-        _len = sum(1 for _ in books)
+        documents = await self._to_list(books)
+        _len = len(documents)
 
         if self.__class__.__name__ == 'TestMongoDB':
             assert isinstance(books, MongoCursor)
         else:
             assert isinstance(books, PantherDBCursor)
         assert _len == insert_count
-        for book in books:
+        for book in documents:
+            assert isinstance(book, Book)
+
+    async def test_find_with_fields(self):
+        # Insert Many
+        insert_count = await self._insert_many()
+
+        # Find With Projection
+        books = await Book.find(fields=['name'])
+        documents = await self._to_list(books)
+
+        assert len(documents) == insert_count
+        for book in documents:
             assert isinstance(book, Book)
+            assert book.id
+            assert book.name
+            assert book.model_fields_set == {'id', 'name'}
+            assert book.model_dump() == {'id': book.id, 'name': book.name}
+
+    async def test_find_one_with_fields(self):
+        created_book = await Book.insert_one(name=f.name(), author=f.name(), pages_count=random.randint(0, 10))
+
+        book = await Book.find_one(id=created_book.id, fields=['pages_count', 'author'])
+
+        assert isinstance(book, Book)
+        assert book.id == created_book.id
+        assert book.model_dump() == {
+            'id': created_book.id,
+            'author': created_book.author,
+            'pages_count': created_book.pages_count,
+        }
+
+    async def test_save_with_fields(self):
+        created_book = await Book.insert_one(name=f.name(), author=f.name(), pages_count=random.randint(0, 10))
+
+        book = await Book.find_one(id=created_book.id, fields=['name'])
+        assert 'author' not in repr(book)
+        with pytest.raises(AttributeError):
+            book.pages_count
+
+        book.name = 'new name'
+        await book.save()
+
+        # The fields which have not been fetched should not be overwritten
+        updated_book = await Book.find_one(id=created_book.id)
+        assert updated_book.name == 'new name'
+        assert updated_book.author == created_book.author
+        assert updated_book.pages_count == created_book.pages_count
+
+    async def test_find_with_invalid_fields(self):
+        await self._insert_many()
+
+        with pytest.raises(DatabaseError, match='Book\\(\\) does not have these fields: title'):
+            await Book.find_one(fields=['name', 'title'])
 
     async def test_all(self):
         # Insert Many
@@ -216,7 +276,8 @@ class _BaseDatabaseTestCase:
 
         # Find All
         books = await Book.all()
-        _len = sum(1 for _ in books)
+        documents = await self._to_list(books)
+        _len = len(documents)
 
         if self.__class__.__name__ == 'TestMongoDB':
             assert isinstance(books, MongoCursor)
@@ -224,7 +285,7 @@ class _BaseDatabaseTestCase:
             assert isinstance(books, PantherDBCursor)
 
         assert _len == insert_count
-        for book in books:
+        for book in documents:
             assert isinstance(book, Book)
 
     async def test_aggregation(self):
@@ -445,14 +506,15 @@ class _BaseDatabaseTestCase:
         assert updated_count == insert_count
 
         books = await Book.find(name=new_name)
-        _len = sum(1 for _ in books)
+        documents = await self._to_list(books)
+        _len = len(documents)
 
         if self.__class__.__name__ == 'TestMongoDB':
             assert isinstance(books, MongoCursor)
         else:
             assert isinstance(books, PantherDBCursor)
         assert _len == updated_count == insert_count
-        for book in books:
+        for book in documents:
             assert book.author == author
             assert book.pages_count == pages_count
 
@@ -476,6 +538,12 @@ class _BaseDatabaseTestCase:
         # Count Them After Update
         assert await Book.count() == insert_count
 
+    @classmethod
+    async def _to_list(cls, cursor) -> list:
+        if isinstance(cursor, MongoCursor):
+            return await cursor.to_list(None)
+        return list(cursor)
+
     @classmethod
     async def _insert_many(cls) -> int:
         insert_count = random.randint(2, 10)
@@ -540,3 +608,112 @@ class TestMongoDB(_BaseDatabaseTestCase, IsolatedAsyncioTestCase):
 
     def tearDown(self) -> None:
         db.session.drop_collection('Book')
+
+
+class FakeMotorCursor:
+    """Same interface as `motor.motor_asyncio.AsyncIOMotorCursor`, each fetch takes 10ms"""
+    def __init__(self, documents):
+        self.documents = documents
+        self.commands = []
+
+    def sort(self, *args, **kwargs):
+        self.commands.append(('sort', args))
+        return self
+
+    def skip(self, skip):
+        self.documents = self.documents[skip:]
+        return self
+
+    def limit(self, limit):
+        self.documents = self.documents[:limit]
+        return self
+
+    async def next(self):
+        await asyncio.sleep(0.01)
+        if not self.documents:
+            raise StopAsyncIteration
+        return self.documents.pop(0)
+
+    async def to_list(self, length):
+        await asyncio.sleep(0.01)
+        documents, self.documents = self.documents[:length], self.documents[length:] if length else []
+        return documents
+
+
+class FakeMotorCollection:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def find(self, _filter, projection=None):
+        if projection is None:
+            return FakeMotorCursor(documents=list(self.documents))
+        return FakeMotorCursor(documents=[{k: v for k, v in d.items() if k in projection} for d in self.documents])
+
+
+class TestAsyncCursor(IsolatedAsyncioTestCase):
+    def setUp(self):
+        documents = [{'_id': str(i), 'name': f'book {i}', 'author': f.name(), 'pages_count': i} for i in range(5)]
+        self.collection = FakeMotorCollection(documents=documents)
+
+    def _cursor(self) -> MongoCursor:
+        return MongoCursor(cls=Book, collection=self.collection, filter={})
+
+    async def test_async_for(self):
+        books = [book async for book in self._cursor().skip(1).limit(2)]
+        assert [book.name for book in books] == ['book 1', 'book 2']
+        assert all(isinstance(book, Book) for book in books)
+
+    async def test_to_list(self):
+        cursor = self._cursor().sort('_id', -1)
+        books = await cursor.to_list(3)
+        assert len(books) == 3
+        assert isinstance(books[0], Book)
+        assert len(await cursor.to_list(None)) == 2
+
+    async def test_fetch_does_not_block_the_event_loop(self):
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.001)
+
+        task = asyncio.create_task(tick())
+        books = [book async for book in self._cursor()]
+        task.cancel()
+        assert len(books) == 5
+        assert ticks > 5
+
+    async def test_fields(self):
+        cursor = MongoCursor(cls=Book, collection=self.collection, filter={}, fields=Book._clean_fields(['name']))
+        books = await cursor.to_list(None)
+        assert [book.model_dump() for book in books] == [{'id': str(i), 'name': f'book {i}'} for i in range(5)]
+
+    async def test_only_keeps_the_chain(self):
+        cursor = self._cursor().skip(1).limit(2).only(['name'])
+        books = await cursor.to_list(None)
+        assert [book.model_dump() for book in books] == [{'id': '1', 'name': 'book 1'}, {'id': '2', 'name': 'book 2'}]
+
+    async def test_response_fetches_the_cursor(self):
+        response = Response(data=self._cursor())
+        await response.fetch_cursor()
+        assert [book.name for book in response.initial_data] == [f'book {i}' for i in range(5)]
+        assert [book['name'] for book in orjson.loads(response.body)] == [f'book {i}' for i in range(5)]
+
+    async def test_response_fetches_the_nested_cursors(self):
+        response = Response(data={'books': self._cursor().limit(2), 'others': [self._cursor().skip(4)], 'count': 5})
+        await response.fetch_cursor()
+        data = orjson.loads(response.body)
+        assert [book['name'] for book in data['books']] == ['book 0', 'book 1']
+        assert [[book['name'] for book in books] for books in data['others']] == [['book 4']]
+        assert data['count'] == 5
+
+    async def test_strict_response_fetches_the_nested_cursors(self):
+        config.STRICT_RESPONSE = True
+        try:
+            response = Response(data={'books': self._cursor()})
+            await response.fetch_cursor()
+        finally:
+            config.STRICT_RESPONSE = False
+        assert [book['name'] for book in orjson.loads(response.body)['books']] == [f'book {i}' for i in range(5)]
@@ -1,10 +1,11 @@
 from pathlib import Path
-from unittest import IsolatedAsyncioTestCase
+from types import SimpleNamespace
+from unittest import IsolatedAsyncioTestCase, TestCase
 
 from panther import Panther
 from panther.db import Model
-from panther.generics import RetrieveAPI, ListAPI, UpdateAPI, DeleteAPI, CreateAPI
-from panther.pagination import Pagination
+from panther.generics import RetrieveAPI, ListAPI, UpdateAPI, DeleteAPI, CreateAPI, output_fields
+from panther.pagination import KeysetPagination, Pagination
 from panther.request import Request
 from panther.serializer import ModelSerializer
 from panther.test import APIClient
@@ -44,6 +45,47 @@ class UserSerializer(ModelSerializer):
         fields = '*'
 
 
+class PersonNameSerializer(ModelSerializer):
+    class Config:
+        model = Person
+        fields = ['id', 'name']
+
+
+class ProjectedListAPITest(ListAPI):
+    output_model = PersonNameSerializer
+    pagination = Pagination
+
+    async def cursor(self, request: Request, **kwargs):
+        return await Person.find()
+
+
+class SortedProjectedListAPITest(ListAPI):
+    output_model = PersonNameSerializer
+
+    async def cursor(self, request: Request, **kwargs):
+        return (await Person.find()).sort('age', -1).limit(2)
+
+
+class ProjectedRetrieveAPITest(RetrieveAPI):
+    output_model = PersonNameSerializer
+
+    async def object(self, request: Request, **kwargs) -> Model:
+        return await Person.find_one(id=kwargs['id'], fields=self.output_fields(Person))
+
+
+class AgeKeysetPagination(KeysetPagination):
+    ORDERING = '-age'
+    COUNT = True
+
+
+class KeysetListAPITest(ListAPI):
+    filter_fields = ['name']
+    pagination = AgeKeysetPagination
+
+    async def cursor(self, request: Request, **kwargs):
+        return await Person.find()
+
+
 class UpdateAPITest(UpdateAPI):
     input_model = UserSerializer
 
@@ -64,6 +106,10 @@ urls = {
     'retrieve/<id>': RetrieveAPITest,
     'list': ListAPITest,
     'full-list': FullListAPITest,
+    'projected-list': ProjectedListAPITest,
+    'sorted-projected-list': SortedProjectedListAPITest,
+    'projected-retrieve/<id>': ProjectedRetrieveAPITest,
+    'keyset-list': KeysetListAPITest,
     'update/<id>': UpdateAPITest,
     'create': CreateAPITest,
     'delete/<id>': DeleteAPITest,
@@ -198,6 +244,78 @@ class TestGeneric(IsolatedAsyncioTestCase):
             {'name': 'Saba', 'age': 1},
         ]
 
+    async def test_list_projection(self):
+        people = await Person.insert_many([{'name': 'Ali', 'age': 0}, {'name': 'Saba', 'age': 1}])
+        assert output_fields(PersonNameSerializer, Person) == ('id', 'name')
+
+        cursor, _ = await ProjectedListAPITest().prepare_cursor(request=SimpleNamespace(query_params={}))
+        assert cursor.fields == ('id', 'name')
+        assert [person.model_fields_set for person in cursor] == [{'id', 'name'}, {'id', 'name'}]
+
+        res = await self.client.get('projected-list', query_params={'limit': 1})
+        assert res.status_code == 200
+        assert res.data['count'] == 2
+        assert res.data['results'] == [{'id': people[0].id, 'name': 'Ali'}]
+
+    async def test_list_projection_keeps_the_cursor(self):
+        people = await Person.insert_many([{'name': 'A', 'age': 1}, {'name': 'C', 'age': 3}, {'name': 'B', 'age': 2}])
+
+        cursor, _ = await SortedProjectedListAPITest().prepare_cursor(request=SimpleNamespace(query_params={}))
+        assert cursor.fields == ('id', 'name')
+
+        res = await self.client.get('sorted-projected-list')
+        assert res.status_code == 200
+        assert res.data == [{'id': people[1].id, 'name': 'C'}, {'id': people[2].id, 'name': 'B'}]
+
+    async def test_retrieve_projection(self):
+        person = await Person.insert_one(name='Ali', age=2)
+        res = await self.client.get(f'projected-retrieve/{person.id}')
+        assert res.status_code == 200
+        assert res.data == {'id': person.id, 'name': 'Ali'}
+
+    async def test_keyset_pagination(self):
+        people = await Person.insert_many([
+            {'name': 'Ali', 'age': 3},
+            {'name': 'Saba', 'age': 1},
+            {'name': 'Ali', 'age': 2},
+            {'name': 'Saba', 'age': 1},
+            {'name': 'Ali', 'age': 3},
+        ])
+
+        results = []
+        query_params = {'limit': 2}
+        while True:
+            res = await self.client.get('keyset-list', query_params=query_params)
+            assert res.status_code == 200
+            assert res.data['count'] == 5
+            assert len(res.data['results']) <= 2
+            results += res.data['results']
+            if res.data['next'] is None:
+                break
+            assert res.data['next'].startswith('?limit=2&after=')
+            query_params = {'limit': 2, 'after': res.data['next'].removeprefix('?limit=2&after=')}
+
+        # Each person is returned once, sorted by `-age` & `-id` (the tie-breaker)
+        expected = sorted(people, key=lambda p: (p.age, p.id), reverse=True)
+        assert [r['id'] for r in results] == [p.id for p in expected]
+
+        # Filtered
+        res = await self.client.get('keyset-list', query_params={'limit': 2, 'name': 'Saba'})
+        assert res.data['count'] == 2
+        assert res.data['next'] is None
+        assert {r['name'] for r in res.data['results']} == {'Saba'}
+
+        # Invalid token
+        res = await self.client.get('keyset-list', query_params={'after': 'invalid'})
+        assert res.status_code == 400
+        assert res.data['detail'] == 'Invalid `after`'
+
+        # Invalid limit
+        for limit in [0, -1, 'abc']:
+            res = await self.client.get('keyset-list', query_params={'limit': limit})
+            assert res.status_code == 400
+            assert res.data['detail'] == '`limit` should be a positive integer'
+
     async def test_update(self):
         users = await User.insert_many([{'name': 'Ali'}, {'name': 'Hamed'}])
         res = await self.client.put(f'update/{users[1].id}', payload={'name': 'NewName'})
@@ -224,3 +342,25 @@ class TestGeneric(IsolatedAsyncioTestCase):
         new_users = await User.find()
         assert len([u for u in new_users]) == 1
         assert new_users[0].model_dump() == users[0].model_dump()
+
+
+class TestKeysetPagination(TestCase):
+    def test_range_query(self):
+        cursor = SimpleNamespace(cls=Person, filter={}, fields=None)
+        pagination = AgeKeysetPagination(query_params={}, cursor=cursor)
+        assert pagination.range_query(2, 'x') == {'$or': [{'age': {'$lt': 2}}, {'age': 2, '_id': {'$lt': 'x'}}]}
+
+        pagination = KeysetPagination(query_params={}, cursor=cursor)
+        assert pagination.range_query('x', 'x') == {'_id': {'$gt': 'x'}}
+
+    def test_max_limit(self):
+        cursor = SimpleNamespace(cls=Person, filter={}, fields=None)
+        pagination = KeysetPagination(query_params={'limit': '1000'}, cursor=cursor)
+        assert pagination.limit == KeysetPagination.MAX_LIMIT
+
+    def test_token(self):
+        cursor = SimpleNamespace(cls=Person, filter={}, fields=None)
+        pagination = AgeKeysetPagination(query_params={}, cursor=cursor)
+        token = pagination.encode_token(Person(_id='01HQ', name='Ali', age=2))
+        assert '=' not in token
+        assert pagination.decode_token(token) == (2, '01HQ')
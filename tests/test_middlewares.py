@@ -0,0 +1,94 @@
+from unittest import IsolatedAsyncioTestCase
+
+from panther import Panther
+from panther.app import API
+from panther.configs import config
+from panther.middlewares import ASGIMiddleware
+from panther.middlewares.base import HTTPMiddleware, compile_middlewares
+from panther.request import Request
+from panther.response import Response
+from panther.test import APIClient
+
+
+class CountInitMiddleware(HTTPMiddleware):
+    init_count = 0
+
+    def __init__(self, name):
+        CountInitMiddleware.init_count += 1
+        self.name = name
+
+    async def before(self, request: Request):
+        request.name = self.name
+        return request
+
+    async def after(self, response: Response):
+        response.headers = response.headers | {'X-Name': self.name}
+        return response
+
+
+class BeforeOnlyMiddleware(HTTPMiddleware):
+    async def before(self, request: Request):
+        return request
+
+
+class AfterOnlyMiddleware(HTTPMiddleware):
+    async def after(self, response: Response):
+        return response
+
+
+class ServerHeaderMiddleware(ASGIMiddleware):
+    def __init__(self, app, server):
+        super().__init__(app)
+        self.server = server.encode()
+
+    async def __call__(self, scope, receive, send):
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                message['headers'] = [*message['headers'], [b'Server', self.server]]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+@API()
+async def name_api(request: Request):
+    return request.name
+
+
+urls = {
+    'name': name_api,
+}
+
+MIDDLEWARES = [
+    ('tests.test_middlewares.ServerHeaderMiddleware', {'server': 'panther'}),
+    ('tests.test_middlewares.CountInitMiddleware', {'name': 'ali'}),
+    ('tests.test_middlewares.BeforeOnlyMiddleware', ),
+    ('tests.test_middlewares.AfterOnlyMiddleware', ),
+]
+
+
+class TestMiddlewares(IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        app = Panther(__name__, configs=__name__, urls=urls)
+        cls.client = APIClient(app=app)
+
+    async def test_middleware_is_instantiated_once(self):
+        for _ in range(3):
+            res = await self.client.get('name')
+            assert res.status_code == 200
+            assert res.data == 'ali'
+            assert res.headers['X-Name'] == 'ali'
+        assert CountInitMiddleware.init_count == 1
+
+    async def test_asgi_middleware(self):
+        res = await self.client.get('name')
+        assert res.status_code == 200
+        assert res.headers['Server'] == 'panther'
+        assert [middleware for middleware, _ in config.ASGI_MIDDLEWARES] == [ServerHeaderMiddleware]
+
+    async def test_compile_middlewares_skips_default_methods(self):
+        count, before_only, after_only = config.HTTP_MIDDLEWARES
+        before_chain, after_chain = compile_middlewares(config.HTTP_MIDDLEWARES)
+        assert before_chain == (count.before, before_only.before)
+        assert after_chain == (after_only.after, count.after)
@@ -27,3 +27,8 @@ class TestPanelAPIs(IsolatedAsyncioTestCase):
         response = await self.client.get('_panel')
         expected_keys = ['name', 'module', 'index']
         assert expected_keys == [*response.data[0].keys()]
+
+    async def test_cache_stats(self):
+        response = await self.client.get('_panel/cache-stats')
+        assert response.status_code == 200
+        assert [*response.data.keys()] == ['endpoints', 'memory', 'local']
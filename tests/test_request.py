@@ -1,6 +1,7 @@
 from unittest import IsolatedAsyncioTestCase
 
 import orjson as json
+from pydantic import BaseModel
 
 from panther import Panther
 from panther.app import API, GenericAPI
@@ -34,6 +35,11 @@ async def request_path_variables(name: str, age: int, is_alive: bool):
     return {'name': name, 'age': age, 'is_alive': is_alive}
 
 
+@API()
+async def request_union_path_variable(request: Request, name: int | str):
+    return {'name': name, 'path': request.path}
+
+
 @API()
 async def request_header(request: Request):
     return request.headers.__dict__
@@ -138,12 +144,36 @@ async def get_post_patch_methods():
     return Response()
 
 
+class CountInstances(GenericAPI):
+    instances = 0
+
+    def __init__(self):
+        CountInstances.instances += 1
+
+    async def get(self, request: Request):
+        return CountInstances.instances
+
+
+class DynamicOutputModel(BaseModel):
+    name: str
+
+
+class DynamicOutputModelAPI(GenericAPI):
+    async def get_output_model(self, request: Request):
+        if request.query_params.get('model'):
+            return DynamicOutputModel
+
+    async def get(self, request: Request):
+        return {'name': 'Ali', 'age': 27}
+
+
 urls = {
     'path': request_path,
     'client': request_client,
     'query-params': request_query_params,
     'data': request_data,
     'path/<name>/variable/<age>/<is_alive>/': request_path_variables,
+    'union/<name>/': request_union_path_variable,
 
     'header': request_header,
     'header-attr': request_header_by_attr,
@@ -163,6 +193,8 @@ urls = {
     'delete-class': DeleteMethod,
     'get-post-patch-func': get_post_patch_methods,
     'get-post-patch-class': GetPostPatchMethods,
+    'count-instances': CountInstances,
+    'dynamic-output-model': DynamicOutputModelAPI,
 }
 
 
@@ -202,6 +234,15 @@ class TestRequest(IsolatedAsyncioTestCase):
         assert res.status_code == 200
         assert res.data == expected_response
 
+    async def test_invalid_path_variables(self):
+        res = await self.client.post('path/Ali/variable/twenty/true/')
+        assert res.status_code == 400
+
+    async def test_union_path_variable(self):
+        res = await self.client.get('union/Ali/')
+        assert res.status_code == 200
+        assert res.data == {'name': 'Ali', 'path': '/union/Ali/'}
+
     # # # Headers
     async def test_headers_none(self):
         res = await self.client.get('header')
@@ -445,3 +486,16 @@ class TestRequest(IsolatedAsyncioTestCase):
         res_class = await self.client.delete('get-post-patch-class/')
         assert res_func.status_code == 405
         assert res_class.status_code == 405
+
+    async def test_class_endpoint_is_instantiated_once(self):
+        res1 = await self.client.get('count-instances')
+        res2 = await self.client.get('count-instances')
+        assert res1.status_code == 200
+        assert res1.data == res2.data == 1
+
+    async def test_dynamic_output_model(self):
+        res1 = await self.client.get('dynamic-output-model')
+        assert res1.data == {'name': 'Ali', 'age': 27}
+
+        res2 = await self.client.get('dynamic-output-model', query_params={'model': 'true'})
+        assert res2.data == {'name': 'Ali'}
@@ -1,8 +1,14 @@
-from unittest import IsolatedAsyncioTestCase
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import patch
+
+import orjson as json
+from pydantic import BaseModel
 
 from panther import Panther
 from panther.app import API, GenericAPI
+from panther.db import Model
 from panther.response import Response, HTMLResponse, PlainTextResponse, StreamingResponse, TemplateResponse
+from panther.serializer import ModelSerializer
 from panther.test import APIClient
 
 
@@ -159,6 +165,78 @@ class ReturnInvalidStatusCode(GenericAPI):
         return Response(status_code='ali')
 
 
+class NestedModel(BaseModel):
+    name: str
+
+
+@API()
+async def return_nested_model():
+    return {'users': [NestedModel(name='Ali'), NestedModel(name='Saba')], 'tags': {'a'}}
+
+
+@API()
+async def return_invalid_nested_type():
+    return {'detail': object()}
+
+
+class OutputBook(Model):
+    name: str
+    pages_count: int = 0
+
+
+class OutputBookSerializer(ModelSerializer):
+    class Config:
+        model = OutputBook
+        fields = ['id', 'name']
+
+
+class PreparedOutputBookSerializer(ModelSerializer):
+    class Config:
+        model = OutputBook
+        fields = ['name']
+
+    async def prepare_response(self, instance, data: dict) -> dict:
+        return data | {'pages_count': instance['pages_count']}
+
+
+class PreparedListOutputBookSerializer(ModelSerializer):
+    class Config:
+        model = OutputBook
+        fields = ['name']
+
+    @classmethod
+    async def prepare_list_response(cls, instances: list, data: list[dict]) -> list:
+        return [{'count': len(instances)}, *data]
+
+
+BOOKS = [{'id': '1', 'name': 'A', 'pages_count': 10}, {'id': '2', 'name': 'B', 'pages_count': 20}]
+
+
+@API(output_model=OutputBookSerializer)
+async def return_output_model_dict():
+    return dict(BOOKS[0])
+
+
+@API(output_model=OutputBookSerializer)
+async def return_output_model_list():
+    return [dict(book) for book in BOOKS]
+
+
+@API(output_model=OutputBookSerializer)
+async def return_output_model_instances():
+    return [OutputBook(_id=book['id'], name=book['name']) for book in BOOKS]
+
+
+@API(output_model=PreparedOutputBookSerializer)
+async def return_prepared_output_model_list():
+    return [dict(book) for book in BOOKS]
+
+
+@API(output_model=PreparedListOutputBookSerializer)
+async def return_prepared_list_output_model_list():
+    return [dict(book) for book in BOOKS]
+
+
 urls = {
     'nothing': return_nothing,
     'none': return_none,
@@ -189,6 +267,13 @@ urls = {
     'stream': ReturnStreamingResponse,
     'async-stream': ReturnAsyncStreamingResponse,
     'invalid-status-code': ReturnInvalidStatusCode,
+    'nested-model': return_nested_model,
+    'invalid-nested-type': return_invalid_nested_type,
+    'output-model-dict': return_output_model_dict,
+    'output-model-list': return_output_model_list,
+    'output-model-instances': return_output_model_instances,
+    'prepared-output-model-list': return_prepared_output_model_list,
+    'prepared-list-output-model-list': return_prepared_list_output_model_list,
 }
 
 
@@ -486,3 +571,87 @@ class TestResponses(IsolatedAsyncioTestCase):
         assert res.headers['Content-Type'] == 'application/json'
         assert res.headers['Access-Control-Allow-Origin'] == '*'
         assert res.headers['Content-Length'] == 34
+
+    async def test_nested_model(self):
+        res = await self.client.get('nested-model/')
+        assert res.status_code == 200
+        assert res.data == {'users': [{'name': 'Ali'}, {'name': 'Saba'}], 'tags': ['a']}
+
+    async def test_invalid_nested_type(self):
+        with self.assertLogs(level='ERROR') as captured:
+            res = await self.client.get('invalid-nested-type/')
+
+        assert len(captured.records) == 1
+        assert res.status_code == 500
+        assert res.data == {'detail': 'Internal Server Error'}
+
+    async def test_output_model_dict(self):
+        res = await self.client.get('output-model-dict/')
+        assert res.status_code == 200
+        assert res.data == {'id': '1', 'name': 'A'}
+
+    async def test_output_model_list(self):
+        res = await self.client.get('output-model-list/')
+        assert res.status_code == 200
+        assert res.data == [{'id': '1', 'name': 'A'}, {'id': '2', 'name': 'B'}]
+
+    async def test_output_model_instances(self):
+        res = await self.client.get('output-model-instances/')
+        assert res.status_code == 200
+        assert res.data == [{'id': '1', 'name': 'A'}, {'id': '2', 'name': 'B'}]
+
+    async def test_output_model_prepare_response(self):
+        res = await self.client.get('prepared-output-model-list/')
+        assert res.status_code == 200
+        assert res.data == [{'name': 'A', 'pages_count': 10}, {'name': 'B', 'pages_count': 20}]
+
+    async def test_output_model_prepare_list_response(self):
+        res = await self.client.get('prepared-list-output-model-list/')
+        assert res.status_code == 200
+        assert res.data == [{'count': 2}, {'name': 'A'}, {'name': 'B'}]
+
+
+class TestResponseBody(TestCase):
+    def test_body_is_serialized_once(self):
+        response = Response(data={'detail': 'ok'})
+        with patch('panther.response.json.dumps', wraps=json.dumps) as dumps:
+            assert response.body == b'{"detail":"ok"}'
+            assert response.headers['Content-Length'] == 15
+            assert response.bytes_headers
+            assert response.body == b'{"detail":"ok"}'
+        assert dumps.call_count == 1
+
+    def test_body_is_invalidated_on_new_data(self):
+        response = Response(data={'detail': 'ok'})
+        assert response.body == b'{"detail":"ok"}'
+        assert [b'Content-Length', b'15'] in response.bytes_headers
+
+        response.data = [1, 2, 3]
+        assert response.body == b'[1,2,3]'
+        assert [b'Content-Length', b'7'] in response.bytes_headers
+
+    def test_bytes_headers_are_invalidated_on_new_headers(self):
+        response = Response(data='Hello')
+        assert [b'Content-Type', b'application/json'] in response.bytes_headers
+
+        response.headers = {'Content-Type': 'text/plain'}
+        assert [b'Content-Type', b'text/plain'] in response.bytes_headers
+
+    def test_prepare_data_leaves_nested_values(self):
+        model = NestedModel(name='Ali')
+        response = Response(data={'user': model})
+        assert response.data['user'] is model
+        assert response.body == b'{"user":{"name":"Ali"}}'
+
+    def test_prepare_data_strict_response(self):
+        from panther.configs import config
+
+        config.STRICT_RESPONSE = True
+        try:
+            response = Response(data={'user': NestedModel(name='Ali'), 'numbers': (1, 2)})
+            assert response.data == {'user': {'name': 'Ali'}, 'numbers': [1, 2]}
+
+            with self.assertRaises(TypeError):
+                Response(data={'detail': object()})
+        finally:
+            config.STRICT_RESPONSE = False
@@ -4,9 +4,11 @@ from unittest import TestCase
 from panther.base_request import BaseRequest
 from panther.exceptions import PantherError
 from panther.routings import (
+    Router,
     finalize_urls,
     find_endpoint,
     flatten_urls,
+    resolve_endpoint,
 )
 
 
@@ -994,3 +996,114 @@ class TestRoutingFunctions(TestCase):
 
         assert path_variables['user_id'] == str(_user_id)
         assert path_variables['id'] == str(_id)
+
+    def test_resolve_endpoint_path_variables(self):
+        def temp_func(): pass
+
+        from panther.configs import config
+
+        config.URLS = {
+            'user': {
+                '<user_id>': {
+                    'profile': {
+                        '<id>': temp_func,
+                    },
+                },
+            },
+        }
+
+        _user_id = random.randint(0, 100)
+        _id = random.randint(0, 100)
+        func, found_path, path_variables = resolve_endpoint(f'user/{_user_id}/profile/{_id}/?name=ali')
+
+        assert func == temp_func
+        assert found_path == 'user/<user_id>/profile/<id>'
+        assert path_variables == {'user_id': str(_user_id), 'id': str(_id)}
+
+    def test_resolve_endpoint_not_found_path_variables(self):
+        def temp_func(): pass
+
+        from panther.configs import config
+
+        config.URLS = {
+            'user': {
+                '<user_id>': temp_func,
+            },
+        }
+        assert resolve_endpoint('user/1/profile') == (None, '', {})
+
+    def test_router_is_recompiled_after_changing_urls(self):
+        def temp_1(): pass
+
+        def temp_2(): pass
+
+        from panther.configs import config
+
+        config.URLS = {'hello': temp_1}
+        assert find_endpoint('hello') == (temp_1, 'hello')
+
+        config.URLS = {'hello': temp_2}
+        assert find_endpoint('hello') == (temp_2, 'hello')
+
+    def test_router_static_routes(self):
+        def temp_1(): pass
+
+        def temp_2(): pass
+
+        def temp_3(): pass
+
+        router = Router({
+            '': temp_1,
+            'user': {
+                '': temp_2,
+                '<id>': temp_3,
+                'list': temp_2,
+            },
+        })
+
+        assert router.static_routes == {
+            '': (temp_1, ''),
+            'user': (temp_2, 'user'),
+            'user/list': (temp_2, 'user/list'),
+        }
+
+    def test_router_cache(self):
+        def temp_func(): pass
+
+        router = Router({'user': {'<user_id>': temp_func}}, cache_size=2)
+
+        assert router.find('/user/1/') == (temp_func, 'user/<user_id>', {'user_id': '1'})
+        assert router.cache.misses == 1
+        assert router.cache.hits == 0
+
+        path_variables = router.find('/user/1/')[2]
+        assert path_variables == {'user_id': '1'}
+        assert router.cache.misses == 1
+        assert router.cache.hits == 1
+
+        # Each lookup should get its own `path_variables`
+        path_variables['user_id'] = '2'
+        assert router.find('/user/1/')[2] == {'user_id': '1'}
+
+    def test_router_cache_lru_eviction(self):
+        def temp_func(): pass
+
+        router = Router({'user': {'<user_id>': temp_func}}, cache_size=2)
+
+        router.find('/user/1/')
+        router.find('/user/2/')
+        router.find('/user/1/')  # Now `/user/2/` is the least recently used one
+        router.find('/user/3/')
+
+        assert len(router.cache) == 2
+        router.find('/user/1/')
+        assert router.cache.hits == 2
+        router.find('/user/2/')
+        assert router.cache.misses == 4
+
+    def test_router_without_cache(self):
+        def temp_func(): pass
+
+        router = Router({'user': temp_func})
+        assert router.cache is None
+        assert router.find('user') == (temp_func, 'user', {})
@@ -1,11 +1,21 @@
 import asyncio
+import os
+import sys
+import tempfile
+import time
 from datetime import timedelta
-from unittest import IsolatedAsyncioTestCase
+from pathlib import Path
+from unittest import IsolatedAsyncioTestCase, TestCase, skipIf
+from unittest.mock import patch
 
-from panther import Panther
+from panther import Panther, caching
 from panther.app import API
+from panther.middlewares.base import HTTPMiddleware
+from panther.request import Request
+from panther.response import Response
 from panther.test import APIClient
-from panther.throttling import Throttling
+from panther import throttling as panther_throttling
+from panther.throttling import SharedThrottlingStorage, Throttling, ThrottlingStorage, throttling_storage
 
 
 @API()
@@ -18,12 +28,118 @@ async def with_throttling_api():
     return 'ok'
 
 
+@API(throttling=Throttling(rate=3, duration=timedelta(seconds=10)))
+async def burst_throttling_api():
+    await asyncio.sleep(0.01)
+    return 'ok'
+
+
+@API(throttling=Throttling(rate=2, duration=timedelta(seconds=60)))
+async def headers_throttling_api():
+    return 'ok'
+
+
+@API(throttling=Throttling(rate=5, duration=timedelta(seconds=60)))
+async def middleware_throttling_api():
+    return 'ok'
+
+
+class WrapDataMiddleware(HTTPMiddleware):
+    """Changes the `data` after the rate-limit headers have been added"""
+    async def after(self, response: Response):
+        if response.data == 'ok':
+            response.data = {'detail': 'wrapped by the middleware', 'data': response.data}
+        return response
+
+
+MIDDLEWARES = [
+    ('tests.test_throttling.WrapDataMiddleware', ),
+]
+
 urls = {
+    'middleware-throttling': middleware_throttling_api,
+    'headers-throttling': headers_throttling_api,
     'without-throttling': without_throttling_api,
     'with-throttling': with_throttling_api,
+    'burst-throttling': burst_throttling_api,
 }
 
 
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    def incr(self, key):
+        self.commands.append(('incr', key))
+        return self
+
+    def get(self, key):
+        self.commands.append(('get', key))
+        return self
+
+    def incrby(self, key, amount):
+        self.commands.append(('incrby', key, amount))
+        return self
+
+    def expire(self, key, time):
+        self.commands.append(('expire', key, time))
+        return self
+
+    async def execute(self):
+        # All the commands of the pipeline are sent in one round trip
+        self.redis.round_trips += 1
+        await asyncio.sleep(0.01)
+        results = []
+        for command, key, *args in self.commands:
+            if command == 'incr':
+                self.redis.storage[key] = self.redis.storage.get(key, 0) + 1
+                results.append(self.redis.storage[key])
+            elif command == 'incrby':
+                self.redis.storage[key] = self.redis.storage.get(key, 0) + args[0]
+                results.append(self.redis.storage[key])
+            elif command == 'get':
+                value = self.redis.storage.get(key)
+                results.append(None if value is None else str(value).encode())
+            else:
+                self.redis.expires[key] = args[0]
+                results.append(True)
+        return results
+
+
+class FakeRedis:
+    is_connected = True
+
+    def __init__(self):
+        self.storage = {}
+        self.expires = {}
+        self.round_trips = 0
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def decr(self, key):
+        self.round_trips += 1
+        self.storage[key] -= 1
+        return self.storage[key]
+
+    async def eval(self, script, numkeys, key, now, interval, duration):
+        # Same as `caching.GCRA_SCRIPT`
+        assert script == caching.GCRA_SCRIPT
+        self.round_trips += 1
+        tat = max(self.storage.get(key, now), now)
+        if tat + interval - now > duration:
+            return [0, str(tat).encode()]
+        self.storage[key] = tat + interval
+        return [1, str(tat + interval).encode()]
+
+
 class TestThrottling(IsolatedAsyncioTestCase):
     @classmethod
     def setUpClass(cls) -> None:
@@ -72,3 +188,248 @@ class TestThrottling(IsolatedAsyncioTestCase):
 
         res10 = await self.client.get('with-throttling')
         assert res10.status_code == 429
+
+    async def test_concurrent_requests(self):
+        responses = await asyncio.gather(*[self.client.get('burst-throttling') for _ in range(10)])
+        assert sorted(response.status_code for response in responses) == [200] * 3 + [429] * 7
+
+    async def test_rate_limit_headers(self):
+        responses = [await self.client.get('headers-throttling') for _ in range(3)]
+        assert [response.status_code for response in responses] == [200, 200, 429]
+        assert [response.headers['X-RateLimit-Remaining'] for response in responses] == ['1', '0', '0']
+        assert 'Retry-After' not in responses[1].headers
+        assert 0 < int(responses[2].headers['Retry-After']) <= 60
+
+    async def test_rate_limit_headers_keep_the_content_length(self):
+        res = await self.client.get('middleware-throttling')
+        assert res.status_code == 200
+        assert res.data == {'detail': 'wrapped by the middleware', 'data': 'ok'}
+        assert res.headers['X-RateLimit-Remaining'] == '4'
+        assert int(res.headers['Content-Length']) == len(res.body)
+
+
+def _request(path: str = '/') -> Request:
+    return Request(scope={'path': path, 'client': ('127.0.0.1', 8000)}, receive=None, send=None)
+
+
+class TestThrottlingAlgorithms(IsolatedAsyncioTestCase):
+    def setUp(self):
+        throttling_storage.clear()
+
+    async def _throttle(self, throttling: Throttling, now: float, path: str = '/'):
+        with patch('panther.caching.time.time', return_value=now):
+            return await caching.throttle(_request(path), throttling=throttling)
+
+    async def test_fixed_window_allows_bursts_around_the_edge(self):
+        throttling = Throttling(rate=2, duration=timedelta(seconds=10))
+        statuses = [await self._throttle(throttling, now) for now in (1008, 1009, 1010, 1011)]
+        assert [status.allowed for status in statuses] == [True, True, True, True]
+
+    async def test_sliding_window(self):
+        throttling = Throttling(rate=2, duration=timedelta(seconds=10), algorithm='sliding_window')
+        statuses = [await self._throttle(throttling, now) for now in (1008, 1009, 1010, 1011)]
+        assert [status.allowed for status in statuses] == [True, True, False, False]
+        # 2 * (1 - 0.1) + 0 --> 1.8 (+1) > 2, it has to wait till 1015 --> 2 * 0.5 + 1 <= 2
+        assert round(statuses[-1].retry_after, 6) == 4
+
+        # The rejected requests are not counted
+        assert (await self._throttle(throttling, 1015)).allowed is True
+        assert (await self._throttle(throttling, 1015)).allowed is False
+
+    async def test_gcra(self):
+        throttling = Throttling(rate=2, duration=timedelta(seconds=10), algorithm='gcra')
+        statuses = [await self._throttle(throttling, now) for now in (1000, 1000, 1000)]
+        assert [status.allowed for status in statuses] == [True, True, False]
+        assert [status.remaining for status in statuses] == [1, 0, 0]
+        # One request in each 5 seconds
+        assert statuses[-1].retry_after == 5
+
+        assert (await self._throttle(throttling, 1004)).allowed is False
+        assert (await self._throttle(throttling, 1005)).allowed is True
+
+    def test_invalid_algorithm(self):
+        with self.assertRaises(ValueError):
+            Throttling(rate=2, duration=timedelta(seconds=10), algorithm='leaky')
+
+    def test_invalid_rate(self):
+        for algorithm in ('fixed_window', 'sliding_window', 'gcra'):
+            with self.assertRaises(ValueError):
+                Throttling(rate=0, duration=timedelta(seconds=10), algorithm=algorithm)
+
+
+class TestThrottlingStorage(TestCase):
+    def test_expired_keys_are_swept(self):
+        storage = ThrottlingStorage()
+        with patch('panther.throttling.time.time', return_value=1000):
+            assert storage.incr('a', expires_at=1010) == 1
+            assert storage.incr('a', expires_at=1010) == 2
+            storage.set('b', 5, expires_at=1020.5)
+
+        with patch('panther.throttling.time.time', return_value=1015):
+            assert storage.get('a') == 0
+            storage.sweep()
+            assert len(storage) == 1
+
+        with patch('panther.throttling.time.time', return_value=1021):
+            # It is swept on the next write
+            storage.set('c', 1, expires_at=1030)
+            assert len(storage) == 1
+            assert storage.get('c') == 1
+
+    def test_key_which_is_set_again_is_not_swept(self):
+        storage = ThrottlingStorage()
+        with patch('panther.throttling.time.time', return_value=1000):
+            storage.set('a', 1, expires_at=1005)
+            storage.set('a', 2, expires_at=1050)
+        storage.sweep(now=1010)
+        assert len(storage) == 1
+
+    def test_max_keys_drops_the_oldest(self):
+        storage = ThrottlingStorage(max_keys=2)
+        expires_at = time.time() + 60
+        storage.incr('a', expires_at=expires_at)
+        storage.incr('b', expires_at=expires_at)
+        storage.incr('a', expires_at=expires_at)
+        storage.incr('c', expires_at=expires_at)
+        assert len(storage) == 2
+        assert storage.get('a') == 0
+        assert storage.get('b') == 1
+        assert storage.evictions == 1
+
+
+@skipIf(sys.platform.startswith('win'), 'Not supported in windows')
+class TestSharedThrottlingStorage(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name) / 'throttling'
+        self.storage = SharedThrottlingStorage(path=self.path, capacity=8)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_get_set_incr(self):
+        expires_at = time.time() + 60
+        assert self.storage.get('a') == 0
+        assert self.storage.incr('a', expires_at=expires_at) == 1
+        assert self.storage.incr('a', 2, expires_at=expires_at) == 3
+        self.storage.set('b', 1.5, expires_at=expires_at)
+        assert self.storage.get('b') == 1.5
+        assert len(self.storage) == 2
+
+        # Expired
+        self.storage.set('c', 1, expires_at=time.time() - 1)
+        assert self.storage.get('c') == 0
+        assert len(self.storage) == 2
+
+        self.storage.clear()
+        assert len(self.storage) == 0
+
+    def test_shared_between_processes(self):
+        expires_at = time.time() + 60
+        self.storage.incr('a', expires_at=expires_at)
+
+        if (pid := os.fork()) == 0:  # Child
+            self.storage.incr('a', expires_at=expires_at)
+            os._exit(0)
+        os.waitpid(pid, 0)
+        assert self.storage.get('a') == 2
+
+        # Another worker which opens the same file
+        assert SharedThrottlingStorage(path=self.path, capacity=8).get('a') == 2
+        # The capacity has been changed
+        assert SharedThrottlingStorage(path=self.path, capacity=16).get('a') == 0
+
+    def test_full_table(self):
+        expires_at = time.time() + 60
+        for i in range(8):
+            self.storage.incr(str(i), expires_at=expires_at)
+        assert self.storage.evictions == 0
+
+        self.storage.incr('new', expires_at=expires_at)
+        assert self.storage.get('new') == 1
+        assert self.storage.evictions == 1
+        assert len(self.storage) == 8
+
+    def test_expired_slots_are_reused(self):
+        for i in range(8):
+            self.storage.incr(str(i), expires_at=time.time() - 1)
+        self.storage.incr('new', expires_at=time.time() + 60)
+        assert self.storage.evictions == 0
+        assert len(self.storage) == 1
+
+    async def test_algorithms(self):
+        with patch.object(panther_throttling, 'throttling_storage', self.storage):
+            for algorithm in ('fixed_window', 'sliding_window', 'gcra'):
+                throttling = Throttling(rate=2, duration=timedelta(seconds=60), algorithm=algorithm)
+                statuses = [await caching.throttle(_request(f'/{algorithm}'), throttling=throttling) for _ in range(3)]
+                assert [status.allowed for status in statuses] == [True, True, False]
+                assert statuses[0].remaining == 1
+
+
+class TestRedisThrottling(IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        app = Panther(__name__, configs=__name__, urls=urls)
+        cls.client = APIClient(app=app)
+
+    def setUp(self):
+        self.redis = FakeRedis()
+        self.patch = patch.object(caching, 'redis', self.redis)
+        self.patch.start()
+
+    def tearDown(self):
+        self.patch.stop()
+
+    async def test_one_round_trip_per_request(self):
+        res = await self.client.get('with-throttling')
+        assert res.status_code == 200
+        assert self.redis.round_trips == 1
+
+    async def test_window_expires(self):
+        await self.client.get('with-throttling')
+        [key] = self.redis.storage
+        assert self.redis.expires == {key: timedelta(seconds=3)}
+
+    async def test_concurrent_requests(self):
+        responses = await asyncio.gather(*[self.client.get('burst-throttling') for _ in range(10)])
+        assert sorted(response.status_code for response in responses) == [200] * 3 + [429] * 7
+        assert self.redis.round_trips == 10
+
+    async def test_sliding_window(self):
+        throttling = Throttling(rate=1, duration=timedelta(seconds=10), algorithm='sliding_window')
+        assert (await caching.throttle(_request(), throttling=throttling)).allowed is True
+        assert (await caching.throttle(_request(), throttling=throttling)).allowed is False
+        # The rejected request has been undone
+        assert [*self.redis.storage.values()] == [1]
+
+    async def test_gcra(self):
+        throttling = Throttling(rate=2, duration=timedelta(seconds=10), algorithm='gcra')
+        statuses = [await caching.throttle(_request(), throttling=throttling) for _ in range(3)]
+        assert [status.allowed for status in statuses] == [True, True, False]
+        assert 0 < statuses[-1].retry_after <= 5
+        assert self.redis.round_trips == 3
+
+    async def test_batched_counters(self):
+        throttling = Throttling(rate=5, duration=timedelta(seconds=60), flush_interval=timedelta(milliseconds=50))
+        statuses = [await caching.throttle(_request('/batched'), throttling=throttling) for _ in range(3)]
+        assert [status.remaining for status in statuses] == [4, 3, 2]
+        # Nothing has been sent yet
+        assert self.redis.round_trips == 0
+
+        key = caching.throttling_cache_key(_request('/batched'), duration=throttling.duration)
+        self.redis.storage[key] = 2  # Other workers
+
+        await asyncio.sleep(0.05)
+        status = await caching.throttle(_request('/batched'), throttling=throttling)
+        assert status.remaining == 1
+        await caching.batched_throttling_counters[throttling].task
+        assert self.redis.round_trips == 1
+        assert self.redis.storage[key] == 6
+        assert self.redis.expires[key] == throttling.duration
+
+        # The totals of all the workers are used now
+        assert (await caching.throttle(_request('/batched'), throttling=throttling)).allowed is False
+
+    def test_flush_interval_only_works_with_fixed_window(self):
+        with self.assertRaises(ValueError):
+            Throttling(rate=5, duration=timedelta(seconds=60), algorithm='gcra', flush_interval=timedelta(seconds=1))
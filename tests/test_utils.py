@@ -261,6 +261,26 @@ class TestLoadConfigs(TestCase):
         assert len(captured.records) == 1
         assert captured.records[0].getMessage() == "Invalid 'URLs': No module named 'fake'"
 
+    def test_throttling_max_keys_not_positive(self):
+        global THROTTLING_MAX_KEYS
+        for max_keys in [0, -1, True, '10']:
+            THROTTLING_MAX_KEYS = max_keys
+
+            with self.assertLogs(level='ERROR') as captured:
+                try:
+                    Panther(name=__name__, configs=__name__, urls={})
+                except SystemExit:
+                    assert True
+                else:
+                    assert False
+                finally:
+                    del THROTTLING_MAX_KEYS
+
+            assert len(captured.records) == 1
+            assert captured.records[0].getMessage() == (
+                "Invalid 'THROTTLING_MAX_KEYS': should be a positive `int` or `None`."
+            )
+
     def test_middlewares_invalid_path(self):
         global MIDDLEWARES
         MIDDLEWARES = [